@@ -0,0 +1 @@
+"""Benchmarks und Lasttests (nicht Teil der App)."""
@@ -0,0 +1,346 @@
+"""Render benchmark of the app pages, driven headlessly through ``AppTest``.
+
+Every scenario opens one page with empty caches and then runs a sequence of
+interactions (league switch, matchday navigation, filters, search, row
+selection). Per step the wall time, the time spent in SQL (via
+``core.data.read_sql``), the number of queries and the peak Python memory
+(``tracemalloc``, measured in a separate pass) are recorded. Results are
+written as JSON so that two commits can be compared with ``--compare``.
+
+Usage::
+
+    python -m benchmarks.bench_pages --output vorher.json
+    python -m benchmarks.bench_pages --scale 20 --output nachher.json --compare vorher.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from core.migrate import DEFAULT_DB, migrate, scale_database
+
+ROOT = Path(__file__).resolve().parent.parent
+TIMEOUT = 120
+
+
+class Session:
+    """One browser session on a page: an ``AppTest`` plus table selections.
+
+    ``AppTest`` has no API for selecting dataframe rows, so the selection
+    state is sent along with the other widget states on every run. ``page``
+    is a script or, for the league pages that only exist in the navigation
+    of ``Startseite.py``, their URL path (e.g. ``Bundesliga``).
+    """
+
+    def __init__(self, page: str):
+        from streamlit.testing.v1 import AppTest
+        from streamlit.util import calc_md5
+
+        if page.endswith(".py"):
+            self.at = AppTest.from_file(str(ROOT / page), default_timeout=TIMEOUT)
+        else:
+            self.at = AppTest.from_file(str(ROOT / "Startseite.py"), default_timeout=TIMEOUT)
+            # st.navigation erkennt Seiten am Hash ihres URL-Pfads
+            self.at._page_hash = calc_md5(page)
+        self.selections = {}
+
+    def run(self) -> None:
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        if not self.at._tree.children:
+            # Erster Aufruf der Seite
+            self.at.run()
+            self._check()
+            return
+        states = self.at._tree.get_widget_states()
+        for widget_id, rows in self.selections.items():
+            value = json.dumps({"selection": {"rows": rows, "columns": []}})
+            states.widgets.append(WidgetState(id=widget_id, string_value=value))
+        self.at._run(states)
+        self._check()
+
+    def _check(self) -> None:
+        if self.at.exception:
+            raise RuntimeError([e.message for e in self.at.exception])
+
+    def select_row(self, table: int, row: int = 0) -> None:
+        """Select ``row`` in the ``table``-th dataframe of the page."""
+        frames = [el for el in self.at.main if getattr(el, "type", None) == "arrow_data_frame"]
+        self.selections[frames[table].proto.id] = [row]
+        self.run()
+
+    def click(self, key: str = None, label: str = None) -> None:
+        button = next(
+            b for b in self.at.button if (key is not None and b.key == key) or b.label == label
+        )
+        button.click()
+        self.run()
+
+    def _element(self, widget: str, label: str):
+        # Bei gleicher Beschriftung (Formular und Filter) gilt das letzte Element
+        return [el for el in getattr(self.at, widget) if el.label == label][-1]
+
+    def set(self, widget: str, label: str, value) -> None:
+        self._element(widget, label).set_value(value)
+        self.run()
+
+    def choose(self, label: str, index: int) -> None:
+        """Pick the ``index``-th option of a selectbox (independent of the data)."""
+        self._element("selectbox", label).select_index(index)
+        self.run()
+
+
+SCENARIOS = {
+    "Startseite": (
+        "pages/Home.py",
+        [
+            ("Liga wechseln", lambda s: s.click(label="La Liga")),
+            ("Liga wechseln zurück", lambda s: s.click(label="Premier League")),
+        ],
+    ),
+    "Ligaseite": (
+        "Bundesliga",
+        [
+            ("Nächster Spieltag", lambda s: s.click(key="next_matchday_4")),
+            ("Nächster Spieltag 2", lambda s: s.click(key="next_matchday_4")),
+            ("Spieltag wählen", lambda s: s.set("selectbox", "Spieltag auswählen", 20)),
+            ("Vorheriger Spieltag", lambda s: s.click(key="prev_matchday_4")),
+        ],
+    ),
+    "Matches": (
+        "pages/Matches.py",
+        [
+            ("Ältere Seite", lambda s: s.click(label="Ältere Spiele")),
+            ("Filter Liga", lambda s: s.set("selectbox", "Liga", "Bundesliga")),
+            ("Filter Heimteam", lambda s: s.choose("Heimmannschaft", 1)),
+            ("Zeile auswählen", lambda s: s.select_row(0)),
+        ],
+    ),
+    "Spieler": (
+        "pages/Spieler.py",
+        [
+            ("Suche Name", lambda s: s.set("text_input", "Nach Spieler suchen", "müller")),
+            ("Suche Nationalität", lambda s: s.set("text_input", "Nach Spieler suchen", "germany")),
+            ("Zeile auswählen", lambda s: s.select_row(0)),
+        ],
+    ),
+    "Vereine": (
+        "pages/Vereine.py",
+        [
+            ("Verein suchen", lambda s: s.set("text_input", "Nach Verein suchen", "fc")),
+            ("Verein auswählen", lambda s: s.select_row(0)),
+            ("Spieler suchen", lambda s: s.set("text_input", "Nach Spieler im Verein suchen", "mu")),
+        ],
+    ),
+}
+
+
+class SqlTimer:
+    """Wraps ``core.data.read_sql`` to sum up query time and count."""
+
+    def __init__(self):
+        from core import data
+
+        self.data = data
+        self.original = data.read_sql
+        self.seconds = 0.0
+        self.queries = 0
+
+    def __enter__(self):
+        def timed_read_sql(sql, params=()):
+            start = time.perf_counter()
+            try:
+                return self.original(sql, params)
+            finally:
+                self.seconds += time.perf_counter() - start
+                self.queries += 1
+
+        self.data.read_sql = timed_read_sql
+        return self
+
+    def __exit__(self, *exc):
+        self.data.read_sql = self.original
+
+    def reset(self) -> None:
+        self.seconds = 0.0
+        self.queries = 0
+
+
+def _steps(name: str):
+    page, steps = SCENARIOS[name]
+    return page, [("Laden", lambda s: s.run())] + steps
+
+
+def run_scenario(name: str, timer: SqlTimer, memory: bool = False) -> list:
+    """Run one scenario on empty caches; return one measurement per step."""
+    import streamlit as st
+
+    st.cache_data.clear()
+    page, steps = _steps(name)
+    session = Session(page)
+    results = []
+    for step, action in steps:
+        timer.reset()
+        if memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        action(session)
+        wall = time.perf_counter() - start
+        peak = None
+        if memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        results.append(
+            {
+                "step": step,
+                "wall_ms": wall * 1000,
+                "sql_ms": timer.seconds * 1000,
+                "queries": timer.queries,
+                "peak_kib": None if peak is None else peak / 1024,
+            }
+        )
+    return results
+
+
+def run_all(scenarios: list, repeat: int) -> list:
+    """Time every scenario ``repeat`` times plus one ``tracemalloc`` pass."""
+    rows = []
+    with SqlTimer() as timer:
+        for name in scenarios:
+            # Ein Durchlauf zum Aufwärmen (Importe, Verbindungsaufbau)
+            run_scenario(name, timer)
+            runs = [run_scenario(name, timer) for _ in range(repeat)]
+            memory = run_scenario(name, timer, memory=True)
+            for index, (step, _action) in enumerate(_steps(name)[1]):
+                walls = [run[index]["wall_ms"] for run in runs]
+                rows.append(
+                    {
+                        "page": name,
+                        "step": step,
+                        "wall_ms": statistics.median(walls),
+                        "wall_ms_min": min(walls),
+                        "wall_ms_max": max(walls),
+                        "sql_ms": statistics.median(run[index]["sql_ms"] for run in runs),
+                        "queries": runs[-1][index]["queries"],
+                        "peak_kib": memory[index]["peak_kib"],
+                    }
+                )
+    return rows
+
+
+def prepare_database(source: Path, scale: int, target_dir: Path) -> Path:
+    """Copy ``source`` (scaled by ``scale``) into ``target_dir`` and migrate it."""
+    target = target_dir / "bench_pages.sqlite"
+    shutil.copyfile(source, target)
+    conn = sqlite3.connect(target)
+    migrate(conn)
+    if scale > 1:
+        scale_database(conn, scale)
+    conn.execute("ANALYZE")
+    conn.close()
+    return target
+
+
+def _commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unbekannt"
+
+
+def _database_info(path: Path) -> dict:
+    conn = sqlite3.connect(path)
+    try:
+        counts = {
+            table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ("seasons", "matches", "players")
+        }
+    finally:
+        conn.close()
+    return {"path": str(path), "bytes": path.stat().st_size, **counts}
+
+
+def print_results(rows: list, baseline: dict = None) -> None:
+    reference = {}
+    if baseline:
+        reference = {(r["page"], r["step"]): r for r in baseline["results"]}
+    header = f"{'Seite':<11} {'Schritt':<22} {'Zeit ms':>9} {'SQL ms':>8} {'Abfr.':>5} {'Peak KiB':>9}"
+    if reference:
+        header += f" {'vorher ms':>10} {'Faktor':>7}"
+    print(header)
+    for row in rows:
+        line = (
+            f"{row['page']:<11} {row['step']:<22} {row['wall_ms']:>9.1f} {row['sql_ms']:>8.1f}"
+            f" {row['queries']:>5} {row['peak_kib']:>9.0f}"
+        )
+        old = reference.get((row["page"], row["step"]))
+        if old:
+            ratio = row["wall_ms"] / old["wall_ms"] if old["wall_ms"] else float("inf")
+            line += f" {old['wall_ms']:>10.1f} {ratio:>6.2f}x"
+        print(line)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Renderzeiten der Seiten messen (AppTest)")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB, help="Ausgangsdatenbank")
+    parser.add_argument(
+        "--scale", type=int, default=1, help="Datenbank vorher um diesen Faktor vergrößern"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Wiederholungen je Szenario")
+    parser.add_argument(
+        "--pages", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS),
+        help="nur diese Szenarien ausführen",
+    )
+    parser.add_argument("--output", type=Path, help="Ergebnisse als JSON speichern")
+    parser.add_argument("--compare", type=Path, help="JSON eines früheren Laufs zum Vergleich")
+    args = parser.parse_args(argv)
+
+    # Hinweise von AppTest ("No runtime found") unterdrücken
+    import logging
+
+    logging.disable(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = prepare_database(args.db, args.scale, Path(tmp))
+        # Muss vor dem ersten Import von core.data gesetzt sein
+        os.environ["SPORTS_LEAGUE_DB"] = str(db_path)
+        os.chdir(ROOT)
+        database = _database_info(db_path)
+        rows = run_all(args.pages, args.repeat)
+
+    result = {
+        "meta": {
+            "commit": _commit(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "scale": args.scale,
+            "repeat": args.repeat,
+            "database": database,
+        },
+        "results": rows,
+    }
+    baseline = json.loads(args.compare.read_text(encoding="utf-8")) if args.compare else None
+    print(
+        f"Datenbank: {database['matches']} Spiele, {database['players']} Spieler, "
+        f"{database['bytes'] / 2**20:.1f} MiB (Commit {result['meta']['commit']})"
+    )
+    print_results(rows, baseline)
+    if args.output:
+        args.output.write_text(json.dumps(result, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"Ergebnisse gespeichert: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""Micro-benchmark of the HTML renderers in :mod:`core.components`.
+
+Compares the former standings path (``DataFrame.style.apply`` with one Python
+call per row, ``Styler.to_html``) with :func:`core.components.standings_html`,
+and the former match cards (one ``st.markdown`` per ``iterrows`` row with
+inline styles) with :func:`core.components.match_cards_html`. Reports render
+time, HTML size and the number of elements sent to the browser.
+
+Usage::
+
+    python -m benchmarks.bench_render --teams 18 20 100 1000 --matches 3 9 380
+"""
+
+import argparse
+import logging
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+# Hinweise von Streamlit ("No runtime found") beim Import unterdrücken
+logging.disable(logging.WARNING)
+
+from core.components import match_cards_html, standings_html  # noqa: E402
+
+LEAGUE = SimpleNamespace(cl_spot=4, uel_spot=6, relegation_spot=16)
+
+
+def synthetic_table(teams: int, seed: int = 0) -> pd.DataFrame:
+    """Standings in the layout of :func:`core.components.standings_table`."""
+    rng = np.random.default_rng(seed)
+    won = rng.integers(0, 25, teams)
+    draw = rng.integers(0, 10, teams)
+    table = pd.DataFrame(
+        {
+            "Logo": [f"https://crests.football-data.org/{i}.png" for i in range(teams)],
+            "Team": [f"Team {i}" for i in range(teams)],
+            "Spiele": 34,
+            "Siege": won,
+            "Unentschieden": draw,
+            "Niederlagen": 34 - won - draw,
+            "Torverhältnis": rng.integers(-40, 60, teams),
+            "Punkte": won * 3 + draw,
+            "Form": rng.choice(["S U N S S", "U U S N S", "N N U S N"], teams),
+        }
+    ).sort_values("Punkte", ascending=False, ignore_index=True)
+    table.insert(0, "Platz", range(1, teams + 1))
+    return table
+
+
+def styler_html(table: pd.DataFrame, league) -> str:
+    """The former implementation (Styler with a per-row highlight function)."""
+    table = table.copy()
+    table["Logo"] = table["Logo"].apply(
+        lambda url: f"<img src='{url}' style='height:40px; width:auto; object-fit:contain;'>"
+    )
+    table = table.rename(columns={"Logo": ""})
+
+    def highlight_row(row):
+        pos = row["Platz"]
+        if pos <= league.cl_spot:
+            return ["background-color:#e6ffe6"] * len(row)
+        elif pos <= league.uel_spot:
+            return ["background-color:#e6f0ff"] * len(row)
+        elif pos >= league.relegation_spot:
+            return ["background-color:#ffe6e6"] * len(row)
+        else:
+            return [""] * len(row)
+
+    styled_df = (
+        table.style.apply(highlight_row, axis=1)
+        .hide(axis="index")
+        .set_table_styles(
+            [
+                {"selector": "th", "props": "text-align:center; background-color:#f0f0f0;"},
+                {"selector": "td", "props": "text-align:center;"},
+                {"selector": "table", "props": "border-collapse:collapse;"},
+            ]
+        )
+    )
+    return styled_df.to_html(escape=False)
+
+
+def synthetic_matches(count: int) -> pd.DataFrame:
+    """Match rows in the layout of :func:`core.data.get_season_matches`."""
+    ids = np.arange(count)
+    return pd.DataFrame(
+        {
+            "Liga": "Bundesliga",
+            "LigaIcon": "https://crests.football-data.org/BL1.png",
+            "Heim": [f"Team {i % 18}" for i in ids],
+            "HeimCrest": [f"https://crests.football-data.org/{i % 18}.png" for i in ids],
+            "Auswaerts": [f"Team {(i + 1) % 18}" for i in ids],
+            "AuswaertsCrest": [f"https://crests.football-data.org/{(i + 1) % 18}.png" for i in ids],
+            "HeimTore": ids % 4,
+            "AuswaertsTore": ids % 3,
+            "Datum": "2024-05-18",
+        }
+    )
+
+
+def iterrows_cards(matches: pd.DataFrame) -> list:
+    """The former implementation: one inline-styled block per row."""
+    cards = []
+    for _, row in matches.iterrows():
+        cards.append(
+            f"""
+        <div style='background-color:#f9f9f9; padding:1rem; border-radius:10px; margin-bottom:1rem;'>
+            <div style='display:flex; justify-content:center; align-items:center; font-weight:bold;'>
+                <div style='flex:1; text-align:right; margin-right:1rem;'>
+                    <img src='{row['HeimCrest']}' width='40'><br>{row['Heim']}
+                </div>
+                <div style='margin:0 1rem; font-size:1.5rem;'>{row['HeimTore']} : {row['AuswaertsTore']}</div>
+                <div style='flex:1; text-align:left; margin-left:1rem;'>
+                    <img src='{row['AuswaertsCrest']}' width='40'><br>{row['Auswaerts']}
+                </div>
+            </div>
+            <div style='text-align:center; font-size:0.9rem; margin-top:0.5rem;'>
+                <img src='{row['LigaIcon']}' width='25' style='vertical-align:middle;'> {row['Liga']} - {row['Datum']}
+            </div>
+        </div>
+        """
+        )
+    return cards
+
+
+def _size(result) -> int:
+    if isinstance(result, list):
+        return sum(len(part.encode("utf-8")) for part in result)
+    return len(result.encode("utf-8"))
+
+
+def _time(func, *args, repeat: int) -> tuple:
+    func(*args)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings), _size(result)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Tabellen-Renderer vergleichen")
+    parser.add_argument("--teams", type=int, nargs="+", default=[18, 20, 100, 1000])
+    parser.add_argument("--matches", type=int, nargs="+", default=[3, 9, 380])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    print(f"{'Teams':>6} {'Styler ms':>10} {'HTML ms':>9} {'Faktor':>7} {'Styler KiB':>11} {'HTML KiB':>9}")
+    for teams in args.teams:
+        table = synthetic_table(teams)
+        old_seconds, old_bytes = _time(styler_html, table, LEAGUE, repeat=args.repeat)
+        new_seconds, new_bytes = _time(standings_html, table, LEAGUE, repeat=args.repeat)
+        print(
+            f"{teams:>6} {old_seconds * 1000:>10.2f} {new_seconds * 1000:>9.2f}"
+            f" {old_seconds / new_seconds:>6.1f}x {old_bytes / 1024:>11.1f} {new_bytes / 1024:>9.1f}"
+        )
+
+    print()
+    print(f"{'Spiele':>6} {'iterrows ms':>12} {'HTML ms':>9} {'Faktor':>7} {'alt KiB':>8} {'neu KiB':>8} {'Elemente':>9}")
+    for count in args.matches:
+        matches = synthetic_matches(count)
+        old_seconds, old_bytes = _time(iterrows_cards, matches, repeat=args.repeat)
+        new_seconds, new_bytes = _time(match_cards_html, matches, repeat=args.repeat)
+        print(
+            f"{count:>6} {old_seconds * 1000:>12.2f} {new_seconds * 1000:>9.2f}"
+            f" {old_seconds / new_seconds:>6.1f}x {old_bytes / 1024:>8.1f} {new_bytes / 1024:>8.1f}"
+            f" {count:>4} -> 1"
+        )
+
+
+if __name__ == "__main__":
+    main()
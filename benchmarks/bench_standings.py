@@ -0,0 +1,151 @@
+"""Micro-benchmark of the standings engine.
+
+Compares the former row-by-row recalculation (``iterrows`` plus one UPDATE
+per team) with :func:`core.standings.aggregate_standings` and the batched
+UPSERT of :func:`core.standings.write_standings` on synthetic seasons of
+20 teams (double round robin, 380 matches per season).
+
+Usage::
+
+    python -m benchmarks.bench_standings --seasons 1 10 100 300
+"""
+
+import argparse
+import sqlite3
+import time
+
+import numpy as np
+import pandas as pd
+
+from core.migrate import migrate
+from core.standings import aggregate_standings, write_standings
+
+TEAMS_PER_SEASON = 20
+
+
+def synthetic_matches(seasons: int, seed: int = 0) -> pd.DataFrame:
+    """Double round robin of 20 teams per season with Poisson-distributed goals."""
+    rng = np.random.default_rng(seed)
+    home, away = np.where(~np.eye(TEAMS_PER_SEASON, dtype=bool))
+    per_season = len(home)
+    season = np.repeat(np.arange(1, seasons + 1), per_season)
+    return pd.DataFrame(
+        {
+            "league_id": 1,
+            "season_id": season,
+            "home_team_id": np.tile(home + 1, seasons),
+            "away_team_id": np.tile(away + 1, seasons),
+            "full_time_home": rng.poisson(1.5, per_season * seasons),
+            "full_time_away": rng.poisson(1.2, per_season * seasons),
+        }
+    )
+
+
+def legacy_standings(matches: pd.DataFrame) -> pd.DataFrame:
+    """The former ``recalc_standings`` loop, applied season by season."""
+    frames = []
+    for season_id, season in matches.groupby("season_id"):
+        stats = pd.DataFrame(index=range(1, TEAMS_PER_SEASON + 1))
+        for col in ["played_games", "won", "draw", "lost", "points", "goals_for", "goals_against"]:
+            stats[col] = 0
+        for _, m in season.iterrows():
+            h, a = int(m.home_team_id), int(m.away_team_id)
+            gh, ga = int(m.full_time_home), int(m.full_time_away)
+            stats.at[h, "played_games"] += 1
+            stats.at[a, "played_games"] += 1
+            stats.at[h, "goals_for"] += gh
+            stats.at[h, "goals_against"] += ga
+            stats.at[a, "goals_for"] += ga
+            stats.at[a, "goals_against"] += gh
+            if gh > ga:
+                stats.at[h, "won"] += 1
+                stats.at[a, "lost"] += 1
+                stats.at[h, "points"] += 3
+            elif gh < ga:
+                stats.at[a, "won"] += 1
+                stats.at[h, "lost"] += 1
+                stats.at[a, "points"] += 3
+            else:
+                stats.at[h, "draw"] += 1
+                stats.at[a, "draw"] += 1
+                stats.at[h, "points"] += 1
+                stats.at[a, "points"] += 1
+        stats["goal_difference"] = stats["goals_for"] - stats["goals_against"]
+        stats = (
+            stats.reset_index()
+            .rename(columns={"index": "team_id"})
+            .sort_values(["points", "goal_difference", "goals_for"], ascending=False)
+            .reset_index(drop=True)
+        )
+        stats["position"] = range(1, len(stats) + 1)
+        stats["league_id"] = 1
+        stats["season_id"] = season_id
+        frames.append(stats)
+    return pd.concat(frames, ignore_index=True)
+
+
+def legacy_write(conn: sqlite3.Connection, stats: pd.DataFrame) -> None:
+    """One UPDATE per team, as the former ``recalc_standings`` did."""
+    for row in stats.itertuples(index=False):
+        conn.execute(
+            """
+            UPDATE standings
+            SET played_games = ?, won = ?, draw = ?, lost = ?, points = ?, goals_for = ?,
+                goals_against = ?, goal_difference = ?, position = ?
+            WHERE season_id = ? AND team_id = ?
+            """,
+            (
+                row.played_games, row.won, row.draw, row.lost, row.points, row.goals_for,
+                row.goals_against, row.goal_difference, row.position, row.season_id,
+                row.team_id,
+            ),
+        )
+
+
+def timed(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark der Tabellenberechnung")
+    parser.add_argument("--seasons", type=int, nargs="+", default=[1, 10, 100, 300])
+    parser.add_argument(
+        "--legacy-max",
+        type=int,
+        default=20,
+        help="alte Berechnung nur bis zu dieser Saisonzahl messen (sie ist sehr langsam)",
+    )
+    args = parser.parse_args(argv)
+
+    print(
+        f"{'Saisons':>7} {'Spiele':>8}  {'alt rechnen':>11} {'neu rechnen':>11}"
+        f"  {'alt schreiben':>13} {'neu schreiben':>13}"
+    )
+    for seasons in args.seasons:
+        matches = synthetic_matches(seasons)
+        conn = sqlite3.connect(":memory:")
+        migrate(conn)
+
+        new_compute = timed(aggregate_standings, matches)
+        stats = aggregate_standings(matches)
+        new_write = timed(write_standings, conn, stats)
+        conn.commit()
+
+        if seasons <= args.legacy_max:
+            old_compute = f"{timed(legacy_standings, matches):10.3f}s"
+            old_write = f"{timed(legacy_write, conn, stats):12.3f}s"
+            conn.commit()
+        else:
+            old_compute, old_write = f"{'-':>11}", f"{'-':>13}"
+        conn.close()
+
+        print(
+            f"{seasons:>7} {len(matches):>8}  {old_compute} {new_compute:10.3f}s"
+            f"  {old_write} {new_write:12.3f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
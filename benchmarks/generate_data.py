@@ -0,0 +1,375 @@
+"""Deterministic synthetic league database for scale tests.
+
+Creates a new SQLite file with the app's schema (via :func:`core.migrate.migrate`)
+and fills it with ``--leagues`` leagues of ``--teams`` teams each, playing
+``--seasons`` seasons of a full double round robin. Goals follow Poisson
+distributions with the home/away averages of the real data, every team gets a
+squad of ``--squad`` players, and the standings are computed from the
+generated matches with :func:`core.standings.aggregate_standings` (the form
+with :func:`core.standings.update_form`). The same
+arguments and ``--seed`` always produce the same database.
+
+Leagues 1 to 5 carry the names, icons and table zones of the real leagues,
+so the league pages and benchmarks work unchanged.
+
+Usage::
+
+    python -m benchmarks.generate_data big.sqlite --leagues 20 --seasons 50
+    python -m benchmarks.bench_pages --db big.sqlite
+"""
+
+import argparse
+import sqlite3
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from core.migrate import migrate
+from core.standings import STAT_COLUMNS, aggregate_standings, update_form
+
+# Durchschnittliche Tore je Spiel in den Originaldaten
+HOME_GOALS = 1.59
+AWAY_GOALS = 1.29
+HALF_TIME_SHARE = 0.45
+
+REAL_LEAGUES = [
+    # (Name, Land, Icon, CL-Plätze, UEL-Plätze); Abstieg ab Platz teams - 2, also die letzten drei
+    ("Premier League", "England", "https://crests.football-data.org/PL.png", 4, 6),
+    ("Serie A", "Italy", "https://crests.football-data.org/SA.png", 4, 5),
+    ("La Liga", "Spain", "https://crests.football-data.org/PD.png", 4, 5),
+    ("Bundesliga", "Germany", "https://crests.football-data.org/BL1.png", 4, 5),
+    ("Ligue 1", "France", "https://crests.football-data.org/FL1.png", 3, 4),
+]
+COUNTRIES = [
+    "England", "Italy", "Spain", "Germany", "France", "Portugal", "Netherlands",
+    "Belgium", "Brazil", "Argentina", "Denmark", "Austria", "Switzerland", "Croatia",
+]
+PREFIXES = ["FC", "SC", "SV", "AC", "AS", "Real", "Sporting", "Athletic", "United", "Racing"]
+CITIES = [
+    "Aalborg", "Bergheim", "Castell", "Dornbach", "Eisenau", "Falkenried", "Grünwald",
+    "Hafenstadt", "Isarfeld", "Jakobsdorf", "Kirchberg", "Lindenau", "Marienthal",
+    "Neustein", "Oberweiler", "Porto Alto", "Quellental", "Rosenheim", "Sankt Aurel",
+    "Talheim", "Unterbach", "Valverde", "Weidenfeld", "Xanten", "Ybbsfeld", "Zederhaus",
+]
+FIRST_NAMES = [
+    "Lukas", "Mateo", "Jonas", "Luca", "Hugo", "Noah", "Leon", "Marco", "Tomás", "Emil",
+    "Rafael", "Jan", "Pierre", "Diego", "Felix", "Nico", "Samuel", "Adrián", "Kevin", "Yann",
+    "Oliver", "Bruno", "Milan", "Theo", "Davide", "Florian", "Karim", "Joško", "Thiago", "Ben",
+]
+LAST_NAMES = [
+    "Müller", "García", "Rossi", "Martin", "Smith", "Silva", "Schmidt", "Fernández",
+    "Bianchi", "Bernard", "Jones", "Santos", "Schneider", "López", "Romano", "Dubois",
+    "Taylor", "Costa", "Fischer", "Martínez", "Ricci", "Moreau", "Brown", "Pereira",
+    "Weber", "Sánchez", "Greco", "Laurent", "Wilson", "Oliveira", "Wagner", "Ruiz",
+]
+POSITIONS = ["Goalkeeper", "Defence", "Midfield", "Offence"]
+# Kaderanteile je Position (wie in den Originaldaten)
+POSITION_SHARE = [0.13, 0.35, 0.31, 0.21]
+
+
+def round_robin(teams: int) -> tuple:
+    """Double round robin via the circle method.
+
+    Returns ``(matchday, home, away)`` arrays with team indices ``0..teams-1``;
+    the second half mirrors the first with home and away swapped.
+    """
+    if teams % 2:
+        raise ValueError("Die Teamzahl muss gerade sein")
+    rotation = list(range(1, teams))
+    matchday, home, away = [], [], []
+    for day in range(teams - 1):
+        order = [0] + rotation
+        for i in range(teams // 2):
+            first, second = order[i], order[teams - 1 - i]
+            # Heimrecht abwechseln, damit jedes Team etwa gleich oft zu Hause spielt
+            if (day + i) % 2:
+                first, second = second, first
+            matchday.append(day + 1)
+            home.append(first)
+            away.append(second)
+        rotation = rotation[-1:] + rotation[:-1]
+    matchday = np.array(matchday)
+    home, away = np.array(home), np.array(away)
+    return (
+        np.concatenate([matchday, matchday + teams - 1]),
+        np.concatenate([home, away]),
+        np.concatenate([away, home]),
+    )
+
+
+def _insert(conn: sqlite3.Connection, table: str, frame: pd.DataFrame) -> None:
+    columns = list(frame.columns)
+    # tolist() liefert Python-Typen, die sqlite3 direkt binden kann
+    values = zip(*(frame[col].tolist() for col in columns))
+    conn.executemany(
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+        values,
+    )
+
+
+def generate_master_data(conn: sqlite3.Connection, rng, leagues: int, teams: int,
+                         seasons: int, squad: int, first_year: int) -> pd.DataFrame:
+    """Leagues, seasons, stadiums, coaches, referees, teams and players."""
+    league_rows = []
+    for league_id in range(1, leagues + 1):
+        if league_id <= len(REAL_LEAGUES):
+            name, country, icon, cl, uel = REAL_LEAGUES[league_id - 1]
+        else:
+            country = COUNTRIES[(league_id - 1) % len(COUNTRIES)]
+            name, icon, cl, uel = f"Liga {league_id}", REAL_LEAGUES[0][2], 4, 6
+        league_rows.append((league_id, name, country, league_id, icon, cl, uel, teams - 2))
+    _insert(
+        conn,
+        "leagues",
+        pd.DataFrame(
+            league_rows,
+            columns=["league_id", "name", "country", "country_id", "icon_url",
+                     "cl_spot", "uel_spot", "relegation_spot"],
+        ),
+    )
+
+    # Saison-IDs steigen je Liga mit dem Jahr, die höchste ist die aktuelle
+    season_frame = pd.DataFrame(
+        {
+            "season_id": np.arange(1, leagues * seasons + 1),
+            "league_id": np.repeat(np.arange(1, leagues + 1), seasons),
+            "year": [f"{y}-{y + 1}" for y in range(first_year, first_year + seasons)] * leagues,
+        }
+    )
+    _insert(conn, "seasons", season_frame)
+
+    team_count = leagues * teams
+    team_ids = np.arange(1, team_count + 1)
+    prefixes = rng.choice(PREFIXES, team_count)
+    cities = [CITIES[i % len(CITIES)] for i in range(team_count)]
+    names = [
+        f"{prefix} {city}" + (f" {i // len(CITIES) + 1}" if i >= len(CITIES) else "")
+        for i, (prefix, city) in enumerate(zip(prefixes, cities))
+    ]
+    _insert(
+        conn,
+        "stadiums",
+        pd.DataFrame(
+            {
+                "stadium_id": team_ids,
+                "name": [f"Stadion {city}" for city in cities],
+                "location": cities,
+                "capacity": rng.integers(8_000, 80_000, team_count).astype(float),
+            }
+        ),
+    )
+    _insert(
+        conn,
+        "coaches",
+        pd.DataFrame(
+            {
+                "coach_id": team_ids,
+                "name": [
+                    f"{FIRST_NAMES[a]} {LAST_NAMES[b]}"
+                    for a, b in zip(
+                        rng.integers(0, len(FIRST_NAMES), team_count),
+                        rng.integers(0, len(LAST_NAMES), team_count),
+                    )
+                ],
+                "team_id": team_ids,
+                "nationality": rng.choice(COUNTRIES, team_count),
+            }
+        ),
+    )
+    _insert(
+        conn,
+        "referees",
+        pd.DataFrame(
+            {
+                "referee_id": np.arange(1, 51),
+                "name": [f"{FIRST_NAMES[i % 30]} {LAST_NAMES[(i * 7) % 32]}" for i in range(50)],
+                "nationality": rng.choice(COUNTRIES, 50),
+            }
+        ),
+    )
+    team_frame = pd.DataFrame(
+        {
+            "team_id": team_ids,
+            "name": names,
+            "founded_year": rng.integers(1870, 1960, team_count).astype(float),
+            "stadium_id": team_ids,
+            "league_id": np.repeat(np.arange(1, leagues + 1), teams),
+            "coach_id": team_ids,
+            "cresturl": [f"https://crests.football-data.org/{(i % 96) + 1}.png" for i in range(team_count)],
+        }
+    )
+    _insert(conn, "teams", team_frame)
+
+    player_count = team_count * squad
+    birth = pd.Timestamp(f"{first_year + seasons - 35}-01-01") + pd.to_timedelta(
+        rng.integers(0, 18 * 365, player_count), unit="D"
+    )
+    _insert(
+        conn,
+        "players",
+        pd.DataFrame(
+            {
+                "player_id": np.arange(1, player_count + 1),
+                "team_id": np.repeat(team_ids, squad),
+                "name": [
+                    f"{FIRST_NAMES[a]} {LAST_NAMES[b]}"
+                    for a, b in zip(
+                        rng.integers(0, len(FIRST_NAMES), player_count),
+                        rng.integers(0, len(LAST_NAMES), player_count),
+                    )
+                ],
+                "position": rng.choice(POSITIONS, player_count, p=POSITION_SHARE),
+                "date_of_birth": birth.strftime("%Y-%m-%d"),
+                "nationality": rng.choice(COUNTRIES, player_count),
+            }
+        ),
+    )
+    return season_frame
+
+
+def generate_league(conn: sqlite3.Connection, rng, league_id: int, seasons: pd.DataFrame,
+                    teams: int, first_year: int, first_match_id: int) -> int:
+    """Matches, scores and standings of every season of one league.
+
+    Returns the number of matches written.
+    """
+    matchday, home, away = round_robin(teams)
+    per_season = len(matchday)
+    n_seasons = len(seasons)
+    total = per_season * n_seasons
+    team_offset = (league_id - 1) * teams + 1
+
+    season_index = np.repeat(np.arange(n_seasons), per_season)
+    matchdays = np.tile(matchday, n_seasons)
+    # Saisonstart Mitte August, ein Spieltag pro Woche, Anstoß zwischen 13:30 und 20:30
+    season_start = pd.to_datetime([f"{first_year + i}-08-15" for i in range(n_seasons)], utc=True)
+    kickoff = (
+        season_start.asi8[season_index] // 10**9
+        + (matchdays - 1) * 7 * 86_400
+        + (13 * 3600 + 1800)
+        + rng.integers(0, 8, total) * 3600
+    )
+    full_home = rng.poisson(HOME_GOALS, total)
+    full_away = rng.poisson(AWAY_GOALS, total)
+    match_ids = np.arange(first_match_id, first_match_id + total)
+
+    matches = pd.DataFrame(
+        {
+            "match_id": match_ids,
+            "season_id": seasons["season_id"].to_numpy()[season_index],
+            "league_id": league_id,
+            "matchday": matchdays,
+            "home_team_id": np.tile(home, n_seasons) + team_offset,
+            "away_team_id": np.tile(away, n_seasons) + team_offset,
+            "winner": np.select(
+                [full_home > full_away, full_home < full_away],
+                ["HOME_TEAM", "AWAY_TEAM"],
+                default="DRAW",
+            ),
+            "utc_date": np.char.add(
+                np.datetime_as_string(kickoff.astype("datetime64[s]"), unit="s"), "Z"
+            ),
+            "kickoff": kickoff,
+        }
+    )
+    _insert(conn, "matches", matches)
+    _insert(
+        conn,
+        "scores",
+        pd.DataFrame(
+            {
+                "score_id": match_ids,
+                "match_id": match_ids,
+                "full_time_home": full_home,
+                "full_time_away": full_away,
+                "half_time_home": rng.binomial(full_home, HALF_TIME_SHARE),
+                "half_time_away": rng.binomial(full_away, HALF_TIME_SHARE),
+            }
+        ),
+    )
+
+    stats = aggregate_standings(
+        matches.assign(full_time_home=full_home, full_time_away=full_away)
+    )
+    _insert(
+        conn,
+        "standings",
+        stats[["season_id", "league_id", "team_id", "position", *STAT_COLUMNS]],
+    )
+    return total
+
+
+def generate(path: Path, leagues: int = 5, seasons: int = 10, teams: int = 20,
+             squad: int = 25, seed: int = 0, first_year: int = None) -> dict:
+    """Create the database at ``path``; returns row counts and the runtime."""
+    if path.exists():
+        raise FileExistsError(f"{path} existiert bereits")
+    started = time.perf_counter()
+    first_year = first_year if first_year is not None else 2024 - seasons
+    rng = np.random.default_rng(seed)
+
+    conn = sqlite3.connect(path, isolation_level=None)
+    try:
+        migrate(conn)
+        # Nur für den Aufbau: kein Journal, kein fsync
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        # Indizes der großen Tabellen erst nach dem Laden aufbauen
+        indexes = conn.execute(
+            """
+            SELECT name, sql FROM sqlite_master
+            WHERE type = 'index' AND sql IS NOT NULL
+              AND tbl_name IN ('matches', 'scores', 'standings')
+            """
+        ).fetchall()
+        conn.execute("BEGIN")
+        for name, _sql in indexes:
+            conn.execute(f"DROP INDEX {name}")
+        season_frame = generate_master_data(conn, rng, leagues, teams, seasons, squad, first_year)
+        next_match_id = 1
+        for league_id, league_seasons in season_frame.groupby("league_id"):
+            next_match_id += generate_league(
+                conn, rng, int(league_id), league_seasons, teams, first_year, next_match_id
+            )
+        for _name, sql in indexes:
+            conn.execute(sql)
+        # Form erst mit den Indizes bestimmen (eine Fensterabfrage je Liga)
+        for league_id in season_frame["league_id"].unique():
+            update_form(conn, int(league_id))
+        conn.execute("COMMIT")
+        conn.execute("ANALYZE")
+        conn.execute("PRAGMA journal_mode = WAL")
+        counts = {
+            table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ("leagues", "seasons", "teams", "players", "matches", "standings")
+        }
+    finally:
+        conn.close()
+    counts["seconds"] = time.perf_counter() - started
+    return counts
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Synthetische Ligadatenbank erzeugen")
+    parser.add_argument("output", type=Path, help="neue SQLite-Datei")
+    parser.add_argument("--leagues", type=int, default=5, help="Anzahl Ligen")
+    parser.add_argument("--seasons", type=int, default=10, help="Saisons je Liga")
+    parser.add_argument("--teams", type=int, default=20, help="Teams je Liga (gerade Zahl)")
+    parser.add_argument("--squad", type=int, default=25, help="Spieler je Team")
+    parser.add_argument("--seed", type=int, default=0, help="Startwert des Zufallsgenerators")
+    args = parser.parse_args(argv)
+
+    counts = generate(
+        args.output, args.leagues, args.seasons, args.teams, args.squad, args.seed
+    )
+    print(
+        f"{args.output}: {counts['leagues']} Ligen, {counts['seasons']} Saisons, "
+        f"{counts['teams']} Teams, {counts['players']} Spieler, {counts['matches']} Spiele "
+        f"({counts['seconds']:.1f} s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Import cost per page, measured with ``python -X importtime``.
+
+For every page the module-level imports (as a fresh process would run them
+on the first page load) are executed in a new interpreter with
+``-X importtime``. The report lists the total import time per page and the
+most expensive top-level packages, so cold-start regressions show up as soon
+as a page pulls in a new heavy dependency. Every module's self time counts
+for its own top-level package, so pandas loaded through ``core.data`` shows
+up as ``pandas`` and not as ``core``. Imports inside functions (lazy
+imports) are not counted, they are paid only when the code path runs.
+
+Usage::
+
+    python -m benchmarks.import_profile
+    python -m benchmarks.import_profile --output importe.json --compare vorher.json
+"""
+
+import argparse
+import ast
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+# Abweichung, ab der --compare eine Seite als langsamer markiert
+REGRESSION = 1.2
+
+
+def pages() -> list:
+    return [ROOT / "Startseite.py"] + sorted((ROOT / "pages").glob("*.py"))
+
+
+def module_imports(path: Path) -> str:
+    """The module-level import statements of a page as source code."""
+    tree = ast.parse(path.read_text(encoding="utf-8"))
+    nodes = [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+    return "\n".join(ast.unparse(node) for node in nodes)
+
+
+def measure(code: str) -> dict:
+    """Run ``code`` with ``-X importtime``; return total and per-package microseconds."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    total = 0
+    packages = {}
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if not match:
+            continue
+        own, _cumulative, _indent, name = match.groups()
+        total += int(own)
+        # Eigene Zeit jedes Moduls seinem Paket zuschlagen, egal wer es importiert
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0) + int(own)
+    return {"total_us": total, "packages": packages}
+
+
+def profile(repeat: int) -> list:
+    """Measure every page ``repeat`` times and keep the fastest run."""
+    rows = []
+    for path in pages():
+        code = module_imports(path)
+        runs = [measure(code) for _ in range(repeat)]
+        best = min(runs, key=lambda run: run["total_us"])
+        rows.append(
+            {
+                "page": path.stem,
+                "imports": code.count("\n") + 1 if code else 0,
+                "total_ms": best["total_us"] / 1000,
+                "packages": {
+                    name: us / 1000
+                    for name, us in sorted(best["packages"].items(), key=lambda item: -item[1])
+                },
+            }
+        )
+    return rows
+
+
+def print_results(rows: list, top: int, baseline: dict = None) -> None:
+    reference = {row["page"]: row for row in baseline["results"]} if baseline else {}
+    header = f"{'Seite':<20} {'Importe ms':>10}"
+    if reference:
+        header += f" {'vorher ms':>10} {'Faktor':>7}"
+    print(header + "  teuerste Pakete")
+    for row in rows:
+        line = f"{row['page']:<20} {row['total_ms']:>10.0f}"
+        old = reference.get(row["page"])
+        if old:
+            ratio = row["total_ms"] / old["total_ms"] if old["total_ms"] else float("inf")
+            marker = " !" if ratio > REGRESSION else "  "
+            line += f" {old['total_ms']:>10.0f} {ratio:>6.2f}x{marker}"
+        packages = ", ".join(
+            f"{name} {ms:.0f}" for name, ms in list(row["packages"].items())[:top]
+        )
+        print(f"{line}  {packages}")
+        if old:
+            new_packages = sorted(set(row["packages"]) - set(old["packages"]))
+            if new_packages:
+                print(f"{'':<20} neu importiert: {', '.join(new_packages)}")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Importzeiten der Seiten messen (-X importtime)")
+    parser.add_argument("--repeat", type=int, default=5, help="Messungen je Seite (Minimum zählt)")
+    parser.add_argument("--top", type=int, default=5, help="angezeigte Pakete je Seite")
+    parser.add_argument("--output", type=Path, help="Ergebnisse als JSON speichern")
+    parser.add_argument("--compare", type=Path, help="JSON eines früheren Laufs zum Vergleich")
+    args = parser.parse_args(argv)
+
+    rows = profile(args.repeat)
+    baseline = json.loads(args.compare.read_text(encoding="utf-8")) if args.compare else None
+    print_results(rows, args.top, baseline)
+    if args.output:
+        args.output.write_text(
+            json.dumps({"results": rows}, indent=2, ensure_ascii=False), encoding="utf-8"
+        )
+        print(f"Ergebnisse gespeichert: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
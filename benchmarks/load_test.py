@@ -0,0 +1,474 @@
+"""Load test: many simultaneous sessions against one Streamlit server process.
+
+The harness starts ``streamlit run Startseite.py`` on a copy of the database
+(or uses a running server via ``--url``) and connects one websocket per
+virtual user, speaking the same protocol as the browser. Every user keeps its
+session and picks random actions: open the start page and switch leagues,
+page through matchdays, search players and, with probability
+``--write-ratio``, add a match on the Matches page and delete it again.
+
+Per session count it reports latency percentiles per interaction (from
+sending the widget change to the end of the script run), throughput, lock
+errors (``database is locked``, exhausted pool), other errors shown by the
+app and the memory of the server process.
+
+Usage::
+
+    python -m benchmarks.load_test --sessions 1 4 8 16 --duration 20
+    python -m benchmarks.load_test --db gross.sqlite --sessions 8 --output last.json
+    python -m benchmarks.load_test --url http://localhost:8501 --pid 4711
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+from benchmarks.bench_pages import ROOT, _commit, _database_info, prepare_database
+from core.migrate import DEFAULT_DB
+
+LEAGUE_PAGES = {
+    "Bundesliga": 4,
+    "La_Liga": 3,
+    "Ligue_1": 5,
+    "Premier_League": 1,
+    "Serie_A": 2,
+}
+SEARCH_TERMS = ["müller", "silva", "germany", "fc", "mar", "jo", "spain", "kan"]
+# Testspiele liegen weit in der Zukunft, damit nur sie wieder gelöscht werden
+TEST_MATCH_DATE = "2099/01/01"
+STARTUP_TIMEOUT = 60
+RUN_TIMEOUT = 120
+# Pause vor dem Neuverbinden nach einer abgebrochenen Sitzung
+RECONNECT_DELAY = 0.5
+
+
+class ScriptError(RuntimeError):
+    """The app showed an exception during a script run."""
+
+
+class BrowserSession:
+    """One browser tab: a websocket session with its own widget state."""
+
+    def __init__(self, url: str):
+        self.url = url.replace("http", "ws", 1).rstrip("/") + "/_stcore/stream"
+        self.ws = None
+        self.page_hash = ""
+        self.states = {}
+        self.elements = []
+
+    async def connect(self) -> None:
+        from tornado.websocket import websocket_connect
+
+        self.ws = await websocket_connect(self.url, subprotocols=["streamlit"])
+
+    def close(self) -> None:
+        if self.ws is not None:
+            self.ws.close()
+
+    async def _rerun(self, page_name: str = None, trigger=None) -> None:
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        msg = BackMsg()
+        if page_name is not None:
+            msg.rerun_script.page_name = page_name
+        else:
+            msg.rerun_script.page_script_hash = self.page_hash
+        msg.rerun_script.widget_states.widgets.extend(self.states.values())
+        if trigger is not None:
+            msg.rerun_script.widget_states.widgets.append(trigger)
+        await self.ws.write_message(msg.SerializeToString(), binary=True)
+
+        self.elements = []
+        errors = []
+        while True:
+            raw = await asyncio.wait_for(self.ws.read_message(), RUN_TIMEOUT)
+            if raw is None:
+                raise ConnectionError("Verbindung zum Server getrennt")
+            forward = ForwardMsg()
+            forward.ParseFromString(raw)
+            kind = forward.WhichOneof("type")
+            if kind == "new_session":
+                # Neuer Durchlauf (auch nach st.rerun()): Elemente neu sammeln
+                self.elements = []
+            elif kind == "navigation":
+                # Hash der aktuellen Seite für die folgenden Durchläufe
+                self.page_hash = forward.navigation.page_script_hash
+            elif kind == "delta" and forward.delta.WhichOneof("type") == "new_element":
+                element = forward.delta.new_element
+                element_type = element.WhichOneof("type")
+                if element_type == "exception":
+                    errors.append(element.exception.message)
+                self.elements.append((element_type, getattr(element, element_type)))
+            elif kind == "script_finished":
+                status = forward.script_finished
+                if status == ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    continue
+                if status == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    errors.append("Kompilierfehler")
+                break
+        if errors:
+            raise ScriptError("; ".join(errors))
+
+    def _widget(self, element_type: str, label: str = None, key: str = None, index: int = 0):
+        matches = [
+            proto for kind, proto in self.elements
+            if kind == element_type
+            and (label is None or proto.label == label)
+            and (key is None or proto.id.endswith(f"-{key}"))
+        ]
+        if len(matches) <= index:
+            raise LookupError(f"{element_type} {label or key} nicht gefunden")
+        return matches[index]
+
+    def _set(self, widget_id: str, field: str, value) -> None:
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        state = WidgetState(id=widget_id)
+        if field == "string_array_value":
+            state.string_array_value.data.extend(value)
+        else:
+            setattr(state, field, value)
+        self.states[widget_id] = state
+
+    def labels(self, element_type: str) -> list:
+        return [proto.label for kind, proto in self.elements if kind == element_type]
+
+    async def open(self, page_name: str) -> None:
+        """Navigate to a page (``""`` is the start page)."""
+        self.states = {}
+        await self._rerun(page_name=page_name)
+
+    async def click(self, label: str = None, key: str = None) -> None:
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        button = self._widget("button", label, key)
+        await self._rerun(trigger=WidgetState(id=button.id, trigger_value=True))
+
+    async def type_text(self, label: str, value: str) -> None:
+        self._set(self._widget("text_input", label).id, "string_value", value)
+        await self._rerun()
+
+    async def select_row(self, row: int, table: int = 0) -> None:
+        frame = self._widget("arrow_data_frame", index=table)
+        value = json.dumps({"selection": {"rows": [row], "columns": []}})
+        self._set(frame.id, "string_value", value)
+        await self._rerun()
+
+    def table(self, index: int = 0):
+        """Contents of the ``index``-th dataframe of the last run (pandas)."""
+        import pyarrow as pa
+
+        data = self._widget("arrow_data_frame", index=index).data
+        return pa.ipc.open_stream(data).read_all().to_pandas()
+
+
+class Recorder:
+    """Collects latencies and errors of all virtual users."""
+
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {"lock": 0, "other": 0}
+        self.messages = []
+        # Auswahl ging ins Leere, weil andere Nutzer die Liste geändert haben
+        self.conflicts = 0
+        # Sitzungen, deren Verbindung nicht zustande kam oder abbrach
+        self.failed_sessions = 0
+
+    async def timed(self, action: str, awaitable) -> None:
+        start = time.perf_counter()
+        await awaitable
+        self.latencies.setdefault(action, []).append(time.perf_counter() - start)
+
+    def _message(self, text: str) -> None:
+        if len(self.messages) < 20:
+            self.messages.append(text[:300])
+
+    def error(self, exc: BaseException) -> None:
+        text = str(exc) or type(exc).__name__
+        locked = any(word in text for word in ("locked", "busy", "kein Lesezugriff"))
+        self.errors["lock" if locked else "other"] += 1
+        self._message(text)
+
+    def session_failed(self, exc: BaseException) -> None:
+        self.failed_sessions += 1
+        self._message(f"Sitzung abgebrochen: {str(exc) or type(exc).__name__}")
+
+
+async def browse_start(session: BrowserSession, rec: Recorder, rng: random.Random) -> None:
+    await rec.timed("Startseite laden", session.open(""))
+    for _ in range(2):
+        label = rng.choice(session.labels("button"))
+        await rec.timed("Liga wechseln", session.click(label=label))
+
+
+async def browse_matchdays(session: BrowserSession, rec: Recorder, rng: random.Random) -> None:
+    page, league_id = rng.choice(list(LEAGUE_PAGES.items()))
+    await rec.timed("Ligaseite laden", session.open(page))
+    for _ in range(3):
+        key = rng.choice([f"next_matchday_{league_id}", f"prev_matchday_{league_id}"])
+        await rec.timed("Spieltag blättern", session.click(key=key))
+
+
+async def search_players(session: BrowserSession, rec: Recorder, rng: random.Random) -> None:
+    await rec.timed("Spielerseite laden", session.open("Spieler"))
+    for term in rng.sample(SEARCH_TERMS, 2):
+        await rec.timed("Spieler suchen", session.type_text("Nach Spieler suchen", term))
+
+
+async def add_and_delete_match(session: BrowserSession, rec: Recorder, rng: random.Random) -> None:
+    await rec.timed("Matches laden", session.open("Matches"))
+    # Formularfelder (der Filter darunter heißt ebenfalls "Auswärtsmannschaft")
+    away = session._widget("selectbox", "Auswärtsmannschaft")
+    session._set(away.id, "string_value", away.options[1])
+    session._set(session._widget("date_input", "Datum").id, "string_array_value", [TEST_MATCH_DATE])
+    session._set(session._widget("number_input", "Spieltag").id, "int_value", rng.randint(1, 34))
+    await rec.timed("Match anlegen", session.click(label="Match hinzufügen"))
+
+    # Neuestes Spiel steht oben; nur eigene Testspiele löschen
+    if str(session.table()["Datum"].iloc[0]).startswith(TEST_MATCH_DATE[:4]):
+        await rec.timed("Match auswählen", session.select_row(0))
+        if "Match löschen" not in session.labels("button"):
+            rec.conflicts += 1
+            return
+        await rec.timed("Match löschen", session.click(label="Match löschen"))
+
+
+ACTIONS = [
+    (browse_start, 3),
+    (browse_matchdays, 4),
+    (search_players, 2),
+]
+
+
+async def virtual_user(url: str, rec: Recorder, seed: int, deadline: float,
+                       write_ratio: float) -> None:
+    """Act as one user until ``deadline``; a lost connection starts a new session."""
+    from tornado.httpclient import HTTPClientError
+    from tornado.websocket import WebSocketClosedError
+
+    rng = random.Random(seed)
+    functions, weights = zip(*ACTIONS)
+    while time.perf_counter() < deadline:
+        session = BrowserSession(url)
+        try:
+            await session.connect()
+            while time.perf_counter() < deadline:
+                if rng.random() < write_ratio:
+                    action = add_and_delete_match
+                else:
+                    action = rng.choices(functions, weights)[0]
+                try:
+                    await action(session, rec, rng)
+                except (ScriptError, LookupError, asyncio.TimeoutError) as exc:
+                    rec.error(exc)
+        except (ConnectionError, OSError, WebSocketClosedError, HTTPClientError) as exc:
+            # Verbindung weg (Server neu gestartet, überlastet, Socket zu): als
+            # fehlgeschlagene Sitzung zählen und mit einer neuen weitermachen
+            rec.session_failed(exc)
+            await asyncio.sleep(RECONNECT_DELAY)
+        finally:
+            session.close()
+
+
+def _rss_mib(pid: int) -> float:
+    """Resident memory of process ``pid`` in MiB (Linux)."""
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as handle:
+            for line in handle:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def _percentile(values: list, q: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_level(url: str, pid: int, sessions: int, duration: float, write_ratio: float,
+              seed: int) -> dict:
+    """Run ``sessions`` virtual users for ``duration`` seconds."""
+    rec = Recorder()
+    rss_before = _rss_mib(pid) if pid else None
+
+    async def level():
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(
+            *(virtual_user(url, rec, seed * 1000 + i, deadline, write_ratio)
+              for i in range(sessions))
+        )
+
+    start = time.perf_counter()
+    asyncio.run(level())
+    wall = time.perf_counter() - start
+    rss_after = _rss_mib(pid) if pid else None
+
+    every = [value for values in rec.latencies.values() for value in values]
+    actions = {
+        name: {
+            "count": len(values),
+            "p50_ms": _percentile(values, 50) * 1000,
+            "p95_ms": _percentile(values, 95) * 1000,
+            "p99_ms": _percentile(values, 99) * 1000,
+        }
+        for name, values in sorted(rec.latencies.items())
+    }
+    return {
+        "sessions": sessions,
+        "seconds": wall,
+        "interactions": len(every),
+        "throughput": len(every) / wall,
+        "p50_ms": _percentile(every, 50) * 1000 if every else None,
+        "p95_ms": _percentile(every, 95) * 1000 if every else None,
+        "p99_ms": _percentile(every, 99) * 1000 if every else None,
+        "mean_ms": statistics.fmean(every) * 1000 if every else None,
+        "lock_errors": rec.errors["lock"],
+        "other_errors": rec.errors["other"],
+        "conflicts": rec.conflicts,
+        "failed_sessions": rec.failed_sessions,
+        "error_messages": rec.messages,
+        "rss_mib": rss_after,
+        "rss_growth_mib": None if rss_after is None else rss_after - rss_before,
+        "actions": actions,
+    }
+
+
+def _ms(value) -> str:
+    return "-" if value is None else f"{value:.0f} ms"
+
+
+def print_level(result: dict) -> None:
+    memory = "unbekannt"
+    if result["rss_mib"] is not None:
+        memory = f"{result['rss_mib']:.0f} MiB ({result['rss_growth_mib']:+.1f})"
+    print(
+        f"{result['sessions']:>4} Sitzungen: {result['interactions']:>5} Aktionen, "
+        f"{result['throughput']:>6.1f}/s, p50 {_ms(result['p50_ms'])}, "
+        f"p95 {_ms(result['p95_ms'])}, p99 {_ms(result['p99_ms'])}, "
+        f"Sperrfehler {result['lock_errors']}, andere Fehler {result['other_errors']}, "
+        f"Konflikte {result['conflicts']}, abgebrochene Sitzungen {result['failed_sessions']}, "
+        f"Server-Speicher {memory}"
+    )
+    for name, stats in result["actions"].items():
+        print(
+            f"       {name:<20} {stats['count']:>5}  p50 {stats['p50_ms']:>7.0f}"
+            f"  p95 {stats['p95_ms']:>7.0f}  p99 {stats['p99_ms']:>7.0f} ms"
+        )
+    for message in result["error_messages"][:3]:
+        print(f"       Fehler: {message}")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(db_path: Path, pool_size: int = None) -> tuple:
+    """Start ``streamlit run`` on ``db_path``; return (process, url)."""
+    port = _free_port()
+    env = dict(os.environ, SPORTS_LEAGUE_DB=str(db_path))
+    if pool_size:
+        env["SPORTS_LEAGUE_POOL_SIZE"] = str(pool_size)
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "streamlit", "run", "Startseite.py",
+            "--server.headless", "true",
+            "--server.port", str(port),
+            "--server.fileWatcherType", "none",
+            "--browser.gatherUsageStats", "false",
+        ],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    started = time.monotonic()
+    while time.monotonic() - started < STARTUP_TIMEOUT:
+        try:
+            with urllib.request.urlopen(f"{url}/_stcore/health", timeout=1) as response:
+                if response.status == 200:
+                    return process, url
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError("Streamlit-Server ist nicht gestartet")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Lasttest mit vielen gleichzeitigen Sitzungen")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB, help="Ausgangsdatenbank")
+    parser.add_argument(
+        "--scale", type=int, default=1, help="Datenbank vorher um diesen Faktor vergrößern"
+    )
+    parser.add_argument(
+        "--url", help="laufenden Server verwenden statt einen eigenen zu starten"
+    )
+    parser.add_argument("--pid", type=int, help="Prozess-ID des Servers (Speichermessung bei --url)")
+    parser.add_argument("--pool-size", type=int, help="SPORTS_LEAGUE_POOL_SIZE des Servers")
+    parser.add_argument(
+        "--sessions", type=int, nargs="+", default=[1, 4, 8, 16],
+        help="Anzahl gleichzeitiger Sitzungen je Durchgang",
+    )
+    parser.add_argument("--duration", type=float, default=20.0, help="Sekunden je Durchgang")
+    parser.add_argument(
+        "--write-ratio", type=float, default=0.05,
+        help="Anteil der Aktionen, die ein Match anlegen und wieder löschen",
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", type=Path, help="Ergebnisse als JSON speichern")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        process = None
+        database = None
+        url, pid = args.url, args.pid
+        if url is None:
+            db_path = prepare_database(args.db, args.scale, Path(tmp))
+            database = _database_info(db_path)
+            print(f"Datenbank: {database['matches']} Spiele, {database['players']} Spieler")
+            process, url = start_server(db_path, args.pool_size)
+            pid = process.pid
+        try:
+            # Aufwärmen: Importe, Verbindungen, erste Cache-Füllung
+            run_level(url, pid, 1, 0.1, 0.0, args.seed)
+            levels = []
+            for sessions in args.sessions:
+                result = run_level(url, pid, sessions, args.duration, args.write_ratio, args.seed)
+                print_level(result)
+                levels.append(result)
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait(timeout=30)
+
+    if args.output:
+        result = {
+            "meta": {
+                "commit": _commit(),
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "url": args.url,
+                "duration": args.duration,
+                "write_ratio": args.write_ratio,
+                "database": database,
+            },
+            "levels": levels,
+        }
+        args.output.write_text(json.dumps(result, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"Ergebnisse gespeichert: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Gemeinsame Bausteine der Streamlit-App (Datenbank, Auswertungen, Werkzeuge)."""
@@ -0,0 +1,216 @@
+"""Local cache for crests, league icons and the header banner.
+
+The images are downloaded once (or copied from a local directory) and
+stored below ``static/assets``. Raster images are scaled to the heights
+the pages display. Streamlit serves them under ``app/static/...`` when
+``server.enableStaticServing`` is on (see ``.streamlit/config.toml``).
+Streamlit serves ``.svg`` files as plain text, so SVG crests are rasterised
+to PNG in the same heights while the cache is built (needs ``cairosvg``
+and the Cairo library; without them they keep their remote URL).
+
+At render time :func:`asset_url` swaps a remote URL for its local copy. URLs
+that are not in the cache are returned unchanged, so the pages keep working
+with an empty cache.
+
+Usage::
+
+    python -m core.assets                     # fehlende Bilder herunterladen
+    python -m core.assets --from-dir bilder/  # offline aus einem Ordner laden
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import sqlite3
+from functools import lru_cache
+from pathlib import Path
+
+from core.migrate import DEFAULT_DB
+
+STATIC_DIR = Path(__file__).resolve().parent.parent / "static"
+ASSET_DIR = STATIC_DIR / "assets"
+MANIFEST = ASSET_DIR / "manifest.json"
+STATIC_URL = "app/static/assets"
+
+HEADER_IMAGE = "https://ethianum-klinik-heidelberg.de/wp-content/uploads/2024/01/header-sportorthopaedie_fussball_2400x824px.webp"
+
+# Angezeigte Höhen in Pixeln: Wappen in Tabelle und Spielkarten (40) sowie
+# auf den Detailseiten (80), Liga-Icons in den Spielkarten (25)
+CREST_SIZES = (40, 80)
+ICON_SIZES = (25, 40)
+BANNER_WIDTH = 1600
+
+
+def _file_name(url: str, size: int, suffix: str) -> str:
+    digest = hashlib.sha1(url.encode("utf-8")).hexdigest()[:12]
+    return f"{digest}_{size}{suffix}"
+
+
+def _usable(name: str) -> bool:
+    # .svg-Dateien früherer Läufe würden als text/plain ausgeliefert
+    return not name.endswith(".svg") and (ASSET_DIR / name).exists()
+
+
+def _load_manifest() -> dict:
+    if not MANIFEST.exists():
+        return {}
+    return json.loads(MANIFEST.read_text(encoding="utf-8"))
+
+
+@lru_cache(maxsize=4)
+def _lookup(mtime: float) -> dict:
+    """Map ``(url, size)`` to ``(local file, URL for HTML)`` of the cached copy."""
+    lookup = {}
+    for url, files in _load_manifest().items():
+        for size, name in files.items():
+            if _usable(name):
+                lookup[url, int(size)] = (str(ASSET_DIR / name), f"{STATIC_URL}/{name}")
+    return lookup
+
+
+def manifest_version() -> float:
+    """Modification time of the manifest (0 without cache); part of HTML cache keys."""
+    try:
+        return MANIFEST.stat().st_mtime
+    except OSError:
+        return 0.0
+
+
+def _cached(url, size: int):
+    if not isinstance(url, str):
+        return None
+    mtime = manifest_version()
+    if not mtime:
+        return None
+    return _lookup(mtime).get((url, size))
+
+
+def asset_url(url, size: int):
+    """URL of the local copy of ``url`` for use in HTML, else ``url`` itself."""
+    cached = _cached(url, size)
+    return url if cached is None else cached[1]
+
+
+def asset_file(url, size: int):
+    """Local file of ``url`` for ``st.image`` and ``page_icon``, else ``url`` itself."""
+    cached = _cached(url, size)
+    return url if cached is None else cached[0]
+
+
+# ---------------------------------------------------------------------------
+# Cache befüllen
+# ---------------------------------------------------------------------------
+
+
+def collect_urls(conn: sqlite3.Connection) -> dict:
+    """All image URLs used by the app with the heights they are shown at."""
+    urls = {HEADER_IMAGE: None}
+    for (url,) in conn.execute("SELECT DISTINCT cresturl FROM teams WHERE cresturl IS NOT NULL"):
+        urls[url] = CREST_SIZES
+    for (url,) in conn.execute("SELECT DISTINCT icon_url FROM leagues WHERE icon_url IS NOT NULL"):
+        urls[url] = ICON_SIZES
+    return urls
+
+
+def _fetch(url: str, source_dir: Path = None) -> bytes:
+    if source_dir is not None:
+        # Offline: Datei mit gleichem Namen wie in der URL
+        return (source_dir / url.rsplit("/", 1)[-1]).read_bytes()
+    import requests
+
+    response = requests.get(url, timeout=15)
+    response.raise_for_status()
+    return response.content
+
+
+def store(url: str, content: bytes, sizes) -> dict:
+    """Write the resized copies of one image and return ``{size: file name}``.
+
+    ``sizes=None`` marks the header banner, which is scaled to
+    ``BANNER_WIDTH`` and kept under size ``0``.
+    """
+    from PIL import Image
+
+    if url.lower().endswith(".svg"):
+        # In der größten Höhe rastern, die kleineren entstehen wie bei PNG-Wappen
+        content = _rasterize_svg(content, max(sizes))
+
+    files = {}
+    with Image.open(io.BytesIO(content)) as image:
+        if sizes is None:
+            height = round(image.height * BANNER_WIDTH / image.width)
+            banner = image.convert("RGB").resize((BANNER_WIDTH, height), Image.LANCZOS)
+            name = _file_name(url, 0, ".webp")
+            banner.save(ASSET_DIR / name, "WEBP", quality=80)
+            return {0: name}
+        image = image.convert("RGBA")
+        for size in sizes:
+            scaled = image.copy()
+            # Höhe festlegen, Breite proportional
+            scaled.thumbnail((size * 4, size), Image.LANCZOS)
+            name = _file_name(url, size, ".png")
+            scaled.save(ASSET_DIR / name, "PNG", optimize=True)
+            files[size] = name
+    return files
+
+
+def _rasterize_svg(content: bytes, height: int) -> bytes:
+    """PNG of an SVG image, ``height`` pixels high."""
+    try:
+        import cairosvg
+    except (ImportError, OSError) as exc:
+        # OSError: Python-Paket vorhanden, aber die Cairo-Bibliothek fehlt
+        raise RuntimeError(f"SVG braucht cairosvg und die Cairo-Bibliothek ({exc})") from exc
+    return cairosvg.svg2png(bytestring=content, output_height=height)
+
+
+def build_cache(conn: sqlite3.Connection, source_dir: Path = None, force: bool = False) -> dict:
+    """Fill the cache for every image URL of the database.
+
+    Returns a summary with the number of ``stored``, ``skipped`` and
+    ``failed`` URLs. Failures are reported but do not stop the run.
+    """
+    ASSET_DIR.mkdir(parents=True, exist_ok=True)
+    manifest = _load_manifest()
+    summary = {"stored": 0, "skipped": 0, "failed": []}
+    for url, sizes in collect_urls(conn).items():
+        expected = [str(size) for size in (sizes or (0,))]
+        known = manifest.get(url, {})
+        if not force and all(size in known and _usable(known[size]) for size in expected):
+            summary["skipped"] += 1
+            continue
+        try:
+            files = store(url, _fetch(url, source_dir), sizes)
+        except Exception as exc:  # Netzwerk, fehlende Datei, defektes Bild
+            summary["failed"].append((url, str(exc)))
+            continue
+        manifest[url] = {str(size): name for size, name in files.items()}
+        summary["stored"] += 1
+    MANIFEST.write_text(json.dumps(manifest, indent=1, sort_keys=True), encoding="utf-8")
+    return summary
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Wappen und Icons lokal zwischenspeichern")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB, help="Pfad zur SQLite-Datei")
+    parser.add_argument(
+        "--from-dir",
+        type=Path,
+        help="Bilder aus diesem Ordner statt aus dem Netz laden (Dateiname wie in der URL)",
+    )
+    parser.add_argument("--force", action="store_true", help="vorhandene Bilder neu erzeugen")
+    args = parser.parse_args(argv)
+
+    conn = sqlite3.connect(args.db)
+    try:
+        summary = build_cache(conn, args.from_dir, args.force)
+    finally:
+        conn.close()
+    print(f"{summary['stored']} Bilder gespeichert, {summary['skipped']} bereits vorhanden")
+    for url, error in summary["failed"]:
+        print(f"  fehlgeschlagen: {url} ({error})")
+
+
+if __name__ == "__main__":
+    main()
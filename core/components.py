@@ -0,0 +1,322 @@
+"""Shared page building blocks: header banner, standings table, match cards,
+head-to-head view and export buttons."""
+
+import html
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from core import data
+from core.assets import HEADER_IMAGE, asset_url, manifest_version
+
+
+def render_header(title: str) -> None:
+    """Banner image with a centered title."""
+    st.markdown(f"""
+<div style="position: relative; text-align: center;">
+    <img src="{asset_url(HEADER_IMAGE, 0)}" style="width: 100%; border-radius: 10px;" />
+    <div style="
+        position: absolute;
+        top: 50%;
+        left: 50%;
+        transform: translate(-50%, -50%);
+        background-color: rgba(0,0,0,0.6);
+        color: white;
+        padding: 1.2rem 2rem;
+        border-radius: 8px;
+        font-size: 2.2rem;
+        font-weight: bold;
+        z-index: 2;">
+        {title}
+    </div>
+</div>
+""", unsafe_allow_html=True)
+
+
+# Gemeinsames Stylesheet der Tabelle statt Inline-CSS in jeder Zelle
+STANDINGS_CSS = """
+<style>
+.standings-wrap { display: flex; justify-content: center; }
+.standings { border-collapse: collapse; }
+.standings th { text-align: center; background-color: #f0f0f0; }
+.standings td { text-align: center; }
+.standings img { height: 40px; width: auto; object-fit: contain; }
+.standings tr.cl td { background-color: #e6ffe6; }
+.standings tr.uel td { background-color: #e6f0ff; }
+.standings tr.rel td { background-color: #ffe6e6; }
+.standings .form { display: inline-block; width: 1.4em; margin: 0 1px; border-radius: 3px;
+                   color: white; font-size: 0.8rem; font-weight: bold; }
+.standings .form.S { background-color: #2e9e4f; }
+.standings .form.U { background-color: #9e9e9e; }
+.standings .form.N { background-color: #d64545; }
+</style>
+"""
+STANDINGS_COLUMNS = [
+    "Platz",
+    "Logo",
+    "Team",
+    "Spiele",
+    "Siege",
+    "Unentschieden",
+    "Niederlagen",
+    "Torverhältnis",
+    "Punkte",
+    "Form",
+]
+# Ergebnisse in standings.form (W/D/L) als deutsche Kürzel
+FORM_LETTERS = {"W": "S", "D": "U", "L": "N"}
+ZONE_LABELS = {"cl": "Champions League", "uel": "Europa League", "rel": "Abstieg", "": ""}
+
+
+def standings_table(league_id: int, season_id=None, matchday=None) -> pd.DataFrame:
+    """Standings of a league in the display layout (rank, crest URL, team, stats).
+
+    With ``matchday`` the table as it stood after that matchday is shown.
+    """
+    if matchday is None:
+        standings_df = data.get_standings(league_id, season_id)
+    else:
+        standings_df = data.get_matchday_table(league_id, matchday, season_id)
+    teams_df = data.get_teams()[["team_id", "name", "cresturl"]]
+    table = (
+        standings_df
+        .rename(
+            columns={
+                "position": "Platz",
+                "played_games": "Spiele",
+                "won": "Siege",
+                "draw": "Unentschieden",
+                "lost": "Niederlagen",
+                "goal_difference": "Torverhältnis",
+                "points": "Punkte",
+            }
+        )
+        .merge(teams_df, on="team_id", how="left")
+        .rename(columns={"name": "Team"})
+    )
+    # Lokale Kopie des Wappens, falls im Asset-Cache vorhanden
+    table["Logo"] = table["cresturl"].map(lambda url: asset_url(url, 40))
+    columns = STANDINGS_COLUMNS
+    if "form" in table:
+        table["Form"] = form_letters(table["form"])
+    else:
+        # Tabellen nach einem Spieltag haben keine Form
+        columns = [column for column in STANDINGS_COLUMNS if column != "Form"]
+    return table[columns].reset_index(drop=True)
+
+
+def form_letters(form: pd.Series) -> pd.Series:
+    """``standings.form`` (JSON list of W/D/L) as German letters, e.g. ``"S U N"``."""
+    return (
+        form.fillna("")
+        .str.findall("[WDL]")
+        .map(lambda results: " ".join(FORM_LETTERS[result] for result in results))
+    )
+
+
+def standings_zones(positions, league) -> np.ndarray:
+    """CSS class per rank: ``cl``, ``uel``, ``rel`` or ``""`` (vectorized)."""
+    positions = np.asarray(positions)
+    return np.select(
+        [
+            positions <= league.cl_spot,
+            positions <= league.uel_spot,
+            positions >= league.relegation_spot,
+        ],
+        ["cl", "uel", "rel"],
+        default="",
+    )
+
+
+def standings_html(table: pd.DataFrame, league) -> str:
+    """Compact HTML table using the classes of :data:`STANDINGS_CSS`."""
+    cells = "<td>" + table["Platz"].astype(str) + "</td><td><img src='" + table["Logo"].map(
+        html.escape
+    ) + "'></td><td>" + table["Team"].fillna("").map(html.escape) + "</td>"
+    for column in table.columns[3:]:
+        values = table[column].astype(str)
+        if column == "Form":
+            # Ein Kästchen je Ergebnis, Farbe über die Klasse S/U/N
+            values = values.str.replace(
+                r"(\w) ?", r"<span class='form \1'>\1</span>", regex=True
+            )
+        cells += "<td>" + values + "</td>"
+    zones = pd.Series(standings_zones(table["Platz"], league), index=table.index)
+    rows = "<tr class='" + zones + "'>" + cells + "</tr>"
+    header = "".join(f"<th>{'' if column == 'Logo' else column}</th>" for column in table.columns)
+    return (
+        f"<div class='standings-wrap'><table class='standings'><thead><tr>{header}</tr></thead>"
+        f"<tbody>{''.join(rows)}</tbody></table></div>"
+    )
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def _standings_html(league_id: int, season_id, matchday, version, assets_version) -> str:
+    return standings_html(
+        standings_table(league_id, season_id, matchday), data.get_league(league_id)
+    )
+
+
+def render_standings(league_id: int, interactive: bool = False, matchday=None) -> None:
+    """Standings table with CL, UEL and relegation rows highlighted.
+
+    The HTML is cached per league, season, matchday and data version (and
+    asset cache). ``matchday`` shows the table after that matchday instead of
+    the current one. With ``interactive=True`` the table is shown as a
+    sortable ``st.dataframe`` with crest images and a zone column instead of
+    colored rows.
+    """
+    season_id = data.get_current_season(league_id)
+    if interactive:
+        table = standings_table(league_id, season_id, matchday)
+        zones = standings_zones(table["Platz"], data.get_league(league_id))
+        table.insert(1, "Zone", [ZONE_LABELS[zone] for zone in zones])
+        st.dataframe(
+            table,
+            hide_index=True,
+            use_container_width=True,
+            column_config={"Logo": st.column_config.ImageColumn("", width="small")},
+        )
+        return
+    version = data.data_version("matches", league_id)
+    st.markdown(
+        STANDINGS_CSS
+        + _standings_html(int(league_id), season_id, matchday, version, manifest_version()),
+        unsafe_allow_html=True,
+    )
+
+
+# Gemeinsames Stylesheet der Spielkarten
+MATCH_CARD_CSS = """
+<style>
+.match-card { background-color: #f9f9f9; padding: 1rem; border-radius: 10px; margin-bottom: 1rem; }
+.match-row { display: flex; justify-content: center; align-items: center; font-weight: bold; }
+.match-team { flex: 1; }
+.match-team.home { text-align: right; margin-right: 1rem; }
+.match-team.away { text-align: left; margin-left: 1rem; }
+.match-team img { width: 40px; }
+.match-score { margin: 0 1rem; font-size: 1.5rem; }
+.match-meta { text-align: center; font-size: 0.9rem; margin-top: 0.5rem; }
+.match-meta img { width: 25px; vertical-align: middle; }
+</style>
+"""
+
+
+@lru_cache(maxsize=1024)
+def _html_url(url, size: int, assets_version: float) -> str:
+    # Je Manifest-Stand nur einmal nachschlagen und escapen
+    return html.escape(str(asset_url(url, size)))
+
+
+def _goals(goals) -> str:
+    # Angesetzte Spiele ohne Ergebnis zeigen "-"
+    return "-" if pd.isna(goals) else str(int(goals))
+
+
+def match_cards_html(matches: pd.DataFrame) -> str:
+    """All match cards as one HTML block (columns of :func:`core.data.get_season_matches`).
+
+    A plain loop over the column lists: for the few cards of a matchday it is
+    cheaper than vectorized string operations on pandas Series.
+    """
+    version = manifest_version()
+    columns = [
+        "Heim", "HeimCrest", "HeimTore", "AuswaertsTore",
+        "Auswaerts", "AuswaertsCrest", "Liga", "LigaIcon", "Datum",
+    ]
+    return "".join(
+        "<div class='match-card'><div class='match-row'><div class='match-team home'>"
+        f"<img src='{_html_url(home_crest, 40, version)}'><br>{html.escape(str(home))}</div>"
+        f"<div class='match-score'>{_goals(home_goals)} : {_goals(away_goals)}</div>"
+        "<div class='match-team away'>"
+        f"<img src='{_html_url(away_crest, 40, version)}'><br>{html.escape(str(away))}</div>"
+        "</div><div class='match-meta'>"
+        f"<img src='{_html_url(icon, 25, version)}'> {html.escape(str(league))} - {date}"
+        "</div></div>"
+        for home, home_crest, home_goals, away_goals, away, away_crest, league, icon, date
+        in zip(*(matches[column].tolist() for column in columns))
+    )
+
+
+def render_match_cards(matches: pd.DataFrame) -> None:
+    """One card per match, sent to the browser as a single element."""
+    cards = match_cards_html(matches)
+    if cards:
+        st.markdown(MATCH_CARD_CSS + cards, unsafe_allow_html=True)
+
+
+def render_head_to_head(team_id: int, opponent_id: int) -> None:
+    """Summary and match list of all games between two teams (both venues)."""
+    matches, summary = data.get_head_to_head(team_id, opponent_id)
+    if matches.empty:
+        st.info("Keine gemeinsamen Spiele gefunden.")
+        return
+    names = data.get_teams().set_index("team_id")["name"]
+    team, opponent = names.get(int(team_id), ""), names.get(int(opponent_id), "")
+    col1, col2, col3, col4, col5 = st.columns(5)
+    col1.metric("Spiele", summary["games"])
+    col2.metric(f"Siege {team}", summary["wins"])
+    col3.metric("Unentschieden", summary["draws"])
+    col4.metric(f"Siege {opponent}", summary["losses"])
+    col5.metric("Tore", f"{summary['goals_for']} : {summary['goals_against']}")
+    st.dataframe(
+        pd.DataFrame(
+            {
+                "Datum": matches["utc_date"],
+                "Heimteam": matches["home_team"],
+                "Ergebnis": matches["home_goals"].astype(str)
+                + " - "
+                + matches["away_goals"].astype(str),
+                "Auswärtsteam": matches["away_team"],
+                "Liga": matches["league"],
+            }
+        ),
+        hide_index=True,
+        use_container_width=True,
+    )
+
+
+EXPORT_LABELS = {"matches": "Spiele", "standings": "Tabellen", "players": "Spieler"}
+EXPORT_FORMATS = {
+    "parquet": ("Parquet", ".parquet", "application/vnd.apache.parquet"),
+    "arrow": ("Arrow IPC", ".arrow", "application/vnd.apache.arrow.file"),
+}
+
+
+def render_export(datasets: list, league_id=None, season_id=None, file_prefix: str = "export",
+                  key: str = "export") -> None:
+    """Download buttons for Parquet/Arrow exports (see :func:`core.data.get_export`).
+
+    The files are only built after "Export erstellen" was pressed once in the
+    session, so normal page views do not pay for them.
+    """
+    ready_key = f"{key}_ready"
+
+    def prepare():
+        st.session_state[ready_key] = True
+
+    with st.expander("Daten exportieren"):
+        fmt = st.radio(
+            "Format",
+            list(EXPORT_FORMATS),
+            format_func=lambda value: EXPORT_FORMATS[value][0],
+            horizontal=True,
+            key=f"{key}_format",
+        )
+        if not st.session_state.get(ready_key):
+            st.button("Export erstellen", key=f"{key}_prepare", on_click=prepare)
+            return
+        _label, suffix, mime = EXPORT_FORMATS[fmt]
+        for column, dataset in zip(st.columns(len(datasets)), datasets):
+            with column:
+                st.download_button(
+                    f"{EXPORT_LABELS[dataset]} herunterladen",
+                    data=data.get_export(dataset, fmt, league_id, season_id),
+                    file_name=f"{file_prefix}_{dataset}{suffix}",
+                    mime=mime,
+                    key=f"{key}_{dataset}",
+                    on_click="ignore",
+                    use_container_width=True,
+                )
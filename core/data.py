@@ -0,0 +1,599 @@
+"""Shared data access for all pages.
+
+A process-wide :class:`~core.pool.ConnectionPool` is kept as a Streamlit
+resource: reads borrow a pooled read-only connection, writes share one write
+connection. Both are timed by :mod:`core.diagnostics` when diagnostics are
+enabled. Every read goes through a cached query function. Tables that the app
+writes to are grouped into scopes (``"matches"`` covers matches, scores and
+standings, ``"players"`` the players table). Each scope carries a version counter, per
+league where it makes sense, that is part of the cache key. Writers call
+:func:`invalidate` after committing, so only the affected entries are
+reloaded on the next rerun.
+"""
+
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from core import diagnostics
+from core.migrate import DEFAULT_DB
+from core.pool import ConnectionPool
+from core.standings import standings_by_matchday
+
+DB_PATH = Path(os.environ.get("SPORTS_LEAGUE_DB", DEFAULT_DB))
+POOL_SIZE = int(os.environ.get("SPORTS_LEAGUE_POOL_SIZE", 4))
+
+# Schützt die Versionszähler für die Cache-Invalidierung
+_lock = threading.RLock()
+
+SCOPES = ("matches", "players")
+
+# Änderungen anderer Prozesse werden höchstens einmal pro Sekunde abgefragt
+EXTERNAL_CHECK_INTERVAL = 1.0
+_external_checked = 0.0
+
+
+@st.cache_resource(show_spinner=False)
+def get_pool() -> ConnectionPool:
+    """Return the process-wide connection pool, migrating the schema on first use."""
+    return ConnectionPool(DB_PATH, size=POOL_SIZE)
+
+
+def pool_stats() -> dict:
+    """Usage statistics of the connection pool."""
+    return get_pool().stats()
+
+
+def read_sql(sql: str, params=()) -> pd.DataFrame:
+    """Run a query on a pooled read-only connection and return the result as a frame."""
+    with diagnostics.track(sql, params) as entry, get_pool().reader() as conn:
+        frame = pd.read_sql(sql, conn, params=params)
+        entry["rows"] = len(frame)
+        return frame
+
+
+@contextmanager
+def transaction():
+    """Yield the write connection inside one transaction (see :meth:`ConnectionPool.writer`)."""
+    with diagnostics.track("(Schreibtransaktion)", name="transaction"), get_pool().writer() as conn:
+        yield conn
+
+
+def kickoff_timestamp(value) -> int:
+    """Unix timestamp (UTC) of a date, datetime or ISO string; naive values count as UTC."""
+    timestamp = pd.Timestamp(value)
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.tz_localize("UTC")
+    return int(timestamp.timestamp())
+
+
+def utc_iso(value) -> str:
+    """Canonical ``utc_date`` text (``YYYY-MM-DDTHH:MM:SSZ``) of a kickoff."""
+    return pd.Timestamp(kickoff_timestamp(value), unit="s").strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+# ---------------------------------------------------------------------------
+# Datenstände für die Cache-Invalidierung
+# ---------------------------------------------------------------------------
+
+
+@st.cache_resource(show_spinner=False)
+def _versions() -> dict:
+    return {}
+
+
+def _check_external_writes() -> None:
+    """Drop all cached data after writes by other processes (e.g. the importer)."""
+    global _external_checked
+    now = time.monotonic()
+    if now - _external_checked < EXTERNAL_CHECK_INTERVAL:
+        return
+    _external_checked = now
+    if get_pool().external_changes():
+        for scope in SCOPES:
+            invalidate(scope)
+
+
+def data_version(scope: str, league_id=None):
+    """Return the cache key component for ``scope`` (optionally one league)."""
+    _check_external_writes()
+    versions = _versions()
+    if league_id is None:
+        return versions.get((scope, None), 0)
+    return versions.get((scope, "all"), 0), versions.get((scope, int(league_id)), 0)
+
+
+def invalidate(scope: str, league_id=None) -> None:
+    """Mark cached data of ``scope`` as stale, for one league or for all leagues."""
+    versions = _versions()
+    with _lock:
+        keys = [(scope, None), (scope, "all" if league_id is None else int(league_id))]
+        for key in keys:
+            versions[key] = versions.get(key, 0) + 1
+
+
+# ---------------------------------------------------------------------------
+# Stammdaten (werden in der App nicht verändert)
+# ---------------------------------------------------------------------------
+
+
+@st.cache_data(show_spinner=False)
+def get_leagues() -> pd.DataFrame:
+    """All leagues including the CL, UEL and relegation spots."""
+    return read_sql(
+        """
+        SELECT league_id, name, country, icon_url, cl_spot, uel_spot, relegation_spot
+        FROM leagues
+        ORDER BY league_id
+        """
+    )
+
+
+def get_league(league_id: int) -> pd.Series:
+    """A single row of :func:`get_leagues`."""
+    leagues = get_leagues()
+    return leagues.loc[leagues["league_id"] == league_id].iloc[0]
+
+
+@st.cache_data(show_spinner=False)
+def get_teams() -> pd.DataFrame:
+    """All teams with league and crest, ordered by name."""
+    return read_sql("SELECT team_id, league_id, name, cresturl FROM teams ORDER BY name")
+
+
+@st.cache_data(show_spinner=False)
+def get_team_details() -> pd.DataFrame:
+    """All teams with stadium and coach for the club overview."""
+    return read_sql(
+        """
+        SELECT t.team_id, t.name, t.founded_year, s.name AS stadium, s.location, s.capacity,
+               c.name AS coach, t.cresturl
+        FROM teams AS t
+        LEFT JOIN stadiums AS s ON t.stadium_id = s.stadium_id
+        LEFT JOIN coaches AS c ON t.coach_id = c.coach_id
+        ORDER BY t.name
+        """
+    )
+
+
+@st.cache_data(show_spinner=False)
+def get_current_season(league_id: int):
+    """ID of the most recent season of a league, or ``None``."""
+    season = read_sql(
+        "SELECT season_id FROM seasons WHERE league_id = ? ORDER BY year DESC LIMIT 1",
+        (int(league_id),),
+    )
+    return None if season.empty else int(season.iloc[0]["season_id"])
+
+
+# ---------------------------------------------------------------------------
+# Spiele und Tabellen
+# ---------------------------------------------------------------------------
+
+_MATCH_CARD_COLUMNS = """
+        leagues.name AS Liga,
+        leagues.icon_url AS LigaIcon,
+        home_team.name AS Heim,
+        home_team.cresturl AS HeimCrest,
+        away_team.name AS Auswaerts,
+        away_team.cresturl AS AuswaertsCrest,
+        scores.full_time_home AS HeimTore,
+        scores.full_time_away AS AuswaertsTore,
+        date(matches.kickoff, 'unixepoch') AS Datum
+    FROM matches
+    JOIN teams AS home_team ON matches.home_team_id = home_team.team_id
+    JOIN teams AS away_team ON matches.away_team_id = away_team.team_id
+    JOIN scores ON matches.match_id = scores.match_id
+    JOIN leagues ON matches.league_id = leagues.league_id
+"""
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _standings(league_id: int, season_id, version) -> pd.DataFrame:
+    standings = read_sql(
+        """
+        SELECT *
+        FROM standings
+        WHERE league_id = ? AND (? IS NULL OR season_id = ?)
+        ORDER BY points DESC, goal_difference DESC
+        """,
+        (league_id, season_id, season_id),
+    )
+    standings["position"] = range(1, len(standings) + 1)
+    return standings
+
+
+def get_standings(league_id: int, season_id=None) -> pd.DataFrame:
+    """Standings of a league (current season by default), ordered by rank."""
+    if season_id is None:
+        season_id = get_current_season(league_id)
+    return _standings(int(league_id), season_id, data_version("matches", league_id))
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _season_matches(league_id: int, season_id, version) -> pd.DataFrame:
+    return read_sql(
+        f"""
+        SELECT matches.matchday AS Spieltag, {_MATCH_CARD_COLUMNS}
+        WHERE matches.league_id = ? AND (? IS NULL OR matches.season_id = ?)
+        ORDER BY matches.matchday ASC, matches.kickoff ASC
+        """,
+        (league_id, season_id, season_id),
+    )
+
+
+def get_season_matches(league_id: int, season_id=None) -> pd.DataFrame:
+    """All matches of a league season (current season by default), by matchday.
+
+    Loaded with one query and cached per league, so matchday navigation only
+    slices this frame.
+    """
+    if season_id is None:
+        season_id = get_current_season(league_id)
+    return _season_matches(int(league_id), season_id, data_version("matches", league_id))
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _matchday_tables(league_id: int, season_id, version) -> pd.DataFrame:
+    matches = read_sql(
+        """
+        SELECT matches.matchday, matches.home_team_id, matches.away_team_id,
+               scores.full_time_home, scores.full_time_away
+        FROM matches
+        JOIN scores ON scores.match_id = matches.match_id
+        WHERE matches.league_id = ? AND (? IS NULL OR matches.season_id = ?)
+          AND scores.full_time_home IS NOT NULL AND scores.full_time_away IS NOT NULL
+        """,
+        (league_id, season_id, season_id),
+    )
+    teams = get_teams()
+    return standings_by_matchday(matches, teams.loc[teams["league_id"] == league_id, "team_id"])
+
+
+def get_matchday_table(league_id: int, matchday: int, season_id=None) -> pd.DataFrame:
+    """Standings as they stood after ``matchday`` (current season by default).
+
+    The tables of all matchdays are computed together by
+    :func:`core.standings.standings_by_matchday` and cached per league and
+    season, so switching matchdays only selects rows. Matchdays after the last
+    played one return the latest table.
+    """
+    if season_id is None:
+        season_id = get_current_season(league_id)
+    tables = _matchday_tables(int(league_id), season_id, data_version("matches", league_id))
+    if tables.empty:
+        return tables.reset_index(drop=True)
+    matchday = min(max(int(matchday), 1), int(tables.index.max()))
+    return tables.loc[[matchday]].reset_index(drop=True)
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _last_matches(league_id: int, limit: int, version) -> pd.DataFrame:
+    return read_sql(
+        f"""
+        SELECT {_MATCH_CARD_COLUMNS}
+        WHERE matches.league_id = ? AND scores.full_time_home IS NOT NULL
+        ORDER BY matches.kickoff DESC, matches.match_id DESC
+        LIMIT ?
+        """,
+        (league_id, limit),
+    )
+
+
+def get_last_matches(league_id: int, limit: int = 3) -> pd.DataFrame:
+    """Most recent matches of a league in the column layout of the match cards."""
+    return _last_matches(int(league_id), int(limit), data_version("matches", league_id))
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def _matches_page(filters: tuple, cursor, limit: int, version) -> pd.DataFrame:
+    league_id, home_team_id, away_team_id, kickoff_from, kickoff_to = filters
+    conditions, params = [], []
+    for column, value in (
+        ("m.league_id = ?", league_id),
+        ("m.home_team_id = ?", home_team_id),
+        ("m.away_team_id = ?", away_team_id),
+        ("m.kickoff >= ?", kickoff_from),
+        ("m.kickoff < ?", kickoff_to),
+    ):
+        if value is not None:
+            conditions.append(column)
+            params.append(value)
+    if cursor is not None:
+        conditions.append("(m.kickoff, m.match_id) < (?, ?)")
+        params.extend(cursor)
+    where = " AND ".join(conditions) or "1"
+    return read_sql(
+        f"""
+        SELECT
+            m.match_id,
+            m.league_id,
+            m.season_id,
+            l.name AS league,
+            ht.name AS home_team,
+            at.name AS away_team,
+            s.full_time_home AS home_goals,
+            s.full_time_away AS away_goals,
+            date(m.kickoff, 'unixepoch') AS utc_date,
+            m.kickoff
+        FROM matches AS m
+        JOIN teams AS ht ON m.home_team_id = ht.team_id
+        JOIN teams AS at ON m.away_team_id = at.team_id
+        JOIN scores AS s ON m.match_id = s.match_id
+        JOIN leagues AS l ON m.league_id = l.league_id
+        WHERE {where}
+        ORDER BY m.kickoff DESC, m.match_id DESC
+        LIMIT ?
+        """,
+        (*params, limit),
+    )
+
+
+def get_matches_page(
+    league_id=None,
+    home_team_id=None,
+    away_team_id=None,
+    date_from=None,
+    date_to=None,
+    cursor=None,
+    limit: int = 100,
+):
+    """One page of matches, newest first, filtered in SQL.
+
+    ``cursor`` is the ``(kickoff, match_id)`` of the last row of the previous
+    page (keyset pagination). Returns the page and the cursor of the next
+    page, which is ``None`` on the last page. ``date_to`` is inclusive.
+    """
+    filters = (
+        None if league_id is None else int(league_id),
+        None if home_team_id is None else int(home_team_id),
+        None if away_team_id is None else int(away_team_id),
+        None if date_from is None else kickoff_timestamp(date_from),
+        None if date_to is None else kickoff_timestamp(pd.Timestamp(date_to) + pd.Timedelta(days=1)),
+    )
+    if cursor is not None:
+        cursor = (int(cursor[0]), int(cursor[1]))
+    page = _matches_page(filters, cursor, int(limit) + 1, data_version("matches"))
+    if len(page) <= limit:
+        return page, None
+    page = page.iloc[:limit]
+    last = page.iloc[-1]
+    return page, (int(last["kickoff"]), int(last["match_id"]))
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def _team_stats(team_id: int, by_season: bool, by_venue: bool, version) -> pd.DataFrame:
+    groups = [
+        f"team_matches.{column}"
+        for column, wanted in (("season_id", by_season), ("venue", by_venue))
+        if wanted
+    ]
+    group_by = f"GROUP BY {', '.join(groups)} ORDER BY {', '.join(groups)}" if groups else ""
+    select = "".join(f"{column}, " for column in groups)
+    join = ""
+    if by_season:
+        select += "seasons.year AS season, "
+        join = "JOIN seasons ON seasons.season_id = team_matches.season_id"
+    # Heim- und Auswärtsspiele getrennt über die Team-Indizes, dann ein Aggregat
+    return read_sql(
+        f"""
+        WITH team_matches AS (
+            SELECT m.season_id, 'Heim' AS venue,
+                   s.full_time_home AS goals_for, s.full_time_away AS goals_against
+            FROM matches AS m
+            JOIN scores AS s ON s.match_id = m.match_id
+            WHERE m.home_team_id = ? AND s.full_time_home IS NOT NULL
+              AND s.full_time_away IS NOT NULL
+            UNION ALL
+            SELECT m.season_id, 'Auswärts' AS venue,
+                   s.full_time_away AS goals_for, s.full_time_home AS goals_against
+            FROM matches AS m
+            JOIN scores AS s ON s.match_id = m.match_id
+            WHERE m.away_team_id = ? AND s.full_time_home IS NOT NULL
+              AND s.full_time_away IS NOT NULL
+        )
+        SELECT {select}COUNT(*) AS games,
+               COALESCE(SUM(goals_for > goals_against), 0) AS wins,
+               COALESCE(SUM(goals_for = goals_against), 0) AS draws,
+               COALESCE(SUM(goals_for < goals_against), 0) AS losses,
+               COALESCE(SUM(CASE WHEN goals_for > goals_against THEN 3
+                                 WHEN goals_for = goals_against THEN 1 ELSE 0 END), 0) AS points,
+               COALESCE(SUM(goals_for), 0) AS goals_for,
+               COALESCE(SUM(goals_against), 0) AS goals_against
+        FROM team_matches
+        {join}
+        {group_by}
+        """,
+        (team_id, team_id),
+    )
+
+
+def get_team_stats(team_id: int, by_season: bool = False, by_venue: bool = False) -> pd.DataFrame:
+    """Games, wins, draws, losses, points and goals of a team from its matches.
+
+    One aggregate query over the home and away matches; ``by_season`` and
+    ``by_venue`` add ``season_id``/``season`` and ``venue``
+    (``"Heim"``/``"Auswärts"``) groups. Without groups the result has exactly one row. Cached per team
+    and data version of the team's league.
+    """
+    teams = get_teams()
+    league_id = teams.loc[teams["team_id"] == int(team_id), "league_id"]
+    version = data_version("matches", league_id.iloc[0] if not league_id.empty else None)
+    return _team_stats(int(team_id), by_season, by_venue, version)
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def _head_to_head(team_id: int, opponent_id: int, version) -> tuple:
+    # Beide Richtungen über den Index (home_team_id, away_team_id, kickoff)
+    matches = read_sql(
+        """
+        SELECT
+            m.match_id,
+            m.league_id,
+            l.name AS league,
+            m.home_team_id,
+            m.away_team_id,
+            ht.name AS home_team,
+            at.name AS away_team,
+            s.full_time_home AS home_goals,
+            s.full_time_away AS away_goals,
+            date(m.kickoff, 'unixepoch') AS utc_date,
+            m.kickoff
+        FROM matches AS m
+        JOIN teams AS ht ON m.home_team_id = ht.team_id
+        JOIN teams AS at ON m.away_team_id = at.team_id
+        JOIN scores AS s ON m.match_id = s.match_id
+        JOIN leagues AS l ON m.league_id = l.league_id
+        WHERE ((m.home_team_id = ? AND m.away_team_id = ?)
+               OR (m.home_team_id = ? AND m.away_team_id = ?))
+          AND s.full_time_home IS NOT NULL AND s.full_time_away IS NOT NULL
+        ORDER BY m.kickoff DESC, m.match_id DESC
+        """,
+        (team_id, opponent_id, opponent_id, team_id),
+    )
+    home = (matches["home_team_id"] == team_id).to_numpy()
+    goals_for = np.where(home, matches["home_goals"], matches["away_goals"])
+    goals_against = np.where(home, matches["away_goals"], matches["home_goals"])
+    summary = {
+        "games": len(matches),
+        "wins": int((goals_for > goals_against).sum()),
+        "draws": int((goals_for == goals_against).sum()),
+        "losses": int((goals_for < goals_against).sum()),
+        "goals_for": int(goals_for.sum()),
+        "goals_against": int(goals_against.sum()),
+    }
+    return matches, summary
+
+
+def get_head_to_head(team_id: int, opponent_id: int) -> tuple:
+    """All matches between two teams (newest first) and a summary for ``team_id``.
+
+    The summary has ``games``, ``wins``, ``draws``, ``losses``, ``goals_for``
+    and ``goals_against`` from the view of ``team_id``. Cached once per
+    unordered pair and the data versions of both teams' leagues, so
+    ``(a, b)`` and ``(b, a)`` share one query.
+    """
+    team_id, opponent_id = int(team_id), int(opponent_id)
+    first, second = sorted((team_id, opponent_id))
+    leagues = get_teams().set_index("team_id")["league_id"]
+    version = tuple(
+        data_version("matches", leagues.get(team)) if team in leagues.index else None
+        for team in (first, second)
+    )
+    matches, summary = _head_to_head(first, second, version)
+    if team_id != first:
+        summary = {
+            **summary,
+            "wins": summary["losses"],
+            "losses": summary["wins"],
+            "goals_for": summary["goals_against"],
+            "goals_against": summary["goals_for"],
+        }
+    return matches, summary
+
+
+# ---------------------------------------------------------------------------
+# Spieler
+# ---------------------------------------------------------------------------
+
+
+def _match_expression(query: str) -> str:
+    """Turn free text into an FTS5 query: every word as a quoted prefix term."""
+    return " ".join(f'"{word}"*' for word in re.findall(r"\w+", query))
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def _search_players(match: str, team_id, limit: int, version) -> pd.DataFrame:
+    team_filter = "" if team_id is None else "AND p.team_id = ?"
+    team_params = () if team_id is None else (team_id,)
+    if not match:
+        # Ohne Suchbegriff einfach alphabetisch (Index auf players.name)
+        return read_sql(
+            f"""
+            SELECT p.player_id, p.name, p.position, p.date_of_birth, p.nationality,
+                   t.name AS team, t.cresturl
+            FROM players AS p
+            JOIN teams AS t ON p.team_id = t.team_id
+            WHERE 1 = 1 {team_filter}
+            ORDER BY p.name
+            LIMIT ?
+            """,
+            (*team_params, limit),
+        )
+    # Treffer im Namen zählen mehr als Verein oder Nationalität
+    return read_sql(
+        f"""
+        SELECT p.player_id, p.name, p.position, p.date_of_birth, p.nationality,
+               t.name AS team, t.cresturl
+        FROM players_fts
+        JOIN players AS p ON p.player_id = players_fts.rowid
+        JOIN teams AS t ON p.team_id = t.team_id
+        WHERE players_fts MATCH ? {team_filter}
+        ORDER BY bm25(players_fts, 10.0, 2.0, 1.0), p.name
+        LIMIT ?
+        """,
+        (match, *team_params, limit),
+    )
+
+
+def search_players(query: str = "", team_id=None, limit: int = 1000) -> pd.DataFrame:
+    """Players matching ``query`` by name, team or nationality, best match first.
+
+    Every word is matched as a prefix (``"mül"`` finds Müller, accents are
+    ignored). An empty query lists the players alphabetically. ``team_id``
+    restricts the search to one squad.
+    """
+    team_id = None if team_id is None else int(team_id)
+    return _search_players(
+        _match_expression(query), team_id, int(limit), data_version("players")
+    )
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _player_options(version) -> dict:
+    values = {}
+    for column in ("position", "nationality"):
+        values[column] = read_sql(
+            f"SELECT DISTINCT {column} FROM players WHERE {column} IS NOT NULL ORDER BY {column}"
+        )[column].tolist()
+    return values
+
+
+def get_player_options() -> dict:
+    """Known positions and nationalities for the player form."""
+    return _player_options(data_version("players"))
+
+
+# ---------------------------------------------------------------------------
+# Export
+# ---------------------------------------------------------------------------
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _export(dataset: str, fmt: str, league_id, season_id, version) -> bytes:
+    # pyarrow-Writer erst beim ersten Export laden
+    from core import export
+
+    sql = export.DATASETS[dataset][0]
+    with diagnostics.track(sql, (league_id, season_id), name=f"export_{dataset}"), \
+            get_pool().reader() as conn:
+        return export.export_bytes(conn, dataset, fmt, league_id, season_id)
+
+
+def get_export(dataset: str, fmt: str = "parquet", league_id=None, season_id=None) -> bytes:
+    """``matches``, ``standings`` or ``players`` as a Parquet/Arrow file for downloads.
+
+    Streamed from SQL in record batches by :mod:`core.export` and cached per
+    filter and data version.
+    """
+    scope = "players" if dataset == "players" else "matches"
+    league_id = None if league_id is None else int(league_id)
+    season_id = None if season_id is None else int(season_id)
+    return _export(dataset, fmt, league_id, season_id, data_version(scope, league_id))
@@ -0,0 +1,244 @@
+"""Query instrumentation and the optional diagnostics panel.
+
+:func:`track` wraps every query of :mod:`core.data` and records the query
+name (the calling function), SQL text, parameters, duration, row count and
+the page that issued it. Nothing is recorded unless diagnostics are enabled,
+either for the whole process (``SPORTS_LEAGUE_DIAGNOSTICS=1``) or for one
+browser session (URL parameter ``?diagnostics=1``).
+
+:func:`render_panel` is called at the end of every page and shows the queries
+of the current rerun as a waterfall in the sidebar, together with the slowest
+queries since the server start. ``SPORTS_LEAGUE_DIAGNOSTICS_LOG`` names a
+JSONL file that receives every record for offline analysis.
+"""
+
+import contextlib
+import datetime
+import html
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from pathlib import Path
+
+ENV_FLAG = "SPORTS_LEAGUE_DIAGNOSTICS"
+ENV_LOG = "SPORTS_LEAGUE_DIAGNOSTICS_LOG"
+QUERY_PARAM = "diagnostics"
+TOP_N = 10
+HISTORY = 2000
+# Höchstzahl der Sitzungen, deren Abfragen im Speicher bleiben (älteste fliegen raus)
+MAX_SESSIONS = 100
+
+ROOT = Path(__file__).resolve().parent.parent
+# Rahmen, die beim Ermitteln des Abfragenamens übersprungen werden
+_SKIP = (__file__, contextlib.__file__)
+_WRAPPERS = ("read_sql", "transaction")
+
+_lock = threading.Lock()
+# Abfragen des laufenden Durchlaufs und Verlauf je Sitzung, als LRU begrenzt
+_current = OrderedDict()
+_history = OrderedDict()
+# Summen je Abfragename seit dem Serverstart
+_totals = {}
+
+
+def _session_id():
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return None if ctx is None else ctx.session_id
+
+
+def enabled() -> bool:
+    """Whether queries of the current session are recorded."""
+    if os.environ.get(ENV_FLAG, "") not in ("", "0"):
+        return True
+    if _session_id() is None:
+        return False
+    import streamlit as st
+
+    return st.query_params.get(QUERY_PARAM, "") not in ("", "0")
+
+
+def _navigation_page():
+    """URL path (title for the default page) of the page chosen by ``st.navigation``."""
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx(suppress_warning=True)
+    if ctx is None:
+        return None
+    page = ctx.pages_manager.get_pages().get(ctx.page_script_hash) or {}
+    return page.get("url_pathname") or page.get("page_name") or None
+
+
+def _caller() -> tuple:
+    """Name of the querying function and the page it runs for."""
+    # Ligaseiten haben keine eigene Datei, dort zählt der Eintrag der Navigation
+    name, page = None, _navigation_page()
+    frame = sys._getframe(2)
+    while frame is not None and (name is None or page is None):
+        code = frame.f_code
+        if name is None and code.co_filename not in _SKIP and code.co_name not in _WRAPPERS:
+            name = code.co_name
+        path = Path(code.co_filename)
+        if page is None and (path.parent.name == "pages" or path.parent == ROOT):
+            page = path.stem
+        frame = frame.f_back
+    return name or "?", page
+
+
+def _json_value(value):
+    if isinstance(value, (datetime.date, datetime.datetime, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if hasattr(value, "item"):
+        # numpy-Skalare
+        return value.item()
+    return str(value)
+
+
+@contextmanager
+def track(sql: str, params=(), name: str = None):
+    """Record one query; the block may set ``entry["rows"]``."""
+    if not enabled():
+        yield {}
+        return
+    caller, page = _caller()
+    entry = {
+        "time": datetime.datetime.now().isoformat(timespec="milliseconds"),
+        "name": name or caller,
+        "page": page,
+        "sql": re.sub(r"\s+", " ", sql).strip(),
+        "params": [_json_value(value) for value in params],
+        "rows": None,
+    }
+    started = time.perf_counter()
+    try:
+        yield entry
+    finally:
+        entry["start"] = started
+        entry["ms"] = (time.perf_counter() - started) * 1000
+        _store(entry)
+
+
+def _session_slot(store: OrderedDict, session, factory):
+    """Entry of ``session`` in ``store``; evicts the least recently used sessions."""
+    slot = store.get(session)
+    if slot is None:
+        slot = store[session] = factory()
+        while len(store) > MAX_SESSIONS:
+            store.popitem(last=False)
+    else:
+        store.move_to_end(session)
+    return slot
+
+
+def _store(entry: dict) -> None:
+    session = _session_id()
+    with _lock:
+        # Auch begrenzt: ohne render_panel() (CLI, st.stop(), Fehler) leert ihn niemand
+        _session_slot(_current, session, lambda: deque(maxlen=HISTORY)).append(entry)
+        _session_slot(_history, session, lambda: deque(maxlen=HISTORY)).append(entry)
+        total = _totals.setdefault(
+            entry["name"], {"calls": 0, "ms": 0.0, "max_ms": 0.0, "rows": 0, "sql": entry["sql"]}
+        )
+        total["calls"] += 1
+        total["ms"] += entry["ms"]
+        total["max_ms"] = max(total["max_ms"], entry["ms"])
+        total["rows"] += entry["rows"] or 0
+    log_path = os.environ.get(ENV_LOG)
+    if log_path:
+        line = json.dumps({k: v for k, v in entry.items() if k != "start"}, ensure_ascii=False)
+        with _lock, open(log_path, "a", encoding="utf-8") as handle:
+            handle.write(line + "\n")
+
+
+def take_run() -> list:
+    """Return and clear the queries recorded since the last call (this session)."""
+    with _lock:
+        return list(_current.pop(_session_id(), ()))
+
+
+def top_queries(n: int = TOP_N) -> list:
+    """Queries with the highest total time since the server start."""
+    with _lock:
+        rows = [{"name": name, **total} for name, total in _totals.items()]
+    return sorted(rows, key=lambda row: row["ms"], reverse=True)[:n]
+
+
+def session_jsonl() -> str:
+    """All recorded queries of this session as JSON lines."""
+    with _lock:
+        session = _session_id()
+        entries = list(_history[session]) if session in _history else []
+    return "".join(
+        json.dumps({k: v for k, v in entry.items() if k != "start"}, ensure_ascii=False) + "\n"
+        for entry in entries
+    )
+
+
+def _waterfall(entries: list) -> str:
+    begin = entries[0]["start"]
+    end = max(entry["start"] + entry["ms"] / 1000 for entry in entries)
+    span = max(end - begin, 1e-6)
+    rows = []
+    for entry in entries:
+        left = (entry["start"] - begin) / span * 100
+        width = max(entry["ms"] / 1000 / span * 100, 0.5)
+        rows.append(
+            f"<div style='font-size:0.75rem; margin-bottom:2px;' title='{html.escape(entry['sql'][:300], quote=True)}'>"
+            f"{html.escape(entry['name'])} · {entry['ms']:.1f} ms · {entry['rows'] if entry['rows'] is not None else '-'} Zeilen"
+            f"<div style='background:#eee; height:6px; position:relative;'>"
+            f"<div style='position:absolute; left:{left:.1f}%; width:{width:.1f}%; height:6px;"
+            f" background:#0066cc;'></div></div></div>"
+        )
+    return "".join(rows)
+
+
+def render_panel() -> None:
+    """Sidebar panel with the queries of this rerun (only when enabled)."""
+    entries = take_run()
+    if not enabled():
+        return
+    import pandas as pd
+    import streamlit as st
+
+    from core import data
+
+    with st.sidebar.expander("Diagnose", expanded=True):
+        total = sum(entry["ms"] for entry in entries)
+        st.caption(f"Dieser Durchlauf: {len(entries)} Abfragen, {total:.1f} ms SQL")
+        if entries:
+            st.markdown(_waterfall(entries), unsafe_allow_html=True)
+        else:
+            st.caption("Alle Daten kamen aus dem Cache.")
+
+        st.markdown(f"**Top {TOP_N} nach Gesamtzeit**")
+        top = pd.DataFrame(top_queries())
+        if not top.empty:
+            top["Ø ms"] = top["ms"] / top["calls"]
+            st.dataframe(
+                top[["name", "calls", "ms", "Ø ms", "max_ms", "rows"]].rename(
+                    columns={"name": "Abfrage", "calls": "Aufrufe", "ms": "Summe ms",
+                             "max_ms": "max ms", "rows": "Zeilen"}
+                ),
+                hide_index=True,
+                use_container_width=True,
+            )
+
+        stats = data.pool_stats()
+        st.caption(
+            f"Pool: {stats['readers_in_use']}/{stats['readers_open']} Leser belegt, "
+            f"{stats['read_waits']} Wartevorgänge, {stats['writes']} Schreibtransaktionen"
+        )
+        st.download_button(
+            "Abfragen als JSONL",
+            data=session_jsonl(),
+            file_name="diagnose.jsonl",
+            mime="application/jsonl",
+        )
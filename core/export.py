@@ -0,0 +1,295 @@
+"""Export of matches, standings and players as Parquet or Arrow IPC files.
+
+Each dataset is one SQL query (matches joined with scores, teams, leagues and
+seasons; standings with team, league and season names; players with their
+team and league). The rows are fetched with ``fetchmany`` and turned into
+Arrow record batches column by column, so no pandas frame of the whole
+result is built and memory stays bounded by the batch size. The batches are
+written to a single file or, with ``--partition``, to a Hive-style directory
+tree (``league_id=4/season_id=4/part-0.parquet``) that :mod:`pyarrow.dataset`,
+pandas or DuckDB read directly.
+
+Usage::
+
+    python -m core.export                                  # alle Datensätze als Parquet nach export/
+    python -m core.export matches --league 4 --format arrow
+    python -m core.export matches standings --partition --output daten/
+"""
+
+import argparse
+import shutil
+import sqlite3
+import time
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from core.migrate import DEFAULT_DB
+
+# Zeilen je Record-Batch (und je fetchmany)
+BATCH_SIZE = 50_000
+FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+HIVE_NULL = "__HIVE_DEFAULT_PARTITION__"
+
+_MATCHES_SQL = """
+    SELECT m.match_id, m.league_id, l.name AS league, m.season_id, se.year AS season,
+           m.matchday, m.kickoff, m.home_team_id, ht.name AS home_team,
+           m.away_team_id, at.name AS away_team, m.winner,
+           s.full_time_home, s.full_time_away, s.half_time_home, s.half_time_away
+    FROM matches AS m
+    JOIN scores AS s ON s.match_id = m.match_id
+    JOIN teams AS ht ON ht.team_id = m.home_team_id
+    JOIN teams AS at ON at.team_id = m.away_team_id
+    JOIN leagues AS l ON l.league_id = m.league_id
+    LEFT JOIN seasons AS se ON se.season_id = m.season_id
+    WHERE (:league IS NULL OR m.league_id = :league)
+      AND (:season IS NULL OR m.season_id = :season)
+    ORDER BY m.league_id, m.season_id, m.kickoff, m.match_id
+"""
+
+_STANDINGS_SQL = """
+    SELECT st.league_id, l.name AS league, st.season_id, se.year AS season, st.position,
+           st.team_id, t.name AS team, st.played_games, st.won, st.draw, st.lost,
+           st.points, st.goals_for, st.goals_against, st.goal_difference, st.form
+    FROM standings AS st
+    JOIN teams AS t ON t.team_id = st.team_id
+    JOIN leagues AS l ON l.league_id = st.league_id
+    LEFT JOIN seasons AS se ON se.season_id = st.season_id
+    WHERE (:league IS NULL OR st.league_id = :league)
+      AND (:season IS NULL OR st.season_id = :season)
+    ORDER BY st.league_id, st.season_id, st.position
+"""
+
+# Spieler haben keine Saison; ``season`` wird ignoriert
+_PLAYERS_SQL = """
+    SELECT p.player_id, p.name, p.position, p.nationality, p.date_of_birth,
+           p.team_id, t.name AS team, t.league_id
+    FROM players AS p
+    JOIN teams AS t ON t.team_id = p.team_id
+    WHERE (:league IS NULL OR t.league_id = :league)
+    ORDER BY t.league_id, p.team_id, p.player_id
+"""
+
+# (SQL, Schema, Partitionsspalten)
+DATASETS = {
+    "matches": (
+        _MATCHES_SQL,
+        pa.schema(
+            [
+                ("match_id", pa.int64()),
+                ("league_id", pa.int64()),
+                ("league", pa.string()),
+                ("season_id", pa.int64()),
+                ("season", pa.string()),
+                ("matchday", pa.int64()),
+                ("kickoff", pa.timestamp("s", tz="UTC")),
+                ("home_team_id", pa.int64()),
+                ("home_team", pa.string()),
+                ("away_team_id", pa.int64()),
+                ("away_team", pa.string()),
+                ("winner", pa.string()),
+                ("full_time_home", pa.int64()),
+                ("full_time_away", pa.int64()),
+                ("half_time_home", pa.int64()),
+                ("half_time_away", pa.int64()),
+            ]
+        ),
+        ["league_id", "season_id"],
+    ),
+    "standings": (
+        _STANDINGS_SQL,
+        pa.schema(
+            [
+                ("league_id", pa.int64()),
+                ("league", pa.string()),
+                ("season_id", pa.int64()),
+                ("season", pa.string()),
+                ("position", pa.int64()),
+                ("team_id", pa.int64()),
+                ("team", pa.string()),
+                ("played_games", pa.int64()),
+                ("won", pa.int64()),
+                ("draw", pa.int64()),
+                ("lost", pa.int64()),
+                ("points", pa.int64()),
+                ("goals_for", pa.int64()),
+                ("goals_against", pa.int64()),
+                ("goal_difference", pa.int64()),
+                ("form", pa.string()),
+            ]
+        ),
+        ["league_id", "season_id"],
+    ),
+    "players": (
+        _PLAYERS_SQL,
+        pa.schema(
+            [
+                ("player_id", pa.int64()),
+                ("name", pa.string()),
+                ("position", pa.string()),
+                ("nationality", pa.string()),
+                ("date_of_birth", pa.string()),
+                ("team_id", pa.int64()),
+                ("team", pa.string()),
+                ("league_id", pa.int64()),
+            ]
+        ),
+        ["league_id"],
+    ),
+}
+
+
+def record_batches(conn: sqlite3.Connection, dataset: str, league_id=None, season_id=None,
+                   batch_size: int = BATCH_SIZE):
+    """Yield the rows of ``dataset`` as :class:`pyarrow.RecordBatch` chunks."""
+    sql, schema, _partitions = DATASETS[dataset]
+    cursor = conn.execute(sql, {"league": league_id, "season": season_id})
+    try:
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            # Zeilen in Spalten drehen und direkt als Arrow-Arrays anlegen
+            columns = zip(*rows)
+            yield pa.RecordBatch.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                schema=schema,
+            )
+    finally:
+        cursor.close()
+
+
+def _writer(sink, schema: pa.Schema, fmt: str):
+    if fmt == "parquet":
+        return pq.ParquetWriter(sink, schema)
+    return pa.ipc.new_file(sink, schema)
+
+
+def write_file(batches, schema: pa.Schema, sink, fmt: str = "parquet") -> int:
+    """Write ``batches`` to one Parquet or Arrow IPC file (path or buffer); return the rows."""
+    rows = 0
+    writer = _writer(sink, schema, fmt)
+    try:
+        for batch in batches:
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    finally:
+        writer.close()
+    return rows
+
+
+def _partition_path(directory: Path, partitions: list, key: tuple) -> Path:
+    # Hive-Schreibweise, fehlende Werte wie bei Hive/pyarrow
+    parts = (
+        f"{name}={HIVE_NULL if value is None else value}" for name, value in zip(partitions, key)
+    )
+    return directory.joinpath(*parts)
+
+
+def write_partitioned(batches, schema: pa.Schema, partitions: list, directory: Path,
+                      fmt: str = "parquet") -> int:
+    """Write ``batches`` as a Hive-partitioned dataset below ``directory``; return the rows.
+
+    The batches must be sorted by the ``partitions`` columns (the export
+    queries are), so one writer at a time is open and every batch is only
+    sliced at the partition boundaries. The partition columns are stored in
+    the directory names, not in the files.
+    """
+    file_schema = pa.schema([field for field in schema if field.name not in partitions])
+    writer, current, rows = None, None, 0
+    try:
+        for batch in batches:
+            keys = [pc.fill_null(batch.column(name), -1).to_numpy() for name in partitions]
+            # Positionen, an denen im Batch eine neue Partition beginnt
+            changes = np.flatnonzero(np.any([key[1:] != key[:-1] for key in keys], axis=0)) + 1
+            starts = [0, *changes.tolist()]
+            stops = [*changes.tolist(), batch.num_rows]
+            for start, stop in zip(starts, stops):
+                key = tuple(batch.column(name)[start].as_py() for name in partitions)
+                if key != current:
+                    if writer is not None:
+                        writer.close()
+                    path = _partition_path(directory, partitions, key)
+                    path.mkdir(parents=True, exist_ok=True)
+                    writer = _writer(str(path / f"part-0{FORMATS[fmt]}"), file_schema, fmt)
+                    current = key
+                writer.write_batch(batch.slice(start, stop - start).drop_columns(partitions))
+                rows += stop - start
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def export_dataset(conn: sqlite3.Connection, dataset: str, output: Path, fmt: str = "parquet",
+                   league_id=None, season_id=None, partition: bool = False,
+                   batch_size: int = BATCH_SIZE) -> tuple:
+    """Export one dataset below ``output``; return the written path and row count.
+
+    Without ``partition`` the result is ``output/<dataset>.<ext>``, otherwise
+    the directory ``output/<dataset>/`` with one file per league (and season).
+    A partitioned export replaces the whole directory of an earlier run, so
+    no partitions of a wider filter are left behind.
+    """
+    _sql, schema, partitions = DATASETS[dataset]
+    batches = record_batches(conn, dataset, league_id, season_id, batch_size)
+    output.mkdir(parents=True, exist_ok=True)
+    if partition:
+        path = output / dataset
+        if path.exists():
+            # Nur einen früheren Export ersetzen (ausschließlich Partitionsverzeichnisse)
+            if any(not child.is_dir() or "=" not in child.name for child in path.iterdir()):
+                raise FileExistsError(f"{path} ist kein früherer Export, bitte anderes Ziel wählen")
+            shutil.rmtree(path)
+        return path, write_partitioned(batches, schema, partitions, path, fmt)
+    path = output / f"{dataset}{FORMATS[fmt]}"
+    return path, write_file(batches, schema, str(path), fmt)
+
+
+def export_bytes(conn: sqlite3.Connection, dataset: str, fmt: str = "parquet",
+                 league_id=None, season_id=None) -> bytes:
+    """One dataset as the content of a single Parquet or Arrow file (for downloads)."""
+    _sql, schema, _partitions = DATASETS[dataset]
+    sink = pa.BufferOutputStream()
+    write_file(record_batches(conn, dataset, league_id, season_id), schema, sink, fmt)
+    return sink.getvalue().to_pybytes()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Spiele, Tabellen und Spieler exportieren")
+    parser.add_argument(
+        "datasets", nargs="*", help=f"Datensätze ({', '.join(DATASETS)}; Standard: alle)"
+    )
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB, help="Pfad zur SQLite-Datei")
+    parser.add_argument("--output", type=Path, default=Path("export"), help="Zielverzeichnis")
+    parser.add_argument("--format", choices=list(FORMATS), default="parquet", help="Dateiformat")
+    parser.add_argument("--league", type=int, help="nur diese Liga (league_id)")
+    parser.add_argument("--season", type=int, help="nur diese Saison (season_id)")
+    parser.add_argument(
+        "--partition", action="store_true", help="ein Verzeichnis je Liga und Saison (Hive-Stil)"
+    )
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Zeilen je Batch")
+    args = parser.parse_args(argv)
+    unknown = sorted(set(args.datasets) - set(DATASETS))
+    if unknown:
+        parser.error(f"unbekannte Datensätze: {', '.join(unknown)}")
+
+    # Nur lesend öffnen, eine laufende App wird nicht blockiert
+    conn = sqlite3.connect(args.db.resolve().as_uri() + "?mode=ro", uri=True)
+    try:
+        for dataset in args.datasets or list(DATASETS):
+            started = time.perf_counter()
+            path, rows = export_dataset(
+                conn, dataset, args.output, args.format, args.league, args.season,
+                args.partition, args.batch_size,
+            )
+            print(f"{dataset}: {rows} Zeilen -> {path} ({time.perf_counter() - started:.2f} s)")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
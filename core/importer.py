@@ -0,0 +1,307 @@
+"""Bulk import of fixtures and results from CSV, JSON or Parquet files.
+
+One row per match with the columns
+
+    league_id, home_team_id, away_team_id, utc_date, full_time_home, full_time_away
+
+and optionally ``season_id`` (default: current season of the league),
+``matchday``, ``half_time_home`` and ``half_time_away``. Rows without a score
+are fixtures: their scores and ``winner`` are stored as NULL and they do not
+count in the standings. Each file is validated and imported in a single write
+transaction, which rebuilds the standings once per affected league/season.
+
+Usage::
+
+    python -m core.importer spiele.csv
+    python -m core.importer saison.parquet --dry-run   # nur prüfen
+"""
+
+import argparse
+import sqlite3
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from core.migrate import DEFAULT_DB, migrate
+from core.pool import BUSY_TIMEOUT_MS
+from core.standings import recalc_standings
+
+REQUIRED_COLUMNS = [
+    "league_id",
+    "home_team_id",
+    "away_team_id",
+    "utc_date",
+    "full_time_home",
+    "full_time_away",
+]
+OPTIONAL_COLUMNS = ["season_id", "matchday", "half_time_home", "half_time_away"]
+
+# Höchstzahl gemeldeter Fehler, damit die Ausgabe lesbar bleibt
+MAX_ERRORS = 20
+# Eine Paarung gibt es je Saison nur einmal (wird in prepare() geprüft)
+PAIRING_KEY = ["season_id", "home_team_id", "away_team_id"]
+
+
+class ImportValidationError(ValueError):
+    """The input file does not fit the database; ``errors`` lists the problems."""
+
+    def __init__(self, errors: list):
+        self.errors = errors
+        super().__init__(f"{len(errors)} Fehler in der Importdatei")
+
+
+def read_file(path: Path) -> pd.DataFrame:
+    """Load a CSV, JSON (list of records) or Parquet file."""
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        return pd.read_csv(path)
+    if suffix == ".json":
+        return pd.read_json(path, orient="records")
+    if suffix in (".parquet", ".pq"):
+        return pd.read_parquet(path)
+    raise ValueError(f"Unbekanntes Dateiformat: {path.suffix}")
+
+
+def _rows(mask: pd.Series) -> str:
+    # Zeilennummern wie in der Datei (Kopfzeile = 1)
+    numbers = (np.flatnonzero(mask.to_numpy()) + 2).tolist()
+    shown = ", ".join(map(str, numbers[:10]))
+    return shown + (" ..." if len(numbers) > 10 else "")
+
+
+def prepare(conn: sqlite3.Connection, frame: pd.DataFrame) -> pd.DataFrame:
+    """Validate ``frame`` against the database and return the rows to insert.
+
+    Raises :class:`ImportValidationError` with all problems found.
+    """
+    missing = [col for col in REQUIRED_COLUMNS if col not in frame.columns]
+    if missing:
+        raise ImportValidationError([f"Spalten fehlen: {', '.join(missing)}"])
+
+    frame = frame.reset_index(drop=True).copy()
+    errors = []
+    for col in OPTIONAL_COLUMNS:
+        if col not in frame.columns:
+            frame[col] = pd.NA
+
+    for col in ["league_id", "home_team_id", "away_team_id"]:
+        values = pd.to_numeric(frame[col], errors="coerce")
+        bad = values.isna() | (values % 1 != 0)
+        if bad.any():
+            errors.append(f"{col}: keine ganze Zahl in Zeile {_rows(bad)}")
+        frame[col] = values
+    # Ergebnisse dürfen fehlen (angesetzte Spiele), sonst ganze Zahlen
+    for col in ["full_time_home", "full_time_away"]:
+        values = pd.to_numeric(frame[col], errors="coerce")
+        bad = (frame[col].notna() & values.isna()) | (values.notna() & (values % 1 != 0))
+        if bad.any():
+            errors.append(f"{col}: keine ganze Zahl in Zeile {_rows(bad)}")
+        frame[col] = values
+    half_score = frame["full_time_home"].isna() != frame["full_time_away"].isna()
+    if half_score.any():
+        errors.append(f"Ergebnis nur für ein Team angegeben in Zeile {_rows(half_score)}")
+    for col in OPTIONAL_COLUMNS:
+        frame[col] = pd.to_numeric(frame[col], errors="coerce")
+
+    kickoff = pd.to_datetime(frame["utc_date"], utc=True, errors="coerce")
+    if kickoff.isna().any():
+        errors.append(f"utc_date: ungültiges Datum in Zeile {_rows(kickoff.isna())}")
+    if errors:
+        raise ImportValidationError(errors)
+
+    goals = frame[["full_time_home", "full_time_away"]]
+    negative = (goals < 0).any(axis=1)
+    if negative.any():
+        errors.append(f"Negative Toranzahl in Zeile {_rows(negative)}")
+    same = frame["home_team_id"] == frame["away_team_id"]
+    if same.any():
+        errors.append(f"Heim- und Auswärtsteam identisch in Zeile {_rows(same)}")
+
+    # Stammdaten einmal laden und vektorisiert abgleichen
+    leagues = set(pd.read_sql("SELECT league_id FROM leagues", conn)["league_id"])
+    team_league = pd.read_sql("SELECT team_id, league_id FROM teams", conn).set_index("team_id")[
+        "league_id"
+    ]
+    seasons = pd.read_sql("SELECT season_id, league_id FROM seasons", conn)
+
+    unknown_league = ~frame["league_id"].isin(leagues)
+    if unknown_league.any():
+        errors.append(f"Unbekannte league_id in Zeile {_rows(unknown_league)}")
+    for side in ("home_team_id", "away_team_id"):
+        league_of_team = frame[side].map(team_league)
+        if league_of_team.isna().any():
+            errors.append(f"Unbekannte {side} in Zeile {_rows(league_of_team.isna())}")
+        wrong = league_of_team.notna() & (league_of_team != frame["league_id"])
+        if wrong.any():
+            errors.append(f"{side} gehört nicht zur Liga in Zeile {_rows(wrong)}")
+
+    # Fehlende Saison: aktuelle (höchste) Saison der Liga
+    current = seasons.groupby("league_id")["season_id"].max()
+    frame["season_id"] = frame["season_id"].fillna(frame["league_id"].map(current))
+    season_league = seasons.set_index("season_id")["league_id"]
+    wrong_season = frame["season_id"].map(season_league) != frame["league_id"]
+    if wrong_season.any():
+        errors.append(f"season_id passt nicht zur Liga in Zeile {_rows(wrong_season)}")
+    if errors:
+        raise ImportValidationError(errors[:MAX_ERRORS])
+
+    # Doppelte Paarungen innerhalb der Datei und gegenüber der Datenbank
+    key = PAIRING_KEY
+    frame[key] = frame[key].astype(np.int64)
+    duplicated = frame.duplicated(key, keep=False)
+    if duplicated.any():
+        errors.append(f"Paarung mehrfach in der Datei, Zeile {_rows(duplicated)}")
+    placeholders = ", ".join("?" * frame["season_id"].nunique())
+    existing = pd.read_sql(
+        f"SELECT season_id, home_team_id, away_team_id FROM matches "
+        f"WHERE season_id IN ({placeholders})",
+        conn,
+        params=[int(s) for s in frame["season_id"].unique()],
+    ).drop_duplicates()
+    known = frame.merge(existing, on=key, how="left", indicator=True)["_merge"] == "both"
+    if known.any():
+        errors.append(f"Paarung existiert bereits in Zeile {_rows(known)}")
+    if errors:
+        raise ImportValidationError(errors[:MAX_ERRORS])
+
+    home, away = frame["full_time_home"], frame["full_time_away"]
+    played = home.notna()
+    rows = pd.DataFrame(
+        {
+            "season_id": frame["season_id"],
+            "league_id": frame["league_id"].astype(np.int64),
+            "matchday": frame["matchday"].astype("Int64"),
+            "home_team_id": frame["home_team_id"],
+            "away_team_id": frame["away_team_id"],
+            "winner": pd.Series(
+                np.select([home > away, home < away], ["HOME_TEAM", "AWAY_TEAM"], default="DRAW"),
+                index=frame.index,
+            ).where(played, None),
+            "utc_date": kickoff.dt.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "kickoff": kickoff.astype("int64") // 10**9,
+            "full_time_home": home.astype("Int64"),
+            "full_time_away": away.astype("Int64"),
+            # Halbzeit 0:0, wenn nur das Endergebnis bekannt ist; NULL ohne Ergebnis
+            "half_time_home": frame["half_time_home"].fillna(0).where(played).astype("Int64"),
+            "half_time_away": frame["half_time_away"].fillna(0).where(played).astype("Int64"),
+        }
+    )
+    return rows
+
+
+def insert_matches(conn: sqlite3.Connection, rows: pd.DataFrame) -> list:
+    """Insert prepared rows and rebuild the affected standings.
+
+    Must run inside a write transaction. The matches are inserted with one
+    ``executemany``; SQLite assigns the IDs (AUTOINCREMENT), which are then
+    read back in one query over the pairing key that :func:`prepare` keeps
+    unique. Returns the affected ``(league_id, season_id)`` pairs.
+    """
+    match_columns = [
+        "season_id", "league_id", "matchday", "home_team_id",
+        "away_team_id", "winner", "utc_date", "kickoff",
+    ]
+    score_columns = ["full_time_home", "full_time_away", "half_time_home", "half_time_away"]
+    # None statt pd.NA für fehlende Spieltage und Ergebnisse
+    matches = rows[match_columns].astype(object).where(rows[match_columns].notna(), None)
+    scores = rows[score_columns].astype(object).where(rows[score_columns].notna(), None)
+    conn.executemany(
+        f"INSERT INTO matches ({', '.join(match_columns)}) "
+        f"VALUES ({', '.join('?' * len(match_columns))})",
+        matches.itertuples(index=False, name=None),
+    )
+    # IDs über die Paarung zurückholen (executemany liefert kein RETURNING)
+    seasons = [int(season) for season in rows["season_id"].unique()]
+    inserted = pd.read_sql(
+        f"SELECT match_id, {', '.join(PAIRING_KEY)} FROM matches "
+        f"WHERE season_id IN ({', '.join('?' * len(seasons))})",
+        conn,
+        params=seasons,
+    )
+    match_ids = rows[PAIRING_KEY].merge(inserted, on=PAIRING_KEY, how="left")["match_id"]
+    conn.executemany(
+        f"INSERT INTO scores (match_id, {', '.join(score_columns)}) "
+        f"VALUES ({', '.join('?' * (len(score_columns) + 1))})",
+        (
+            (match_id, *values)
+            for match_id, values in zip(
+                match_ids.tolist(), scores.itertuples(index=False, name=None)
+            )
+        ),
+    )
+
+    affected = sorted(
+        {(int(league), int(season)) for league, season in zip(rows["league_id"], rows["season_id"])}
+    )
+    for league_id, season_id in affected:
+        recalc_standings(conn, league_id, season_id)
+    return affected
+
+
+def import_file(conn: sqlite3.Connection, path: Path, dry_run: bool = False) -> dict:
+    """Validate and import one file in a single transaction.
+
+    The checks against the database run inside the write transaction, so no
+    other writer can add a conflicting pairing between check and insert.
+    """
+    started = time.perf_counter()
+    frame = read_file(path)
+    affected = []
+    # Probelauf: nur lesende Transaktion für einen konsistenten Stand
+    conn.execute("BEGIN" if dry_run else "BEGIN IMMEDIATE")
+    try:
+        rows = prepare(conn, frame)
+        if not dry_run:
+            affected = insert_matches(conn, rows)
+            conn.execute("COMMIT")
+        else:
+            conn.execute("ROLLBACK")
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    return {
+        "matches": len(rows),
+        "standings": affected,
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Spiele und Ergebnisse aus Dateien importieren")
+    parser.add_argument("files", type=Path, nargs="+", help="CSV-, JSON- oder Parquet-Dateien")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB, help="Pfad zur SQLite-Datei")
+    parser.add_argument(
+        "--dry-run", action="store_true", help="nur prüfen, nichts in die Datenbank schreiben"
+    )
+    args = parser.parse_args(argv)
+
+    conn = sqlite3.connect(args.db, isolation_level=None, timeout=BUSY_TIMEOUT_MS / 1000)
+    try:
+        migrate(conn)
+        conn.execute("PRAGMA foreign_keys = ON")
+        failed = False
+        for path in args.files:
+            try:
+                result = import_file(conn, path, args.dry_run)
+            except ImportValidationError as exc:
+                failed = True
+                print(f"{path}: {exc}")
+                for error in exc.errors:
+                    print(f"  {error}")
+                continue
+            action = "geprüft" if args.dry_run else "importiert"
+            print(
+                f"{path}: {result['matches']} Spiele {action}, "
+                f"{len(result['standings'])} Tabellen neu berechnet ({result['seconds']:.2f} s)"
+            )
+    finally:
+        conn.close()
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""League page shared by all leagues.
+
+``Startseite.py`` registers one navigation entry per row of the ``leagues``
+table, so a new league needs no file of its own. Everything that differs
+between leagues (name, icon, table zones) comes from that row, the page only
+gets its ``league_id``.
+"""
+
+import streamlit as st
+
+from core import data, diagnostics
+from core.assets import asset_file
+from core.components import render_export, render_header, render_match_cards, render_standings
+
+
+def render_league_page(league_id: int) -> None:
+    """Render standings and matchday navigation of one league."""
+    league = data.get_league(league_id)
+
+    st.set_page_config(
+        page_title=league["name"],
+        page_icon=asset_file(league["icon_url"], 40),
+        layout="wide",
+    )
+
+    render_header(f"{league['name']} Ergebnisse")
+
+    # Alle Spiele der Saison auf einmal laden; die Navigation schneidet nur aus
+    season_matches = data.get_season_matches(league_id)
+    max_matchday = int(season_matches["Spieltag"].max()) if not season_matches.empty else 1
+
+    # Spieltagauswahl (Session-State-Schlüssel je Liga)
+    matchday_key = f"matchday_{league_id}"
+    selectbox_key = f"matchday_select_{league_id}"
+
+    if matchday_key not in st.session_state:
+        st.session_state[matchday_key] = 1
+    if selectbox_key not in st.session_state:
+        st.session_state[selectbox_key] = st.session_state[matchday_key]
+
+    # Abstand und Text darunter
+    st.markdown("---")
+    col_interactive, col_history = st.columns(2)
+    with col_interactive:
+        interactive = st.toggle("Sortierbare Tabelle", key=f"standings_interactive_{league_id}")
+    with col_history:
+        # Tabellen aller Spieltage sind vorberechnet, der Wechsel wählt nur Zeilen aus
+        history = st.toggle("Tabelle zum gewählten Spieltag", key=f"standings_history_{league_id}")
+
+    if history:
+        matchday = st.session_state[matchday_key]
+        st.subheader(f"Tabelle der {league['name']} nach dem {matchday}. Spieltag")
+        render_standings(league_id, interactive=interactive, matchday=matchday)
+    else:
+        st.subheader(f"Tabelle der {league['name']}")
+        render_standings(league_id, interactive=interactive)
+
+    st.markdown("---")
+
+    def sync_selectbox():
+        """Update matchday when the selectbox changes."""
+        st.session_state[matchday_key] = st.session_state[selectbox_key]
+
+    def prev_matchday():
+        """Go to the previous matchday."""
+        if st.session_state[matchday_key] > 1:
+            st.session_state[matchday_key] -= 1
+            st.session_state[selectbox_key] = st.session_state[matchday_key]
+
+    def next_matchday():
+        """Go to the next matchday."""
+        if st.session_state[matchday_key] < max_matchday:
+            st.session_state[matchday_key] += 1
+            st.session_state[selectbox_key] = st.session_state[matchday_key]
+
+    col_prev, col_mid, col_next = st.columns(3)
+    with col_prev:
+        st.button(
+            "Vorheriger Spieltag",
+            use_container_width=True,
+            on_click=prev_matchday,
+            key=f"prev_matchday_{league_id}",
+        )
+    with col_mid:
+        st.markdown(
+            f"<h3 style='text-align:center'>Spieltag {st.session_state[matchday_key]}</h3>",
+            unsafe_allow_html=True,
+        )
+    with col_next:
+        st.button(
+            "Nächster Spieltag",
+            use_container_width=True,
+            on_click=next_matchday,
+            key=f"next_matchday_{league_id}",
+        )
+
+    st.selectbox(
+        "Spieltag auswählen",
+        list(range(1, int(max_matchday) + 1)),
+        key=selectbox_key,
+        on_change=sync_selectbox,
+    )
+
+    # Spiele des gewählten Spieltags
+    matchday = st.session_state[matchday_key]
+    render_match_cards(season_matches[season_matches["Spieltag"] == matchday])
+
+    # Export der aktuellen Saison und des Kaders der Liga
+    st.markdown("---")
+    render_export(
+        ["matches", "standings", "players"],
+        league_id=league_id,
+        season_id=data.get_current_season(league_id),
+        file_prefix=f"liga_{league_id}",
+        key=f"export_{league_id}",
+    )
+
+    # Abfragezeiten in der Seitenleiste (nur mit ?diagnostics=1 oder SPORTS_LEAGUE_DIAGNOSTICS=1)
+    diagnostics.render_panel()
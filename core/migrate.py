@@ -0,0 +1,579 @@
+"""Versioned schema migrations for ``sports_league.sqlite``.
+
+The applied version is stored in ``PRAGMA user_version``. Every migration runs
+in its own transaction, so a failing step leaves the database on the previous
+version.
+
+Usage::
+
+    python -m core.migrate                      # alle offenen Migrationen anwenden
+    python -m core.migrate --status             # aktuelle Version anzeigen
+    python -m core.migrate --benchmark --scale 20
+"""
+
+import argparse
+import sqlite3
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+DEFAULT_DB = Path(__file__).resolve().parent.parent / "sports_league.sqlite"
+
+# Ursprüngliches Schema (ohne Schlüssel), damit auch eine leere Datenbank
+# migriert werden kann.
+BASELINE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS leagues (
+    league_id INTEGER, name TEXT, country TEXT, country_id INTEGER, icon_url TEXT,
+    cl_spot INTEGER, uel_spot INTEGER, relegation_spot INTEGER
+);
+CREATE TABLE IF NOT EXISTS seasons (season_id INTEGER, league_id INTEGER, year TEXT);
+CREATE TABLE IF NOT EXISTS stadiums (
+    stadium_id INTEGER, name TEXT, location TEXT, capacity REAL
+);
+CREATE TABLE IF NOT EXISTS coaches (
+    coach_id INTEGER, name TEXT, team_id INTEGER, nationality TEXT
+);
+CREATE TABLE IF NOT EXISTS referees (referee_id INTEGER, name TEXT, nationality TEXT);
+CREATE TABLE IF NOT EXISTS teams (
+    team_id INTEGER, name TEXT, founded_year REAL, stadium_id INTEGER,
+    league_id INTEGER, coach_id INTEGER, cresturl TEXT
+);
+CREATE TABLE IF NOT EXISTS players (
+    player_id INTEGER, team_id INTEGER, name TEXT, position TEXT,
+    date_of_birth DATE, nationality TEXT
+);
+CREATE TABLE IF NOT EXISTS matches (
+    match_id INTEGER, season_id INTEGER, league_id INTEGER, matchday INTEGER,
+    home_team_id INTEGER, away_team_id INTEGER, winner TEXT, utc_date DATE
+);
+CREATE TABLE IF NOT EXISTS scores (
+    score_id INTEGER, match_id INTEGER, full_time_home INTEGER, full_time_away INTEGER,
+    half_time_home INTEGER, half_time_away INTEGER
+);
+CREATE TABLE IF NOT EXISTS standings (
+    standing_id INTEGER, season_id INTEGER, league_id INTEGER, position INTEGER,
+    team_id INTEGER, played_games INTEGER, won INTEGER, draw INTEGER, lost INTEGER,
+    points INTEGER, goals_for INTEGER, goals_against INTEGER, goal_difference INTEGER,
+    form TEXT
+);
+"""
+
+
+def _rebuild(table: str, create_sql: str) -> str:
+    """Return the SQL that rebuilds ``table`` with a new definition, keeping its rows."""
+    columns = create_sql.split("(", 1)[1]
+    names = [
+        line.strip().split()[0]
+        for line in columns.splitlines()
+        if line.strip() and not line.strip().startswith(("UNIQUE", "FOREIGN", ")"))
+    ]
+    column_list = ", ".join(names)
+    return f"""
+    {create_sql.replace(f"CREATE TABLE {table} ", f"CREATE TABLE {table}_new ", 1)};
+    INSERT INTO {table}_new ({column_list}) SELECT {column_list} FROM {table};
+    DROP TABLE {table};
+    ALTER TABLE {table}_new RENAME TO {table};
+    """
+
+
+_V1_TABLES = [
+    (
+        "leagues",
+        """CREATE TABLE leagues (
+            league_id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            country TEXT,
+            country_id INTEGER,
+            icon_url TEXT,
+            cl_spot INTEGER,
+            uel_spot INTEGER,
+            relegation_spot INTEGER
+        )""",
+    ),
+    (
+        "seasons",
+        """CREATE TABLE seasons (
+            season_id INTEGER PRIMARY KEY,
+            league_id INTEGER REFERENCES leagues (league_id),
+            year TEXT
+        )""",
+    ),
+    (
+        "stadiums",
+        """CREATE TABLE stadiums (
+            stadium_id INTEGER PRIMARY KEY,
+            name TEXT,
+            location TEXT,
+            capacity REAL
+        )""",
+    ),
+    (
+        "coaches",
+        """CREATE TABLE coaches (
+            coach_id INTEGER PRIMARY KEY,
+            name TEXT,
+            team_id INTEGER REFERENCES teams (team_id) DEFERRABLE INITIALLY DEFERRED,
+            nationality TEXT
+        )""",
+    ),
+    (
+        "referees",
+        """CREATE TABLE referees (
+            referee_id INTEGER PRIMARY KEY,
+            name TEXT,
+            nationality TEXT
+        )""",
+    ),
+    (
+        "teams",
+        """CREATE TABLE teams (
+            team_id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            founded_year REAL,
+            stadium_id INTEGER REFERENCES stadiums (stadium_id),
+            league_id INTEGER REFERENCES leagues (league_id),
+            coach_id INTEGER REFERENCES coaches (coach_id) DEFERRABLE INITIALLY DEFERRED,
+            cresturl TEXT
+        )""",
+    ),
+    # Spieler, Spiele und Ergebnisse werden in der App angelegt. AUTOINCREMENT
+    # verhindert, dass IDs gelöschter Zeilen erneut vergeben werden.
+    (
+        "players",
+        """CREATE TABLE players (
+            player_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            team_id INTEGER REFERENCES teams (team_id),
+            name TEXT NOT NULL,
+            position TEXT,
+            date_of_birth DATE,
+            nationality TEXT
+        )""",
+    ),
+    (
+        "matches",
+        """CREATE TABLE matches (
+            match_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            season_id INTEGER REFERENCES seasons (season_id),
+            league_id INTEGER REFERENCES leagues (league_id),
+            matchday INTEGER,
+            home_team_id INTEGER REFERENCES teams (team_id),
+            away_team_id INTEGER REFERENCES teams (team_id),
+            winner TEXT,
+            utc_date DATE
+        )""",
+    ),
+    (
+        "scores",
+        """CREATE TABLE scores (
+            score_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            match_id INTEGER NOT NULL REFERENCES matches (match_id),
+            full_time_home INTEGER,
+            full_time_away INTEGER,
+            half_time_home INTEGER,
+            half_time_away INTEGER
+        )""",
+    ),
+    (
+        "standings",
+        """CREATE TABLE standings (
+            standing_id INTEGER PRIMARY KEY,
+            season_id INTEGER REFERENCES seasons (season_id),
+            league_id INTEGER REFERENCES leagues (league_id),
+            position INTEGER,
+            team_id INTEGER REFERENCES teams (team_id),
+            played_games INTEGER DEFAULT 0,
+            won INTEGER DEFAULT 0,
+            draw INTEGER DEFAULT 0,
+            lost INTEGER DEFAULT 0,
+            points INTEGER DEFAULT 0,
+            goals_for INTEGER DEFAULT 0,
+            goals_against INTEGER DEFAULT 0,
+            goal_difference INTEGER DEFAULT 0,
+            form TEXT,
+            UNIQUE (season_id, team_id)
+        )""",
+    ),
+]
+
+# Indizes passend zu den Abfragen der Seiten
+_V1_INDEXES = """
+CREATE INDEX idx_matches_league_matchday ON matches (league_id, matchday);
+CREATE INDEX idx_matches_league_date ON matches (league_id, utc_date);
+CREATE INDEX idx_matches_season ON matches (season_id);
+CREATE UNIQUE INDEX idx_scores_match ON scores (match_id);
+CREATE INDEX idx_standings_league_points
+    ON standings (league_id, points DESC, goal_difference DESC);
+CREATE INDEX idx_players_team ON players (team_id);
+CREATE INDEX idx_teams_league ON teams (league_id);
+CREATE INDEX idx_seasons_league ON seasons (league_id, year);
+"""
+
+# Anstoßzeit als Unix-Zeitstempel (UTC). datetime(utc_date) im ORDER BY kann
+# keinen Index nutzen, die Ganzzahlspalte schon. Die Trigger füllen sie für
+# Schreibvorgänge, die nur utc_date setzen.
+_V2_KICKOFF = """
+ALTER TABLE matches ADD COLUMN kickoff INTEGER;
+UPDATE matches SET kickoff = CAST(strftime('%s', utc_date) AS INTEGER);
+DROP INDEX idx_matches_league_date;
+CREATE INDEX idx_matches_league_kickoff ON matches (league_id, kickoff);
+CREATE INDEX idx_matches_kickoff ON matches (kickoff);
+CREATE TRIGGER matches_kickoff_insert AFTER INSERT ON matches
+WHEN NEW.kickoff IS NULL
+BEGIN
+    UPDATE matches SET kickoff = CAST(strftime('%s', NEW.utc_date) AS INTEGER)
+    WHERE match_id = NEW.match_id;
+END;
+CREATE TRIGGER matches_kickoff_update AFTER UPDATE OF utc_date ON matches
+BEGIN
+    UPDATE matches SET kickoff = CAST(strftime('%s', NEW.utc_date) AS INTEGER)
+    WHERE match_id = NEW.match_id;
+END;
+"""
+
+# Volltextindex für die Spielersuche (Name, Verein, Nationalität). Die rowid
+# ist die player_id; Trigger halten den Index bei Änderungen aktuell.
+_V4_PLAYER_SEARCH = """
+CREATE VIRTUAL TABLE players_fts USING fts5 (
+    name, team, nationality,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '1 2 3'
+);
+INSERT INTO players_fts (rowid, name, team, nationality)
+SELECT p.player_id, p.name, t.name, p.nationality
+FROM players AS p
+LEFT JOIN teams AS t ON p.team_id = t.team_id;
+CREATE TRIGGER players_fts_insert AFTER INSERT ON players
+BEGIN
+    INSERT INTO players_fts (rowid, name, team, nationality)
+    VALUES (NEW.player_id, NEW.name,
+            (SELECT name FROM teams WHERE team_id = NEW.team_id), NEW.nationality);
+END;
+CREATE TRIGGER players_fts_delete AFTER DELETE ON players
+BEGIN
+    DELETE FROM players_fts WHERE rowid = OLD.player_id;
+END;
+CREATE TRIGGER players_fts_update AFTER UPDATE ON players
+BEGIN
+    DELETE FROM players_fts WHERE rowid = OLD.player_id;
+    INSERT INTO players_fts (rowid, name, team, nationality)
+    VALUES (NEW.player_id, NEW.name,
+            (SELECT name FROM teams WHERE team_id = NEW.team_id), NEW.nationality);
+END;
+CREATE TRIGGER teams_fts_rename AFTER UPDATE OF name ON teams
+BEGIN
+    UPDATE players_fts SET team = NEW.name
+    WHERE rowid IN (SELECT player_id FROM players WHERE team_id = NEW.team_id);
+END;
+CREATE INDEX idx_players_name ON players (name);
+"""
+
+# (Version, Beschreibung, SQL)
+MIGRATIONS = [
+    (
+        1,
+        "Primärschlüssel, Fremdschlüssel und Indizes",
+        "".join(_rebuild(table, sql) for table, sql in _V1_TABLES) + _V1_INDEXES,
+    ),
+    (2, "Anstoßzeit als indizierte Ganzzahlspalte", _V2_KICKOFF),
+    (
+        3,
+        "Indizes für die Team-Filter der Match-Übersicht",
+        """
+        CREATE INDEX idx_matches_home_kickoff ON matches (home_team_id, kickoff);
+        CREATE INDEX idx_matches_away_kickoff ON matches (away_team_id, kickoff);
+        """,
+    ),
+    (4, "Volltextsuche für Spieler (FTS5)", _V4_PLAYER_SEARCH),
+    (
+        5,
+        "Index für den Direktvergleich zweier Teams",
+        """
+        CREATE INDEX idx_matches_pair ON matches (home_team_id, away_team_id, kickoff);
+        """,
+    ),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def current_version(conn: sqlite3.Connection) -> int:
+    """Return the schema version stored in the database."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection, target: int = LATEST_VERSION) -> list:
+    """Apply all pending migrations up to ``target`` and return the applied versions."""
+    version = current_version(conn)
+    if version >= target:
+        return []
+    if conn.in_transaction:
+        conn.commit()
+    if version == 0:
+        conn.executescript(BASELINE_SCHEMA)
+
+    applied = []
+    # Tabellen-Neuaufbau nur ohne Fremdschlüsselprüfung möglich
+    foreign_keys = conn.execute("PRAGMA foreign_keys").fetchone()[0]
+    conn.execute("PRAGMA foreign_keys = OFF")
+    try:
+        for number, _description, sql in MIGRATIONS:
+            if number <= version or number > target:
+                continue
+            script = f"BEGIN;\n{sql}\nPRAGMA user_version = {number};\nCOMMIT;"
+            try:
+                conn.executescript(script)
+            except sqlite3.Error:
+                if conn.in_transaction:
+                    conn.rollback()
+                raise
+            applied.append(number)
+        problems = conn.execute("PRAGMA foreign_key_check").fetchall()
+        if problems:
+            raise sqlite3.IntegrityError(
+                f"Fremdschlüsselverletzungen nach Migration: {problems[:5]}"
+            )
+    finally:
+        conn.execute(f"PRAGMA foreign_keys = {foreign_keys}")
+    return applied
+
+
+# ---------------------------------------------------------------------------
+# Benchmark auf einer vergrößerten Kopie
+# ---------------------------------------------------------------------------
+
+# Abfragen, wie sie die Seiten ausführen (Liga 4 = Bundesliga). Ein Paar
+# enthält die Abfrage vor und nach der Migration, wenn sich die Seite geändert hat.
+BENCHMARK_QUERIES = {
+    "Spieltag (Ligaseite)": """
+        SELECT home_team.name, away_team.name, scores.full_time_home,
+               scores.full_time_away, matches.utc_date
+        FROM matches
+        JOIN teams AS home_team ON matches.home_team_id = home_team.team_id
+        JOIN teams AS away_team ON matches.away_team_id = away_team.team_id
+        JOIN scores ON matches.match_id = scores.match_id
+        JOIN leagues ON matches.league_id = leagues.league_id
+        WHERE matches.league_id = 4 AND matches.matchday = 17
+        ORDER BY datetime(matches.utc_date) ASC
+    """,
+    "Letzte drei Spiele": (
+        """
+        SELECT home_team.name, away_team.name, scores.full_time_home,
+               scores.full_time_away, matches.utc_date
+        FROM matches
+        JOIN teams AS home_team ON matches.home_team_id = home_team.team_id
+        JOIN teams AS away_team ON matches.away_team_id = away_team.team_id
+        JOIN scores ON matches.match_id = scores.match_id
+        JOIN leagues ON matches.league_id = leagues.league_id
+        WHERE matches.league_id = 4
+        ORDER BY datetime(matches.utc_date) DESC
+        LIMIT 3
+        """,
+        """
+        SELECT home_team.name, away_team.name, scores.full_time_home,
+               scores.full_time_away, matches.utc_date
+        FROM matches
+        JOIN teams AS home_team ON matches.home_team_id = home_team.team_id
+        JOIN teams AS away_team ON matches.away_team_id = away_team.team_id
+        JOIN scores ON matches.match_id = scores.match_id
+        JOIN leagues ON matches.league_id = leagues.league_id
+        WHERE matches.league_id = 4
+        ORDER BY matches.kickoff DESC, matches.match_id DESC
+        LIMIT 3
+        """,
+    ),
+    "Tabelle": """
+        SELECT * FROM standings
+        WHERE league_id = 4
+        ORDER BY points DESC, goal_difference DESC
+    """,
+    "Höchster Spieltag": "SELECT MAX(matchday) FROM matches WHERE league_id = 4",
+    "Tabellenneuberechnung": """
+        SELECT m.home_team_id, m.away_team_id, s.full_time_home, s.full_time_away
+        FROM matches m
+        JOIN scores s ON m.match_id = s.match_id
+        WHERE m.league_id = 4 AND m.season_id = 4
+    """,
+    "Direktvergleich": """
+        SELECT m.match_id, s.full_time_home, s.full_time_away
+        FROM matches AS m
+        JOIN scores AS s ON m.match_id = s.match_id
+        WHERE (m.home_team_id = 65 AND m.away_team_id = 57)
+           OR (m.home_team_id = 57 AND m.away_team_id = 65)
+    """,
+    "Kader eines Vereins": """
+        SELECT p.name, p.position, t.name
+        FROM players AS p
+        JOIN teams AS t ON p.team_id = t.team_id
+        WHERE p.team_id = 5
+        ORDER BY p.name
+    """,
+}
+
+
+def scale_database(conn: sqlite3.Connection, factor: int) -> None:
+    """Multiply seasons, matches, scores, standings and players by ``factor``.
+
+    Every copy becomes an earlier season of the same league, so the data keeps
+    the shape of the original (one score per match, one standing per team and
+    season).
+    """
+    offsets = {
+        name: conn.execute(f"SELECT COALESCE(MAX({key}), 0) FROM {name}").fetchone()[0]
+        for name, key in [
+            ("seasons", "season_id"),
+            ("matches", "match_id"),
+            ("scores", "score_id"),
+            ("standings", "standing_id"),
+            ("players", "player_id"),
+        ]
+    }
+    for k in range(1, factor):
+        params = {f"{name}_off": k * off for name, off in offsets.items()}
+        params["years"] = f"-{k} years"
+        params["k"] = k
+        conn.execute(
+            """
+            INSERT INTO seasons (season_id, league_id, year)
+            SELECT season_id + :seasons_off, league_id,
+                   (CAST(substr(year, 1, 4) AS INTEGER) - :k) || '-' ||
+                   (CAST(substr(year, 6, 4) AS INTEGER) - :k)
+            FROM seasons WHERE season_id <= :base_seasons
+            """,
+            params | {"base_seasons": offsets["seasons"]},
+        )
+        conn.execute(
+            """
+            INSERT INTO matches (match_id, season_id, league_id, matchday,
+                                 home_team_id, away_team_id, winner, utc_date)
+            SELECT match_id + :matches_off, season_id + :seasons_off, league_id, matchday,
+                   home_team_id, away_team_id, winner, date(utc_date, :years)
+            FROM matches WHERE match_id <= :base_matches
+            """,
+            params | {"base_matches": offsets["matches"]},
+        )
+        conn.execute(
+            """
+            INSERT INTO scores (score_id, match_id, full_time_home, full_time_away,
+                                half_time_home, half_time_away)
+            SELECT score_id + :scores_off, match_id + :matches_off, full_time_home,
+                   full_time_away, half_time_home, half_time_away
+            FROM scores WHERE score_id <= :base_scores
+            """,
+            params | {"base_scores": offsets["scores"]},
+        )
+        conn.execute(
+            """
+            INSERT INTO standings (standing_id, season_id, league_id, position, team_id,
+                                   played_games, won, draw, lost, points, goals_for,
+                                   goals_against, goal_difference, form)
+            SELECT standing_id + :standings_off, season_id + :seasons_off, league_id,
+                   position, team_id, played_games, won, draw, lost, points, goals_for,
+                   goals_against, goal_difference, form
+            FROM standings WHERE standing_id <= :base_standings
+            """,
+            params | {"base_standings": offsets["standings"]},
+        )
+        conn.execute(
+            """
+            INSERT INTO players (player_id, team_id, name, position, date_of_birth,
+                                 nationality)
+            SELECT player_id + :players_off, team_id, name, position, date_of_birth,
+                   nationality
+            FROM players WHERE player_id <= :base_players
+            """,
+            params | {"base_players": offsets["players"]},
+        )
+    conn.commit()
+
+
+def time_queries(conn: sqlite3.Connection, queries: dict, repeat: int = 5, after=False) -> dict:
+    """Return the median runtime in milliseconds of every query."""
+    timings = {}
+    for name, sql in queries.items():
+        if isinstance(sql, tuple):
+            sql = sql[1] if after else sql[0]
+        runs = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            conn.execute(sql).fetchall()
+            runs.append((time.perf_counter() - start) * 1000)
+        timings[name] = statistics.median(runs)
+    return timings
+
+
+def legacy_copy(source: Path, target: Path) -> None:
+    """Copy the rows of ``source`` into a new database with the original schema."""
+    conn = sqlite3.connect(target)
+    conn.executescript(BASELINE_SCHEMA)
+    conn.execute("ATTACH DATABASE ? AS source", (str(source),))
+    tables = [row[0] for row in conn.execute("SELECT name FROM main.sqlite_master WHERE type = 'table'")]
+    for table in tables:
+        columns = ", ".join(row[1] for row in conn.execute(f"PRAGMA main.table_info({table})"))
+        conn.execute(f"INSERT INTO main.{table} ({columns}) SELECT {columns} FROM source.{table}")
+    conn.commit()
+    conn.execute("DETACH DATABASE source")
+    conn.close()
+
+
+def run_benchmark(db_path: Path, scale: int, repeat: int) -> None:
+    """Print query timings before and after migrating a scaled copy of ``db_path``."""
+    with tempfile.TemporaryDirectory() as tmp:
+        # Benchmark immer vom ursprünglichen Schema aus
+        copy = Path(tmp) / "benchmark.sqlite"
+        legacy_copy(db_path, copy)
+        conn = sqlite3.connect(copy)
+        scale_database(conn, scale)
+        matches = conn.execute("SELECT COUNT(*) FROM matches").fetchone()[0]
+        print(f"Kopie mit Faktor {scale}: {matches} Spiele")
+
+        before = time_queries(conn, BENCHMARK_QUERIES, repeat)
+        migrate(conn)
+        conn.execute("ANALYZE")
+        after = time_queries(conn, BENCHMARK_QUERIES, repeat, after=True)
+        conn.close()
+
+    width = max(len(name) for name in BENCHMARK_QUERIES)
+    print(f"{'Abfrage':<{width}}  {'vorher ms':>10}  {'nachher ms':>10}  {'Faktor':>7}")
+    for name in BENCHMARK_QUERIES:
+        speedup = before[name] / after[name] if after[name] else float("inf")
+        print(
+            f"{name:<{width}}  {before[name]:>10.2f}  {after[name]:>10.2f}  {speedup:>6.1f}x"
+        )
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Schema-Migrationen für die Ligadatenbank")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB, help="Pfad zur SQLite-Datei")
+    parser.add_argument("--status", action="store_true", help="nur die Version anzeigen")
+    parser.add_argument(
+        "--benchmark",
+        action="store_true",
+        help="Abfragezeiten vor/nach der Migration auf einer vergrößerten Kopie messen",
+    )
+    parser.add_argument("--scale", type=int, default=20, help="Vergrößerungsfaktor der Kopie")
+    parser.add_argument("--repeat", type=int, default=5, help="Wiederholungen je Abfrage")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        run_benchmark(args.db, args.scale, args.repeat)
+        return
+
+    conn = sqlite3.connect(args.db)
+    try:
+        version = current_version(conn)
+        if args.status:
+            print(f"Schema-Version {version} (aktuell: {LATEST_VERSION})")
+            return
+        applied = migrate(conn)
+        for number, description, _sql in MIGRATIONS:
+            if number in applied:
+                print(f"Migration {number} angewendet: {description}")
+        if not applied:
+            print(f"Keine offenen Migrationen (Version {version}).")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
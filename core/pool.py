@@ -0,0 +1,196 @@
+"""SQLite connection pool: many read-only readers, one writer.
+
+The database runs in WAL mode, so readers keep working on the last committed
+state while a write is in progress and never wait for it. Writes go through a
+single connection guarded by a lock; ``busy_timeout`` covers writers in other
+processes (CLI tools, a second app instance).
+"""
+
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from queue import Empty, LifoQueue
+
+from core.migrate import migrate
+
+BUSY_TIMEOUT_MS = 5000
+
+
+class PoolExhausted(RuntimeError):
+    """No reader became free within the wait timeout."""
+
+
+class ConnectionPool:
+    """Hand out pooled read-only connections and one shared write connection.
+
+    ``size`` limits the number of reader connections; they are opened on
+    demand and reused afterwards. A reader that is requested while all of them
+    are busy waits up to ``wait_timeout`` seconds.
+    """
+
+    def __init__(self, path, size: int = 4, wait_timeout: float = 30.0,
+                 busy_timeout_ms: int = BUSY_TIMEOUT_MS):
+        self.path = Path(path)
+        self.size = size
+        self.wait_timeout = wait_timeout
+        self.busy_timeout_ms = busy_timeout_ms
+        self._idle = LifoQueue()
+        self._opened = 0
+        self._in_use = 0
+        self._state_lock = threading.Lock()
+        self._write_lock = threading.RLock()
+        self._stats = {
+            "reads": 0,
+            "read_waits": 0,
+            "read_wait_seconds": 0.0,
+            "max_readers_in_use": 0,
+            "writes": 0,
+            "write_wait_seconds": 0.0,
+            "rollbacks": 0,
+        }
+        self._writer = self._open_writer()
+        self._data_version = self._writer.execute("PRAGMA data_version").fetchone()[0]
+
+    def _open_writer(self) -> sqlite3.Connection:
+        # Transaktionen werden in writer() explizit gesteuert
+        conn = sqlite3.connect(
+            self.path,
+            check_same_thread=False,
+            isolation_level=None,
+            timeout=self.busy_timeout_ms / 1000,
+        )
+        conn.execute(f"PRAGMA busy_timeout = {self.busy_timeout_ms}")
+        conn.execute("PRAGMA journal_mode = WAL")
+        # Im WAL-Modus genügt NORMAL: ein Absturz kann nur die letzte Transaktion kosten
+        conn.execute("PRAGMA synchronous = NORMAL")
+        migrate(conn)
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+    def _open_reader(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            f"{self.path.resolve().as_uri()}?mode=ro",
+            uri=True,
+            check_same_thread=False,
+            isolation_level=None,
+            timeout=self.busy_timeout_ms / 1000,
+        )
+        conn.execute(f"PRAGMA busy_timeout = {self.busy_timeout_ms}")
+        conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        with self._state_lock:
+            self._stats["reads"] += 1
+            try:
+                conn = self._idle.get_nowait()
+            except Empty:
+                conn = None
+                if self._opened < self.size:
+                    self._opened += 1
+                    try:
+                        conn = self._open_reader()
+                    except Exception:
+                        self._opened -= 1
+                        raise
+            if conn is not None:
+                self._checked_out()
+                return conn
+            self._stats["read_waits"] += 1
+
+        # Alle Leser belegt: auf eine Rückgabe warten
+        started = time.perf_counter()
+        try:
+            conn = self._idle.get(timeout=self.wait_timeout)
+        except Empty:
+            raise PoolExhausted(
+                f"kein Lesezugriff frei nach {self.wait_timeout:g} s ({self.size} Verbindungen)"
+            ) from None
+        with self._state_lock:
+            self._stats["read_wait_seconds"] += time.perf_counter() - started
+            self._checked_out()
+        return conn
+
+    def _checked_out(self) -> None:
+        self._in_use += 1
+        self._stats["max_readers_in_use"] = max(self._stats["max_readers_in_use"], self._in_use)
+
+    @contextmanager
+    def reader(self):
+        """Borrow a read-only connection for the duration of the block."""
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                # Offene Lesetransaktion würde einen alten Datenstand festhalten
+                conn.rollback()
+            with self._state_lock:
+                self._in_use -= 1
+            self._idle.put(conn)
+
+    @contextmanager
+    def writer(self):
+        """Run the block in one write transaction on the write connection.
+
+        The transaction starts with ``BEGIN IMMEDIATE``, so the write lock is
+        taken up front (waiting up to ``busy_timeout`` for other processes)
+        instead of failing halfway through. Commits on success, rolls back on
+        error.
+        """
+        started = time.perf_counter()
+        with self._write_lock:
+            conn = self._writer
+            conn.execute("BEGIN IMMEDIATE")
+            self._stats["write_wait_seconds"] += time.perf_counter() - started
+            self._stats["writes"] += 1
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                self._stats["rollbacks"] += 1
+                raise
+
+    def external_changes(self) -> bool:
+        """Whether another process committed to the database since the last call.
+
+        ``PRAGMA data_version`` on the write connection only moves for commits
+        of other connections, i.e. not for this pool's own writes. While a
+        write holds the connection (possibly waiting for another process'
+        lock), the check is skipped and reports no change; the next call
+        catches up, so readers never wait for the writer.
+        """
+        if not self._write_lock.acquire(blocking=False):
+            return False
+        try:
+            version = self._writer.execute("PRAGMA data_version").fetchone()[0]
+            changed = version != self._data_version
+            self._data_version = version
+        finally:
+            self._write_lock.release()
+        return changed
+
+    def stats(self) -> dict:
+        """Usage counters of the pool (snapshot)."""
+        with self._state_lock:
+            return {
+                "size": self.size,
+                "readers_open": self._opened,
+                "readers_in_use": self._in_use,
+                "readers_idle": self._idle.qsize(),
+                **self._stats,
+            }
+
+    def close(self) -> None:
+        """Close all idle readers and the writer."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except Empty:
+                break
+        with self._write_lock:
+            self._writer.close()
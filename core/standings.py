@@ -0,0 +1,458 @@
+"""Maintenance of the ``standings`` table.
+
+:func:`apply_match` adds or removes the result of a single match to the two
+affected standings rows. It is meant to run in the same transaction as the
+insert or delete of the match. :func:`recalc_standings` rebuilds a whole
+league/season from its matches and stays available as a fallback;
+:func:`verify_standings` compares the stored rows with a full recompute.
+:func:`update_form` keeps ``standings.form`` (the last five results) in step,
+for a whole league or only the two teams of a match.
+:func:`standings_by_matchday` derives the table after every matchday of a
+season at once (for the matchday view of the league pages).
+
+Usage::
+
+    python -m core.standings            # alle Tabellen prüfen
+    python -m core.standings --repair   # Abweichungen neu berechnen
+"""
+
+import argparse
+import sqlite3
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from core.migrate import DEFAULT_DB
+
+STAT_COLUMNS = [
+    "played_games",
+    "won",
+    "draw",
+    "lost",
+    "points",
+    "goals_for",
+    "goals_against",
+    "goal_difference",
+]
+# Anzahl der Ergebnisse in standings.form
+FORM_LENGTH = 5
+
+
+def aggregate_standings(matches: pd.DataFrame, teams: pd.DataFrame = None) -> pd.DataFrame:
+    """Compute standings for any number of leagues and seasons at once.
+
+    ``matches`` needs the columns ``league_id``, ``season_id``, ``home_team_id``,
+    ``away_team_id``, ``full_time_home`` and ``full_time_away``. Home and away
+    sides are stacked into one long array and every statistic is a single
+    ``np.bincount`` over the (league, season, team) group codes. ``teams``
+    (``league_id``, ``season_id``, ``team_id``) adds teams without matches.
+    The result is ranked by points, goal difference and goals per league and
+    season.
+    """
+    goals_home = matches["full_time_home"].to_numpy(dtype=np.int64)
+    goals_away = matches["full_time_away"].to_numpy(dtype=np.int64)
+    league = np.tile(matches["league_id"].to_numpy(dtype=np.int64), 2)
+    season = np.tile(matches["season_id"].to_numpy(dtype=np.int64), 2)
+    team = np.concatenate(
+        [matches["home_team_id"].to_numpy(dtype=np.int64),
+         matches["away_team_id"].to_numpy(dtype=np.int64)]
+    )
+    goals_for = np.concatenate([goals_home, goals_away])
+    goals_against = np.concatenate([goals_away, goals_home])
+
+    played = np.ones(len(team), dtype=np.int64)
+
+    if teams is not None and not teams.empty:
+        # Teams ohne Spiel als Einträge ohne Gewicht anhängen
+        padding = np.zeros(len(teams), dtype=np.int64)
+        league = np.concatenate([league, teams["league_id"].to_numpy(dtype=np.int64)])
+        season = np.concatenate([season, teams["season_id"].to_numpy(dtype=np.int64)])
+        team = np.concatenate([team, teams["team_id"].to_numpy(dtype=np.int64)])
+        played = np.concatenate([played, padding])
+        goals_for = np.concatenate([goals_for, padding])
+        goals_against = np.concatenate([goals_against, padding])
+
+    # Gruppenschlüssel als eine Zahl: schneller als np.unique über Zeilen
+    dims = (league.max(initial=0) + 1, season.max(initial=0) + 1, team.max(initial=0) + 1)
+    keys, codes = np.unique(
+        np.ravel_multi_index((league, season, team), dims), return_inverse=True
+    )
+    groups = np.column_stack(np.unravel_index(keys, dims))
+    size = len(groups)
+
+    def total(weights) -> np.ndarray:
+        return np.bincount(codes, weights=weights, minlength=size).astype(np.int64)
+
+    won = total(played * (goals_for > goals_against))
+    draw = total(played * (goals_for == goals_against))
+    lost = total(played * (goals_for < goals_against))
+    stats = pd.DataFrame(groups, columns=["league_id", "season_id", "team_id"])
+    stats["played_games"] = total(played)
+    stats["won"] = won
+    stats["draw"] = draw
+    stats["lost"] = lost
+    stats["points"] = 3 * won + draw
+    stats["goals_for"] = total(goals_for)
+    stats["goals_against"] = total(goals_against)
+    stats["goal_difference"] = stats["goals_for"] - stats["goals_against"]
+
+    stats = stats.sort_values(
+        ["league_id", "season_id", "points", "goal_difference", "goals_for"],
+        ascending=[True, True, False, False, False],
+        kind="stable",
+    ).reset_index(drop=True)
+    stats["position"] = stats.groupby(["league_id", "season_id"]).cumcount() + 1
+    return stats
+
+
+def standings_by_matchday(matches: pd.DataFrame, team_ids=None) -> pd.DataFrame:
+    """Standings after every matchday of one league season, computed at once.
+
+    ``matches`` needs ``matchday``, ``home_team_id``, ``away_team_id``,
+    ``full_time_home`` and ``full_time_away``; matches without a matchday are
+    ignored. The results are summed into a (matchday × team × statistic)
+    array with ``np.add.at`` and accumulated with one ``cumsum`` over the
+    matchdays; each matchday is then ranked like :func:`aggregate_standings`.
+    ``team_ids`` adds teams without matches. Returns one row per matchday and
+    team, indexed by ``matchday`` and ordered by position.
+    """
+    matches = matches.dropna(subset=["matchday"])
+    matchday = matches["matchday"].to_numpy(dtype=np.int64)
+    home = matches["home_team_id"].to_numpy(dtype=np.int64)
+    away = matches["away_team_id"].to_numpy(dtype=np.int64)
+    goals_home = matches["full_time_home"].to_numpy(dtype=np.int64)
+    goals_away = matches["full_time_away"].to_numpy(dtype=np.int64)
+
+    extra = np.asarray([] if team_ids is None else team_ids, dtype=np.int64)
+    teams = np.unique(np.concatenate([home, away, extra]))
+    days = int(matchday.max(initial=0))
+    columns = ["played_games", "won", "draw", "lost", "goals_for", "goals_against"]
+    if days == 0 or len(teams) == 0:
+        return pd.DataFrame(
+            columns=["team_id", *STAT_COLUMNS, "position"], index=pd.Index([], name="matchday")
+        )
+
+    # Heim- und Auswärtsseite untereinander: eine Zeile je Team und Spiel
+    day = np.concatenate([matchday, matchday]) - 1
+    team = np.searchsorted(teams, np.concatenate([home, away]))
+    goals_for = np.concatenate([goals_home, goals_away])
+    goals_against = np.concatenate([goals_away, goals_home])
+    values = np.column_stack(
+        [
+            np.ones(len(team), dtype=np.int64),
+            goals_for > goals_against,
+            goals_for == goals_against,
+            goals_for < goals_against,
+            goals_for,
+            goals_against,
+        ]
+    ).astype(np.int64)
+
+    totals = np.zeros((days, len(teams), len(columns)), dtype=np.int64)
+    np.add.at(totals, (day, team), values)
+    totals = totals.cumsum(axis=0)
+
+    played, won, draw, lost, scored, conceded = np.moveaxis(totals, 2, 0)
+    points = 3 * won + draw
+    difference = scored - conceded
+    # Je Spieltag sortieren: Punkte, Tordifferenz, Tore (np.lexsort: letzter Schlüssel zuerst)
+    order = np.lexsort((-scored, -difference, -points), axis=-1)
+
+    def ranked(values: np.ndarray) -> np.ndarray:
+        return np.take_along_axis(values, order, axis=1).ravel()
+
+    table = pd.DataFrame(
+        {
+            "matchday": np.repeat(np.arange(1, days + 1), len(teams)),
+            "team_id": teams[order].ravel(),
+            "played_games": ranked(played),
+            "won": ranked(won),
+            "draw": ranked(draw),
+            "lost": ranked(lost),
+            "points": ranked(points),
+            "goals_for": ranked(scored),
+            "goals_against": ranked(conceded),
+            "goal_difference": ranked(difference),
+            "position": np.tile(np.arange(1, len(teams) + 1), days),
+        }
+    )
+    return table.set_index("matchday")
+
+
+def _form_query(length: int, teams: int) -> str:
+    """SELECT of the last ``length`` results per season and team (oldest first).
+
+    Parameters: ``league``, ``season`` (``None`` for all seasons), ``exclude``
+    (a match id to leave out, or ``None``) and ``team0`` … for ``teams`` team
+    ids. One window over the results of the league, no query per team.
+    """
+    team_list = ", ".join(f":team{i}" for i in range(teams))
+
+    def side(team: str, goals_for: str, goals_against: str) -> str:
+        team_filter = f"AND m.{team} IN ({team_list})" if teams else ""
+        return f"""
+        SELECT m.season_id, m.{team} AS team_id, m.kickoff, m.match_id,
+               CASE WHEN s.{goals_for} > s.{goals_against} THEN 'W'
+                    WHEN s.{goals_for} = s.{goals_against} THEN 'D'
+                    ELSE 'L' END AS result
+        FROM matches AS m
+        JOIN scores AS s ON s.match_id = m.match_id
+        WHERE m.league_id = :league AND (:season IS NULL OR m.season_id = :season)
+          AND s.full_time_home IS NOT NULL AND s.full_time_away IS NOT NULL
+          AND m.match_id IS NOT :exclude {team_filter}
+        """
+
+    return f"""
+        WITH results AS (
+            {side("home_team_id", "full_time_home", "full_time_away")}
+            UNION ALL
+            {side("away_team_id", "full_time_away", "full_time_home")}
+        ),
+        windowed AS (
+            SELECT season_id, team_id,
+                   '[' || group_concat('"' || result || '"', ', ') OVER (
+                       PARTITION BY season_id, team_id ORDER BY kickoff, match_id
+                       ROWS BETWEEN {int(length) - 1} PRECEDING AND CURRENT ROW
+                   ) || ']' AS form,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY season_id, team_id ORDER BY kickoff DESC, match_id DESC
+                   ) AS latest
+            FROM results
+        )
+        SELECT season_id, team_id, form FROM windowed WHERE latest = 1
+    """
+
+
+def _form_params(league_id, season_id, team_ids, exclude_match_id) -> dict:
+    params = {"league": league_id, "season": season_id, "exclude": exclude_match_id}
+    params.update({f"team{i}": int(team_id) for i, team_id in enumerate(team_ids)})
+    return params
+
+
+def compute_form(conn: sqlite3.Connection, league_id: int, season_id=None,
+                 length: int = FORM_LENGTH) -> pd.DataFrame:
+    """Form of every team of a league (one season or all) from its matches.
+
+    Returns ``season_id``, ``team_id`` and ``form``, the last ``length``
+    results by kickoff as a JSON list like ``["W", "D", "L"]`` (oldest first).
+    """
+    return pd.read_sql(
+        _form_query(length, 0), conn, params=_form_params(league_id, season_id, (), None)
+    )
+
+
+def update_form(conn: sqlite3.Connection, league_id: int, season_id=None, team_ids=(),
+                exclude_match_id=None, length: int = FORM_LENGTH) -> None:
+    """Store the form of a league (or only ``team_ids``) in ``standings.form``.
+
+    ``exclude_match_id`` leaves out a match that is about to be deleted.
+    Teams without a match get ``NULL``. Runs inside the caller's transaction.
+    """
+    team_ids = list(team_ids)
+    params = _form_params(league_id, season_id, team_ids, exclude_match_id)
+    team_filter = f"AND team_id IN ({', '.join(f':team{i}' for i in range(len(team_ids)))})"
+    conn.execute(
+        f"""
+        UPDATE standings SET form = NULL
+        WHERE league_id = :league AND (:season IS NULL OR season_id = :season)
+        {team_filter if team_ids else ""}
+        """,
+        params,
+    )
+    conn.execute(
+        f"""
+        WITH recent AS ({_form_query(length, len(team_ids))})
+        UPDATE standings SET form = recent.form
+        FROM recent
+        WHERE standings.season_id = recent.season_id AND standings.team_id = recent.team_id
+        """,
+        params,
+    )
+
+
+def compute_standings(conn: sqlite3.Connection, league_id: int, season_id: int) -> pd.DataFrame:
+    """Compute the standings of a league/season from its matches."""
+    teams = pd.read_sql(
+        "SELECT league_id, ? AS season_id, team_id FROM teams WHERE league_id = ?",
+        conn,
+        params=(season_id, league_id),
+    )
+    matches = pd.read_sql(
+        """
+        SELECT m.league_id, m.season_id, m.home_team_id, m.away_team_id,
+               s.full_time_home, s.full_time_away
+        FROM matches m
+        JOIN scores s ON m.match_id = s.match_id
+        WHERE m.league_id = ? AND m.season_id = ?
+          AND s.full_time_home IS NOT NULL AND s.full_time_away IS NOT NULL
+        """,
+        conn,
+        params=(league_id, season_id),
+    )
+    return aggregate_standings(matches, teams)
+
+
+def write_standings(conn: sqlite3.Connection, stats: pd.DataFrame) -> None:
+    """Write standings rows from :func:`aggregate_standings` with one batched UPSERT."""
+    columns = ["season_id", "league_id", "team_id", *STAT_COLUMNS, "position"]
+    conn.executemany(
+        f"""
+        INSERT INTO standings ({", ".join(columns)})
+        VALUES ({", ".join("?" * len(columns))})
+        ON CONFLICT (season_id, team_id) DO UPDATE SET
+            {", ".join(f"{col} = excluded.{col}" for col in columns[2:])}
+        """,
+        stats[columns].itertuples(index=False, name=None),
+    )
+
+
+def recalc_standings(conn: sqlite3.Connection, league_id: int, season_id: int) -> None:
+    """Recalculate the standings table for the given league/season.
+
+    Runs inside the caller's transaction; committing is left to the caller.
+    """
+    write_standings(conn, compute_standings(conn, league_id, season_id))
+    update_form(conn, league_id, season_id)
+
+
+def update_positions(conn: sqlite3.Connection, league_id: int, season_id: int) -> None:
+    """Re-rank the standings rows of a league/season."""
+    conn.execute(
+        """
+        UPDATE standings
+        SET position = ranked.position
+        FROM (
+            SELECT standing_id,
+                   ROW_NUMBER() OVER (
+                       ORDER BY points DESC, goal_difference DESC, goals_for DESC
+                   ) AS position
+            FROM standings
+            WHERE league_id = ? AND season_id = ?
+        ) AS ranked
+        WHERE standings.standing_id = ranked.standing_id
+        """,
+        (league_id, season_id),
+    )
+
+
+def apply_match(conn: sqlite3.Connection, match_id: int, sign: int = 1):
+    """Add (``sign=1``) or remove (``sign=-1``) one match from the standings.
+
+    Only the rows of the two teams are touched, followed by a re-rank of the
+    league. Call it after inserting a match and its score, or before deleting
+    them, inside the same transaction. Returns ``(league_id, season_id)`` of
+    the match, or ``None`` if the match or its score does not exist.
+    """
+    match = conn.execute(
+        """
+        SELECT m.league_id, m.season_id, m.home_team_id, m.away_team_id,
+               s.full_time_home, s.full_time_away
+        FROM matches AS m
+        JOIN scores AS s ON m.match_id = s.match_id
+        WHERE m.match_id = ?
+        """,
+        (match_id,),
+    ).fetchone()
+    if match is None:
+        return None
+    league_id, season_id, home_id, away_id, home_goals, away_goals = match
+    if season_id is None or home_goals is None or away_goals is None:
+        # Ohne Saison gibt es keine Tabelle, ohne Ergebnis nichts zu zählen
+        return league_id, season_id
+
+    for team_id, goals_for, goals_against in (
+        (home_id, home_goals, away_goals),
+        (away_id, away_goals, home_goals),
+    ):
+        won = int(goals_for > goals_against)
+        draw = int(goals_for == goals_against)
+        lost = int(goals_for < goals_against)
+        conn.execute(
+            """
+            INSERT INTO standings (season_id, league_id, team_id, played_games, won, draw,
+                                   lost, points, goals_for, goals_against, goal_difference)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (season_id, team_id) DO UPDATE SET
+                played_games = played_games + excluded.played_games,
+                won = won + excluded.won,
+                draw = draw + excluded.draw,
+                lost = lost + excluded.lost,
+                points = points + excluded.points,
+                goals_for = goals_for + excluded.goals_for,
+                goals_against = goals_against + excluded.goals_against,
+                goal_difference = goal_difference + excluded.goal_difference
+            """,
+            (
+                season_id,
+                league_id,
+                team_id,
+                sign,
+                sign * won,
+                sign * draw,
+                sign * lost,
+                sign * (3 * won + draw),
+                sign * goals_for,
+                sign * goals_against,
+                sign * (goals_for - goals_against),
+            ),
+        )
+    # Form nur für die beiden Teams neu bestimmen; beim Löschen ohne dieses Spiel
+    update_form(
+        conn,
+        league_id,
+        season_id,
+        (home_id, away_id),
+        exclude_match_id=match_id if sign < 0 else None,
+    )
+    update_positions(conn, league_id, season_id)
+    return league_id, season_id
+
+
+def verify_standings(conn: sqlite3.Connection, league_id: int, season_id: int) -> pd.DataFrame:
+    """Return the teams whose stored standings or form differ from a full recompute."""
+    expected = compute_standings(conn, league_id, season_id).set_index("team_id")[STAT_COLUMNS]
+    form = compute_form(conn, league_id, season_id).set_index("team_id")["form"]
+    expected["form"] = form.reindex(expected.index)
+    stored = pd.read_sql(
+        f"""
+        SELECT team_id, {", ".join(STAT_COLUMNS)}, form
+        FROM standings
+        WHERE league_id = ? AND season_id = ?
+        """,
+        conn,
+        params=(league_id, season_id),
+    ).set_index("team_id")
+    stored = stored.reindex(expected.index)
+    # NULL == NULL zählt als gleich
+    mismatch = ((stored != expected) & ~(stored.isna() & expected.isna())).any(axis=1)
+    return expected[mismatch]
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Tabellen gegen die Spiele prüfen")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB, help="Pfad zur SQLite-Datei")
+    parser.add_argument(
+        "--repair", action="store_true", help="abweichende Tabellen komplett neu berechnen"
+    )
+    args = parser.parse_args(argv)
+
+    conn = sqlite3.connect(args.db)
+    try:
+        seasons = conn.execute("SELECT league_id, season_id FROM seasons").fetchall()
+        for league_id, season_id in seasons:
+            wrong = verify_standings(conn, league_id, season_id)
+            if wrong.empty:
+                print(f"Liga {league_id}, Saison {season_id}: ok")
+                continue
+            print(f"Liga {league_id}, Saison {season_id}: {len(wrong)} Teams weichen ab")
+            if args.repair:
+                recalc_standings(conn, league_id, season_id)
+                conn.commit()
+                print("  neu berechnet")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import streamlit as st
+
+from core import data, diagnostics
+from core.assets import asset_file
+from core.components import render_header, render_match_cards, render_standings
+
+# Seiten Einstellungen
+st.set_page_config(
+    page_title="Datenbanken Hausarbeit",
+    page_icon=asset_file("https://crests.football-data.org/BL1.png", 40),
+    layout="wide",
+)
+
+# Bild mit Text
+render_header("Willkommen zur Fußball-Datenanalyse")
+
+# Abstand und Text darunter
+st.markdown("---")
+st.subheader("Willkommen auf unserer Datenanalyse-Plattform")
+st.write("Hier analysieren wir die Top-5 Fußballligen Europas anhand echter Daten.")
+
+# Alle Ligen laden
+leagues_df = data.get_leagues()
+league_names = leagues_df['name'].tolist()
+
+# Session-State für aktive Liga
+# Initialisiere den Liga-State
+if "selected_league" not in st.session_state:
+    st.session_state.selected_league = leagues_df["name"].tolist()[0]  # z. B. "Serie A"
+
+cols = st.columns(len(league_names))
+
+# Temporärer Speicher für Klick
+clicked_league = None
+
+for i, col in enumerate(cols):
+    with col:
+        if st.button(league_names[i], use_container_width=True):
+            clicked_league = league_names[i]
+
+# Nach der Schleife den Zustand aktualisieren (nur wenn geklickt)
+if clicked_league:
+    st.session_state.selected_league = clicked_league
+
+# Dann verwendest du diesen Wert:
+selected_league = st.session_state.selected_league
+
+for i, col in enumerate(cols):
+    with col:
+        if league_names[i] == st.session_state.selected_league:
+            st.markdown(
+                f"""
+                <div style='
+                    position: relative;
+                    top: -3.65rem;
+                    padding: 0.6rem 0.5rem;
+                    background-color: #0066cc;
+                    color: white;
+                    border-radius: 10px;
+                    font-weight: bold;
+                    box-shadow: 0 2px 5px rgba(0,0,0,0.2);
+                    text-align: center;
+                    z-index: 999;
+                    margin-bottom: -10.8rem;
+                '>{league_names[i]}</div>
+                """,
+                unsafe_allow_html=True
+            ) 
+
+
+
+# Lookup: ID zur gewählten Liga finden
+selected_league_id = leagues_df.loc[leagues_df["name"] == selected_league, "league_id"].values[0]
+
+# Tabelle mit farblich hervorgehobenen Plätzen
+render_standings(selected_league_id)
+
+st.markdown("---")
+st.subheader("Letzte drei Spiele")
+
+# Die letzten drei Spiele der gewählten Liga abrufen
+last_matches_df = data.get_last_matches(selected_league_id, 3)
+
+# Schöne Anzeige der letzten drei Spiele
+render_match_cards(last_matches_df)
+
+# Abfragezeiten in der Seitenleiste (nur mit ?diagnostics=1 oder SPORTS_LEAGUE_DIAGNOSTICS=1)
+diagnostics.render_panel()
@@ -1,108 +1,18 @@
+import datetime
+
 import streamlit as st
-import sqlite3
-import pandas as pd
+
+from core import data, diagnostics, standings
+from core.components import render_export, render_head_to_head
 
 st.set_page_config(page_title="Matches", page_icon="📅", layout="wide")
 
 st.title("Matches Übersicht")
 
-# Verbindung zur Datenbank herstellen
-conn = sqlite3.connect('sports_league.sqlite', check_same_thread=False)
-
-
-def recalc_standings(conn: sqlite3.Connection, league_id: int, season_id: int) -> None:
-    """Recalculate the standings table for the given league/season."""
-    teams = pd.read_sql(
-        "SELECT team_id FROM teams WHERE league_id = ?", conn, params=(league_id,)
-    )
-    stats = pd.DataFrame(index=teams["team_id"].tolist())
-    for col in [
-        "played_games",
-        "won",
-        "draw",
-        "lost",
-        "points",
-        "goals_for",
-        "goals_against",
-    ]:
-        stats[col] = 0
-
-    matches = pd.read_sql(
-        """
-        SELECT m.home_team_id, m.away_team_id, s.full_time_home, s.full_time_away
-        FROM matches m
-        JOIN scores s ON m.match_id = s.match_id
-        WHERE m.league_id = ? AND m.season_id = ?
-        """,
-        conn,
-        params=(league_id, season_id),
-    )
-
-    for _, m in matches.iterrows():
-        h, a = int(m.home_team_id), int(m.away_team_id)
-        gh, ga = int(m.full_time_home), int(m.full_time_away)
-        stats.at[h, "played_games"] += 1
-        stats.at[a, "played_games"] += 1
-        stats.at[h, "goals_for"] += gh
-        stats.at[h, "goals_against"] += ga
-        stats.at[a, "goals_for"] += ga
-        stats.at[a, "goals_against"] += gh
-        if gh > ga:
-            stats.at[h, "won"] += 1
-            stats.at[a, "lost"] += 1
-            stats.at[h, "points"] += 3
-        elif gh < ga:
-            stats.at[a, "won"] += 1
-            stats.at[h, "lost"] += 1
-            stats.at[a, "points"] += 3
-        else:
-            stats.at[h, "draw"] += 1
-            stats.at[a, "draw"] += 1
-            stats.at[h, "points"] += 1
-            stats.at[a, "points"] += 1
-
-    stats["goal_difference"] = stats["goals_for"] - stats["goals_against"]
-    stats = (
-        stats.reset_index()
-        .rename(columns={"index": "team_id"})
-        .sort_values(
-            ["points", "goal_difference", "goals_for"], ascending=False
-        )
-        .reset_index(drop=True)
-    )
-    stats["position"] = range(1, len(stats) + 1)
-
-    for row in stats.itertuples(index=False):
-        conn.execute(
-            """
-            UPDATE standings
-            SET season_id = ?, played_games = ?, won = ?, draw = ?, lost = ?,
-                points = ?, goals_for = ?, goals_against = ?, goal_difference = ?,
-                position = ?
-            WHERE league_id = ? AND team_id = ?
-            """,
-            (
-                season_id,
-                row.played_games,
-                row.won,
-                row.draw,
-                row.lost,
-                row.points,
-                row.goals_for,
-                row.goals_against,
-                row.goal_difference,
-                row.position,
-                league_id,
-                row.team_id,
-            ),
-        )
-
-    conn.commit()
-
 # Alle Teams und Ligen laden
-teams_df = pd.read_sql("SELECT team_id, league_id, name FROM teams ORDER BY name", conn)
+teams_df = data.get_teams()
 team_names = teams_df['name'].tolist()
-leagues_df = pd.read_sql("SELECT league_id, name FROM leagues ORDER BY name", conn)
+leagues_df = data.get_leagues()[["league_id", "name"]].sort_values("name")
 
 with st.expander("Neues Match anlegen"):
     league_selection = st.selectbox(
@@ -126,7 +36,11 @@ with st.expander("Neues Match anlegen"):
                 options=league_teams.itertuples(index=False),
                 format_func=lambda x: x.name,
             )
-        match_date = st.date_input("Datum")
+        date_cols = st.columns(2)
+        with date_cols[0]:
+            match_date = st.date_input("Datum")
+        with date_cols[1]:
+            match_time = st.time_input("Anstoß (UTC)", value=datetime.time(15, 30))
         score_cols = st.columns(2)
         with score_cols[0]:
             full_home = st.number_input("Tore Heimteam", min_value=0, step=1)
@@ -140,85 +54,94 @@ with st.expander("Neues Match anlegen"):
                 league_id = league_selection.league_id
                 home_id = home_selection.team_id
                 away_id = away_selection.team_id
-                season_row = pd.read_sql(
-                    "SELECT season_id FROM seasons WHERE league_id = ? ORDER BY year DESC LIMIT 1",
-                    conn,
-                    params=(league_id,),
-                )
-                season_id = int(season_row.iloc[0]["season_id"]) if not season_row.empty else None
-                max_match = pd.read_sql("SELECT MAX(match_id) AS m FROM matches", conn)["m"].iloc[0]
-                new_match_id = 1 if pd.isna(max_match) else int(max_match) + 1
-                max_score = pd.read_sql("SELECT MAX(score_id) AS m FROM scores", conn)["m"].iloc[0]
-                new_score_id = 1 if pd.isna(max_score) else int(max_score) + 1
+                season_id = data.get_current_season(league_id)
                 if full_home > full_away:
                     winner = "HOME_TEAM"
                 elif full_home < full_away:
                     winner = "AWAY_TEAM"
                 else:
                     winner = "DRAW"
-                conn.execute(
-                    "INSERT INTO matches (match_id, season_id, league_id, matchday, home_team_id, away_team_id, winner, utc_date) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-                    (
-                        new_match_id,
-                        season_id,
-                        league_id,
-                        int(matchday),
-                        home_id,
-                        away_id,
-                        winner,
-                        match_date.isoformat(),
-                    ),
-                )
-                conn.execute(
-                    "INSERT INTO scores (score_id, match_id, full_time_home, full_time_away, half_time_home, half_time_away) VALUES (?, ?, ?, ?, ?, ?)",
-                    (
-                        new_score_id,
-                        new_match_id,
-                        int(full_home),
-                        int(full_away),
-                        0,
-                        0,
-                    ),
-                )
-                conn.commit()
-                recalc_standings(conn, league_id, season_id)
+                kickoff = datetime.datetime.combine(match_date, match_time)
+                with data.transaction() as conn:
+                    # IDs vergibt die Datenbank (AUTOINCREMENT)
+                    new_match_id = conn.execute(
+                        "INSERT INTO matches (season_id, league_id, matchday, home_team_id, away_team_id, winner, utc_date, kickoff) VALUES (?, ?, ?, ?, ?, ?, ?, ?) RETURNING match_id",
+                        (
+                            season_id,
+                            league_id,
+                            int(matchday),
+                            home_id,
+                            away_id,
+                            winner,
+                            data.utc_iso(kickoff),
+                            data.kickoff_timestamp(kickoff),
+                        ),
+                    ).fetchone()[0]
+                    conn.execute(
+                        "INSERT INTO scores (match_id, full_time_home, full_time_away, half_time_home, half_time_away) VALUES (?, ?, ?, ?, ?)",
+                        (
+                            new_match_id,
+                            int(full_home),
+                            int(full_away),
+                            0,
+                            0,
+                        ),
+                    )
+                    standings.apply_match(conn, new_match_id)
+                data.invalidate("matches", league_id)
                 st.success("Match hinzugefügt")
                 st.rerun()
 
-col1, col2 = st.columns(2)
+PAGE_SIZE = 100
+
+# Filter (werden direkt in SQL ausgewertet)
+team_ids = dict(zip(teams_df["name"], teams_df["team_id"]))
+league_ids = dict(zip(leagues_df["name"], leagues_df["league_id"]))
+col1, col2, col3, col4 = st.columns(4)
 with col1:
     home_team = st.selectbox("Heimmannschaft", ["Alle"] + team_names)
 with col2:
     away_team = st.selectbox("Auswärtsmannschaft", ["Alle"] + team_names)
+with col3:
+    league_filter = st.selectbox("Liga", ["Alle"] + list(league_ids))
+with col4:
+    date_range = st.date_input("Zeitraum", value=[])
+
+filters = {
+    "league_id": league_ids.get(league_filter),
+    "home_team_id": team_ids.get(home_team),
+    "away_team_id": team_ids.get(away_team),
+    "date_from": date_range[0] if len(date_range) > 0 else None,
+    "date_to": date_range[1] if len(date_range) > 1 else None,
+}
+
+# Direktvergleich, sobald zwei verschiedene Teams gewählt sind (beide Spielorte)
+if filters["home_team_id"] is not None and filters["away_team_id"] is not None:
+    if filters["home_team_id"] != filters["away_team_id"]:
+        with st.expander(f"Direktvergleich {home_team} – {away_team}", expanded=True):
+            render_head_to_head(filters["home_team_id"], filters["away_team_id"])
+
+# Keyset-Blättern: Stapel der Cursor aller bisher besuchten Seiten
+if st.session_state.get("matches_filters") != filters:
+    st.session_state.matches_filters = filters
+    st.session_state.matches_cursors = [None]
+
+filtered_df, next_cursor = data.get_matches_page(
+    **filters, cursor=st.session_state.matches_cursors[-1], limit=PAGE_SIZE
+)
+page_number = len(st.session_state.matches_cursors)
 
-# Alle Spiele laden
-query = """
-    SELECT
-        m.match_id,
-        m.league_id,
-        m.season_id,
-        l.name AS league,
-        ht.name AS home_team,
-        at.name AS away_team,
-        s.full_time_home AS home_goals,
-        s.full_time_away AS away_goals,
-        m.utc_date
-    FROM matches AS m
-    JOIN teams AS ht ON m.home_team_id = ht.team_id
-    JOIN teams AS at ON m.away_team_id = at.team_id
-    JOIN scores AS s ON m.match_id = s.match_id
-    JOIN leagues AS l ON m.league_id = l.league_id
-    ORDER BY datetime(m.utc_date) DESC
-"""
 
-matches_df = pd.read_sql(query, conn)
+def newer_page():
+    """Go back to the previous (newer) page."""
+    if len(st.session_state.matches_cursors) > 1:
+        st.session_state.matches_cursors.pop()
+
+
+def older_page():
+    """Continue with the next (older) page."""
+    st.session_state.matches_cursors.append(next_cursor)
 
-# DataFrame filtern
-filtered_df = matches_df.copy()
-if home_team != "Alle":
-    filtered_df = filtered_df[filtered_df["home_team"] == home_team]
-if away_team != "Alle":
-    filtered_df = filtered_df[filtered_df["away_team"] == away_team]
 
 # Spalten beschriften
 filtered_df = filtered_df.rename(
@@ -230,8 +153,11 @@ filtered_df = filtered_df.rename(
     }
 )
 
+# Angesetzte Spiele ohne Ergebnis zeigen "-"
 filtered_df["Ergebnis"] = (
-    filtered_df["home_goals"].astype(str) + " - " + filtered_df["away_goals"].astype(str)
+    filtered_df["home_goals"].astype("Int64").astype(str).replace("<NA>", "-")
+    + " - "
+    + filtered_df["away_goals"].astype("Int64").astype(str).replace("<NA>", "-")
 )
 
 display_df = filtered_df[["Heimteam", "Ergebnis", "Auswärtsteam", "Datum", "Liga"]]
@@ -242,15 +168,47 @@ event = st.dataframe(
     use_container_width=True,
     on_select="rerun",
     selection_mode="single-row",
+    key=f"matches_table_{page_number}",
 )
 
+nav_prev, nav_page, nav_next = st.columns(3)
+with nav_prev:
+    st.button(
+        "Neuere Spiele",
+        use_container_width=True,
+        on_click=newer_page,
+        disabled=page_number == 1,
+    )
+with nav_page:
+    st.markdown(f"<p style='text-align:center'>Seite {page_number}</p>", unsafe_allow_html=True)
+with nav_next:
+    st.button(
+        "Ältere Spiele",
+        use_container_width=True,
+        on_click=older_page,
+        disabled=next_cursor is None,
+    )
+
 if getattr(event, "selection", None) and event.selection.rows:
     row_index = event.selection.rows[0]
     info = filtered_df.iloc[row_index]
     if st.button("Match löschen", type="primary"):
-        conn.execute("DELETE FROM scores WHERE match_id = ?", (int(info["match_id"]),))
-        conn.execute("DELETE FROM matches WHERE match_id = ?", (int(info["match_id"]),))
-        conn.commit()
-        recalc_standings(conn, int(info["league_id"]), int(info["season_id"]))
+        with data.transaction() as conn:
+            # Ergebnis zuerst aus der Tabelle herausrechnen
+            standings.apply_match(conn, int(info["match_id"]), sign=-1)
+            conn.execute("DELETE FROM scores WHERE match_id = ?", (int(info["match_id"]),))
+            conn.execute("DELETE FROM matches WHERE match_id = ?", (int(info["match_id"]),))
+        data.invalidate("matches", int(info["league_id"]))
         st.success("Match gelöscht")
         st.rerun()
+
+# Export der Spiele und Tabellen (gefiltert nach Liga, falls gewählt)
+render_export(
+    ["matches", "standings"],
+    league_id=filters["league_id"],
+    file_prefix="alle_ligen" if filters["league_id"] is None else f"liga_{filters['league_id']}",
+    key="matches_export",
+)
+
+# Abfragezeiten in der Seitenleiste (nur mit ?diagnostics=1 oder SPORTS_LEAGUE_DIAGNOSTICS=1)
+diagnostics.render_panel()
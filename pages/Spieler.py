@@ -1,32 +1,18 @@
 import streamlit as st
-import sqlite3
 import pandas as pd
 
+from core import data, diagnostics
+from core.assets import asset_file
+
 st.set_page_config(page_title="Spieler", page_icon="⚽", layout="wide")
 
 st.title("Spieler Übersicht")
 
-# Verbindung zur Datenbank herstellen
-conn = sqlite3.connect('sports_league.sqlite', check_same_thread=False)
-
-def load_players(conn):
-    return pd.read_sql(
-    """
-    SELECT p.player_id, p.name, p.position, p.date_of_birth, p.nationality, t.name AS team, t.cresturl
-    FROM players AS p
-    JOIN teams AS t ON p.team_id = t.team_id
-    ORDER BY p.name
-    """,
-    conn,
-)
-
-# Alle Spieler mit Teamnamen laden
-players_df = load_players(conn)
-
 # Dropdown-Optionen vorbereiten
-teams_df = pd.read_sql("SELECT team_id, name FROM teams ORDER BY name", conn)
-positions = sorted(players_df["position"].dropna().unique().tolist())
-nationalities = sorted(players_df["nationality"].dropna().unique().tolist())
+teams_df = data.get_teams()[["team_id", "name"]]
+player_options = data.get_player_options()
+positions = player_options["position"]
+nationalities = player_options["nationality"]
 
 with st.expander("Neuen Spieler anlegen"):
     with st.form("add_player"):
@@ -47,32 +33,33 @@ with st.expander("Neuen Spieler anlegen"):
         if submitted:
             if new_name:
                 team_id = team_selection.team_id
-                # Neuen eindeutigen Spieler-ID bestimmen
-                max_id = pd.read_sql("SELECT MAX(player_id) AS m FROM players", conn)["m"].iloc[0]
-                new_player_id = 1 if pd.isna(max_id) else int(max_id) + 1
-                conn.execute(
-                    "INSERT INTO players (player_id, team_id, name, position, date_of_birth, nationality) VALUES (?, ?, ?, ?, ?, ?)",
-                    (
-                        new_player_id,
-                        team_id,
-                        new_name,
-                        new_position,
-                        birth_date.isoformat(),
-                        new_nationality,
-                    ),
-                )
-                conn.commit()
+                with data.transaction() as conn:
+                    # Die Spieler-ID vergibt die Datenbank (AUTOINCREMENT)
+                    conn.execute(
+                        "INSERT INTO players (team_id, name, position, date_of_birth, nationality) VALUES (?, ?, ?, ?, ?)",
+                        (
+                            team_id,
+                            new_name,
+                            new_position,
+                            birth_date.isoformat(),
+                            new_nationality,
+                        ),
+                    )
                 # Nach dem Speichern sofort aktualisieren
-                players_df = load_players(conn)
-                st.session_state["players_df"] = players_df
+                data.invalidate("players")
                 st.success("Spieler hinzugefügt")
                 st.rerun()
             else:
                 st.error("Name darf nicht leer sein")
 
-search = st.text_input("Nach Spieler suchen")
+SEARCH_LIMIT = 1000
+
+search = st.text_input("Nach Spieler suchen", help="Name, Verein oder Nationalität")
 
-filtered_df = players_df[players_df["name"].str.contains(search, case=False, na=False)]
+# Volltextsuche in SQL, die besten Treffer zuerst
+filtered_df = data.search_players(search, limit=SEARCH_LIMIT)
+if len(filtered_df) == SEARCH_LIMIT:
+    st.caption(f"Es werden die ersten {SEARCH_LIMIT} Treffer angezeigt – Suche verfeinern.")
 
 # Spaltenbeschriftungen fuer die Anzeige anpassen
 display_df = (
@@ -105,7 +92,7 @@ if getattr(event, "selection", None) and event.selection.rows:
     st.markdown("---")
     st.subheader("Spielerinformationen")
 
-    st.image(info["cresturl"], width=60)
+    st.image(asset_file(info["cresturl"], 80), width=60)
     st.markdown(f"**Name:** {info['name']}")
     st.markdown(f"**Team:** {info['team']}")
     st.markdown(f"**Position:** {info['position']}")
@@ -116,11 +103,14 @@ if getattr(event, "selection", None) and event.selection.rows:
     )
 
     if st.button("Spieler löschen", type="primary"):
-        conn.execute(
-            "DELETE FROM players WHERE player_id = ?",
-            (int(info["player_id"]),),
-        )
-        conn.commit()
+        with data.transaction() as conn:
+            conn.execute(
+                "DELETE FROM players WHERE player_id = ?",
+                (int(info["player_id"]),),
+            )
+        data.invalidate("players")
         st.success("Spieler gelöscht")
         st.rerun()
 
+# Abfragezeiten in der Seitenleiste (nur mit ?diagnostics=1 oder SPORTS_LEAGUE_DIAGNOSTICS=1)
+diagnostics.render_panel()
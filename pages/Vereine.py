@@ -1,29 +1,15 @@
 import streamlit as st
-import sqlite3
 import pandas as pd
-import plotly.express as px
+
+from core import data, diagnostics
+from core.assets import asset_file
+from core.components import render_head_to_head
 
 st.set_page_config(page_title="Vereine", page_icon="🏟️", layout="wide")
 
 st.title("Vereinsübersicht")
 
-# Verbindung zur Datenbank herstellen
-conn = sqlite3.connect('sports_league.sqlite', check_same_thread=False)
-
-def load_teams(conn):
-    return pd.read_sql(
-        """
-        SELECT t.team_id, t.name, t.founded_year, s.name AS stadium, s.location, s.capacity,
-               c.name AS coach, t.cresturl
-        FROM teams AS t
-        LEFT JOIN stadiums AS s ON t.stadium_id = s.stadium_id
-        LEFT JOIN coaches AS c ON t.coach_id = c.coach_id
-        ORDER BY t.name
-        """,
-        conn,
-    )
-
-teams_df = load_teams(conn)
+teams_df = data.get_team_details()
 
 search_team = st.text_input("Nach Verein suchen")
 
@@ -58,7 +44,7 @@ if getattr(team_event, "selection", None) and team_event.selection.rows:
     st.markdown("---")
     st.subheader("Vereinsinformationen")
 
-    st.image(info["cresturl"], width=80)
+    st.image(asset_file(info["cresturl"], 80), width=80)
     st.markdown(f"**Name:** {info['name']}")
     if pd.notna(info["founded_year"]):
         st.markdown(f"**Gegründet:** {int(info['founded_year'])}")
@@ -77,21 +63,9 @@ if getattr(team_event, "selection", None) and team_event.selection.rows:
 
     st.markdown(f"**Trainer:** {info['coach'] if pd.notna(info['coach']) else 'unbekannt'}")
 
-    players_df = pd.read_sql(
-        f"""
-        SELECT p.name, p.position, p.nationality, p.date_of_birth,
-               t.name AS team, t.cresturl
-        FROM players AS p
-        JOIN teams AS t ON p.team_id = t.team_id
-        WHERE p.team_id = {int(info['team_id'])}
-        ORDER BY p.name
-        """,
-        conn,
-    )
-
     st.subheader("Spieler des Vereins")
     search_player = st.text_input("Nach Spieler im Verein suchen")
-    players_filtered = players_df[players_df["name"].str.contains(search_player, case=False, na=False)]
+    players_filtered = data.search_players(search_player, team_id=info["team_id"])
 
     players_display_df = (
         players_filtered
@@ -124,7 +98,7 @@ if getattr(team_event, "selection", None) and team_event.selection.rows:
         st.markdown("---")
         st.subheader("Spielerinformationen")
 
-        st.image(player_info["cresturl"], width=60)
+        st.image(asset_file(player_info["cresturl"], 80), width=60)
         st.markdown(f"**Name:** {player_info['name']}")
         st.markdown(f"**Team:** {player_info['team']}")
         st.markdown(f"**Position:** {player_info['position']}")
@@ -134,67 +108,11 @@ if getattr(team_event, "selection", None) and team_event.selection.rows:
             f"{player_info['name']} ist {age} Jahre alt und spielt aktuell im {player_info['position']} von {player_info['team']}.",
         )
 
-    standings_df = pd.DataFrame()
-    try:
-        standings_df = pd.read_sql(
-            f"""
-            SELECT SUM(played_games) AS games, SUM(won) AS wins, SUM(draw) AS draws,
-                   SUM(lost) AS losses, SUM(points) AS points, SUM(goals_for) AS goals_for,
-                   SUM(goals_against) AS goals_against
-            FROM standings
-            WHERE team_id = {int(info['team_id'])}
-            """,
-            conn,
-        )
-    except Exception:
-        pass
-
-    stats = None
-    if not standings_df.empty and standings_df.loc[0, "games"] > 0:
-        stats = standings_df.loc[0]
-    else:
-        matches_df = pd.read_sql(
-            """
-            SELECT m.home_team_id, m.away_team_id, s.full_time_home, s.full_time_away
-            FROM matches AS m
-            JOIN scores AS s ON m.match_id = s.match_id
-            WHERE m.home_team_id = ? OR m.away_team_id = ?
-            """,
-            conn,
-            params=(int(info['team_id']), int(info['team_id'])),
-        )
-        if not matches_df.empty:
-            games = len(matches_df)
-            wins = draws = losses = points = goals_for = goals_against = 0
-            for _, row in matches_df.iterrows():
-                if row["home_team_id"] == int(info["team_id"]):
-                    gf, ga = row["full_time_home"], row["full_time_away"]
-                else:
-                    gf, ga = row["full_time_away"], row["full_time_home"]
-                goals_for += gf
-                goals_against += ga
-                if gf > ga:
-                    wins += 1
-                    points += 3
-                elif gf < ga:
-                    losses += 1
-                else:
-                    draws += 1
-                    points += 1
-            stats = pd.Series(
-                {
-                    "games": games,
-                    "wins": wins,
-                    "draws": draws,
-                    "losses": losses,
-                    "points": points,
-                    "goals_for": goals_for,
-                    "goals_against": goals_against,
-                }
-            )
+    # Eine Aggregat-Abfrage über Heim- und Auswärtsspiele
+    stats = data.get_team_stats(int(info["team_id"])).iloc[0]
 
     st.markdown("---")
-    if stats is not None and stats["games"] > 0:
+    if stats["games"] > 0:
         st.subheader(f"Statistiken von {info['name']}")
         col1, col2, col3, col4 = st.columns(4)
         with col1:
@@ -206,6 +124,9 @@ if getattr(team_event, "selection", None) and team_event.selection.rows:
         with col4:
             st.metric("Siegquote", f"{stats['wins']/stats['games']*100:.1f}%")
 
+        # Plotly erst laden, wenn das Diagramm gebraucht wird (teurer Import)
+        import plotly.express as px
+
         pie_df = pd.DataFrame(
             {
                 "Ergebnis": ["Siege", "Unentschieden", "Niederlagen"],
@@ -224,5 +145,45 @@ if getattr(team_event, "selection", None) and team_event.selection.rows:
             },
         )
         st.plotly_chart(pie_chart, use_container_width=True)
+
+        with st.expander("Nach Spielort und Saison"):
+            split_columns = {
+                "games": "Spiele",
+                "wins": "Siege",
+                "draws": "Unentschieden",
+                "losses": "Niederlagen",
+                "points": "Punkte",
+                "goals_for": "Tore",
+                "goals_against": "Gegentore",
+            }
+            by_venue = data.get_team_stats(int(info["team_id"]), by_venue=True)
+            st.dataframe(
+                by_venue.rename(columns={"venue": "Spielort", **split_columns}),
+                hide_index=True,
+                use_container_width=True,
+            )
+            by_season = data.get_team_stats(int(info["team_id"]), by_season=True)
+            st.dataframe(
+                by_season.drop(columns=["season_id"]).rename(
+                    columns={"season": "Saison", **split_columns}
+                ),
+                hide_index=True,
+                use_container_width=True,
+            )
     else:
         st.info("Keine Statistiken verfügbar.")
+
+    st.subheader("Direktvergleich")
+    opponents = teams_df[teams_df["team_id"] != info["team_id"]].sort_values("name")
+    opponent = st.selectbox(
+        "Gegner wählen",
+        options=opponents.itertuples(index=False),
+        format_func=lambda x: x.name,
+        index=None,
+        placeholder="Verein auswählen",
+    )
+    if opponent is not None:
+        render_head_to_head(int(info["team_id"]), int(opponent.team_id))
+
+# Abfragezeiten in der Seitenleiste (nur mit ?diagnostics=1 oder SPORTS_LEAGUE_DIAGNOSTICS=1)
+diagnostics.render_panel()